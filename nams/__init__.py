@@ -1 +1,3 @@
-from .functions import ecdf
+from .csr import CSRGraph
+from .functions import ecdf, grouped_top_k
+from .temporal import TemporalGraph
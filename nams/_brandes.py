@@ -0,0 +1,173 @@
+"""
+Brandes' betweenness steps, vendored from NetworkX 3.6.1
+(`networkx/algorithms/centrality/betweenness.py` and, for `_weight_function`,
+`networkx/algorithms/shortest_paths/weighted.py`).
+
+These are private NetworkX functions, so their names and signatures
+change between releases (`_rescale` did in 3.5).
+`nams.centrality` promises the same floating-point operations as
+`nx.betweenness_centrality`, so it needs exactly these steps;
+keeping a copy here means a NetworkX upgrade cannot break it.
+If NetworkX changes its algorithm, update this copy from the new release.
+
+NetworkX is distributed under the 3-clause BSD license:
+Copyright (C) 2004-2025, NetworkX Developers.
+"""
+
+import math
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
+
+
+def _weight_function(G, weight):
+    """A function returning the `weight` of an edge (1 if missing)."""
+    if callable(weight):
+        return weight
+    if G.is_multigraph():
+        return lambda u, v, d: min(attr.get(weight, 1) for attr in d.values())
+    return lambda u, v, data: data.get(weight, 1)
+
+
+def _single_source_shortest_path_basic(G, s):
+    S = []
+    P = {}
+    for v in G:
+        P[v] = []
+    sigma = dict.fromkeys(G, 0.0)  # sigma[v]=0 for v in G
+    D = {}
+    sigma[s] = 1.0
+    D[s] = 0
+    Q = deque([s])
+    while Q:  # use BFS to find shortest paths
+        v = Q.popleft()
+        S.append(v)
+        Dv = D[v]
+        sigmav = sigma[v]
+        for w in G[v]:
+            if w not in D:
+                Q.append(w)
+                D[w] = Dv + 1
+            if D[w] == Dv + 1:  # this is a shortest path, count paths
+                sigma[w] += sigmav
+                P[w].append(v)  # predecessors
+    return S, P, sigma, D
+
+
+def _single_source_dijkstra_path_basic(G, s, weight):
+    weight = _weight_function(G, weight)
+    # modified from Eppstein
+    S = []
+    P = {}
+    for v in G:
+        P[v] = []
+    sigma = dict.fromkeys(G, 0.0)  # sigma[v]=0 for v in G
+    D = {}
+    sigma[s] = 1.0
+    seen = {s: 0}
+    c = count()
+    Q = []  # use Q as heap with (distance,node id) tuples
+    heappush(Q, (0, next(c), s, s))
+    while Q:
+        dist, _, pred, v = heappop(Q)
+        if v in D:
+            continue  # already searched this node.
+        sigma[v] += sigma[pred]  # count paths
+        S.append(v)
+        D[v] = dist
+        for w, edgedata in G[v].items():
+            vw_dist = dist + weight(v, w, edgedata)
+            if w not in D and (w not in seen or vw_dist < seen[w]):
+                seen[w] = vw_dist
+                heappush(Q, (vw_dist, next(c), v, w))
+                sigma[w] = 0.0
+                P[w] = [v]
+            elif vw_dist == seen[w]:  # handle equal paths
+                sigma[w] += sigma[v]
+                P[w].append(v)
+    return S, P, sigma, D
+
+
+def _accumulate_basic(betweenness, S, P, sigma, s):
+    delta = dict.fromkeys(S, 0)
+    while S:
+        w = S.pop()
+        coeff = (1 + delta[w]) / sigma[w]
+        for v in P[w]:
+            delta[v] += sigma[v] * coeff
+        if w != s:
+            betweenness[w] += delta[w]
+    return betweenness, delta
+
+
+def _accumulate_endpoints(betweenness, S, P, sigma, s):
+    betweenness[s] += len(S) - 1
+    delta = dict.fromkeys(S, 0)
+    while S:
+        w = S.pop()
+        coeff = (1 + delta[w]) / sigma[w]
+        for v in P[w]:
+            delta[v] += sigma[v] * coeff
+        if w != s:
+            betweenness[w] += delta[w] + 1
+    return betweenness, delta
+
+
+def _rescale(
+    betweenness, n, *, normalized, directed, endpoints=True, sampled_nodes=None
+):
+    # For edge betweenness, `endpoints` is always `True`.
+
+    k = None if sampled_nodes is None else len(sampled_nodes)
+    # N is used to count the number of valid (s, t) pairs where s != t that
+    # could have a path pass through v. If endpoints is False, then v must
+    # not be the target t, hence why we subtract by 1.
+    N = n if endpoints else n - 1
+    if N < 2:
+        # No rescaling necessary: b=0 for all nodes
+        return betweenness
+
+    K_source = N if k is None else k
+
+    if k is None or endpoints:
+        # No sampling adjustment needed
+        if normalized:
+            # Divide by the number of valid (s, t) node pairs that could have
+            # a path through v where s != t.
+            scale = 1 / (K_source * (N - 1))
+        else:
+            # Scale to the full BC
+            if not directed:
+                # The non-normalized BC values are computed the same way for
+                # directed and undirected graphs: shortest paths are computed and
+                # counted for each *ordered* (s, t) pair. Undirected graphs should
+                # only count valid *unordered* node pairs {s, t}; that is, (s, t)
+                # and (t, s) should be counted only once. We correct for this here.
+                correction = 2
+            else:
+                correction = 1
+            scale = N / (K_source * correction)
+
+        if scale != 1:
+            for v in betweenness:
+                betweenness[v] *= scale
+        return betweenness
+
+    # Sampling adjustment needed when excluding endpoints when using k. In this
+    # case, we need to handle source nodes differently from non-source nodes,
+    # because source nodes can't include themselves since endpoints are excluded.
+    # Without this, k == n would be a special case that would violate the
+    # assumption that node `v` is not one of the (s, t) node pairs.
+    if normalized:
+        # NaN for undefined 0/0; there is no data for source node when k=1
+        scale_source = 1 / ((K_source - 1) * (N - 1)) if K_source > 1 else math.nan
+        scale_nonsource = 1 / (K_source * (N - 1))
+    else:
+        correction = 1 if directed else 2
+        scale_source = N / ((K_source - 1) * correction) if K_source > 1 else math.nan
+        scale_nonsource = N / (K_source * correction)
+
+    sampled_nodes = set(sampled_nodes)
+    for v in betweenness:
+        betweenness[v] *= scale_source if v in sampled_nodes else scale_nonsource
+    return betweenness
@@ -0,0 +1,224 @@
+"""
+On-disk cache for the graphs built by `nams.load_data`.
+
+The first call to a cached loader writes a binary snapshot of the graph
+(node ids, CSR adjacency arrays and attribute columns, one `.npy` file each)
+into the cache directory.
+Later calls memory-map that snapshot instead of re-parsing the text files.
+
+Snapshots are keyed by a hash of the contents of the loader's source files
+and of the arguments it was called with,
+so editing anything under `data/` invalidates them automatically.
+
+Set the `NAMS_CACHE_DIR` environment variable to move the cache,
+or `NAMS_CACHE=0` to switch it off.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+from pyprojroot import here
+
+from .csr import MISSING, CSRGraph, column
+
+cache_dir = Path(os.environ.get("NAMS_CACHE_DIR", here() / ".nams_cache"))
+
+# Bump this whenever the snapshot layout changes.
+FORMAT_VERSION = 2
+
+
+def _hash_sources(h, sources):
+    """Feed the relative path and contents of every source file into h."""
+    for source in sources:
+        source = Path(source)
+        files = sorted(source.rglob("*")) if source.is_dir() else [source]
+        for f in files:
+            if not f.is_file():
+                continue
+            h.update(str(f.relative_to(source.parent)).encode())
+            with open(f, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 20), b""):
+                    h.update(chunk)
+
+
+def cache_key(func, sources, args=(), kwargs=None) -> str:
+    """
+    Hash a loader's identity, call arguments and source file contents.
+
+    :param func: The loader function.
+    :param sources: Files or directories the loader reads from.
+    :param args: Positional arguments the loader is called with.
+    :param kwargs: Keyword arguments the loader is called with.
+    """
+    h = hashlib.sha256()
+    h.update(f"{FORMAT_VERSION}:{func.__module__}.{func.__qualname__}".encode())
+    h.update(repr(args).encode())
+    h.update(repr(sorted((kwargs or {}).items())).encode())
+    _hash_sources(h, sources)
+    return h.hexdigest()[:32]
+
+
+def _store_columns(columns, prefix, arrays, meta):
+    """
+    Add attribute columns to `arrays` under numbered names.
+
+    Columns where some nodes or edges lack the attribute
+    are split into a filled column plus a boolean mask.
+    Raises a TypeError for anything else that has no fixed-width dtype
+    (e.g. mixed types or arbitrary objects), which cannot be memory-mapped.
+    """
+    for key, values in columns.items():
+        if not isinstance(key, str):
+            raise TypeError(f"Cannot store non-string attribute key {key!r}.")
+        name = f"{prefix}{len(meta[prefix])}"
+        if values.dtype.kind == "O":
+            present = np.array([v is not MISSING for v in values.tolist()])
+            fill = values[present.argmax()]
+            values = column(v if p else fill for v, p in zip(values, present))
+            if values.dtype.kind == "O":
+                raise TypeError(f"Cannot store attribute {key!r} in a snapshot.")
+            arrays[name + "_mask"] = present
+        arrays[name] = values
+        meta[prefix].append(key)
+
+
+def _load_columns(arrays, meta, prefix):
+    """Undo `_store_columns`."""
+    columns = {}
+    for i, key in enumerate(meta[prefix]):
+        name = f"{prefix}{i}"
+        values = arrays[name]
+        mask = arrays.get(name + "_mask")
+        if mask is not None:
+            values = column(
+                v if p else MISSING for v, p in zip(values.tolist(), mask.tolist())
+            )
+        columns[key] = values
+    return columns
+
+
+def graph_to_arrays(G):
+    """
+    Convert a graph into a dict of NumPy arrays plus JSON-able metadata.
+
+    The arrays are those of `CSRGraph.from_networkx(G)`:
+    node ids, the edge table, its CSR index and the attribute columns.
+    """
+    csr = CSRGraph.from_networkx(G)
+    if csr.node_ids.dtype.kind == "O":
+        raise TypeError("Cannot store node ids of mixed types in a snapshot.")
+
+    arrays = {
+        "node_ids": csr.node_ids,
+        "edge_src": csr.edge_src,
+        "edge_dst": csr.edge_dst,
+        "indptr": csr.indptr,
+        "indices": csr.indices,
+        "edge_ids": csr.edge_ids,
+    }
+    meta = {
+        "version": FORMAT_VERSION,
+        "directed": csr.directed,
+        "graph": csr.graph,
+        "node_attr": [],
+        "edge_attr": [],
+    }
+    _store_columns(csr.node_attrs, "node_attr", arrays, meta)
+    _store_columns(csr.edge_attrs, "edge_attr", arrays, meta)
+    json.dumps(meta)  # Fail early if graph-level attributes are not JSON-able.
+    return arrays, meta
+
+
+def arrays_to_graph(arrays, meta):
+    """Rebuild the CSRGraph stored by `graph_to_arrays`, without re-sorting."""
+    return CSRGraph(
+        arrays["node_ids"],
+        arrays["edge_src"],
+        arrays["edge_dst"],
+        directed=meta["directed"],
+        node_attrs=_load_columns(arrays, meta, "node_attr"),
+        edge_attrs=_load_columns(arrays, meta, "edge_attr"),
+        graph=meta["graph"],
+        csr=(arrays["indptr"], arrays["indices"], arrays["edge_ids"]),
+    )
+
+
+def write_snapshot(G, path: Path):
+    """
+    Write G to the snapshot directory at `path`.
+
+    The snapshot is assembled in a temporary directory and renamed into place,
+    so concurrent readers never see a half-written snapshot.
+    """
+    arrays, meta = graph_to_arrays(G)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=".tmp-"))
+    try:
+        for name, arr in arrays.items():
+            np.save(tmp / f"{name}.npy", arr, allow_pickle=False)
+        with open(tmp / "meta.json", "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, path)
+    except OSError:
+        # Another process got there first; its snapshot is just as good.
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def read_snapshot(path: Path):
+    """Memory-map the snapshot directory at `path` and rebuild the graph."""
+    with open(path / "meta.json") as f:
+        meta = json.load(f)
+    if meta["version"] != FORMAT_VERSION:
+        raise ValueError(f"Snapshot at {path} has an unknown format version.")
+    arrays = {
+        p.stem: np.load(p, mmap_mode="r", allow_pickle=False)
+        for p in path.glob("*.npy")
+    }
+    return arrays_to_graph(arrays, meta).to_networkx()
+
+
+def cached_graph(*sources):
+    """
+    Cache the graph returned by a loader on disk.
+
+    :param sources: Files or directories (under `data/`) that the loader reads.
+        Any change to their contents invalidates the snapshot.
+    """
+
+    def decorator(loader):
+        @wraps(loader)
+        def wrapper(*args, **kwargs):
+            if os.environ.get("NAMS_CACHE", "1") == "0":
+                return loader(*args, **kwargs)
+
+            key = cache_key(loader, sources, args, kwargs)
+            path = cache_dir / f"{loader.__name__}-{key}"
+            if path.exists():
+                try:
+                    return read_snapshot(path)
+                except (OSError, ValueError, KeyError):
+                    shutil.rmtree(path, ignore_errors=True)
+
+            G = loader(*args, **kwargs)
+            try:
+                write_snapshot(G, path)
+            except (TypeError, OSError):
+                # Either some attribute cannot be stored as an array,
+                # or the cache directory is not writable; skip caching.
+                pass
+            return G
+
+        return wrapper
+
+    return decorator
+
+
+def clear_cache():
+    """Delete every snapshot in the cache directory."""
+    shutil.rmtree(cache_dir, ignore_errors=True)
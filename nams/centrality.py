@@ -0,0 +1,481 @@
+"""
+Betweenness centrality, exact or estimated, optionally in parallel.
+
+All three entry points run Brandes' algorithm one source node at a time,
+with NetworkX's single-source search and accumulation steps
+(vendored in `nams._brandes`, as they are private to NetworkX),
+and can spread the sources over a process pool:
+
+- `betweenness_centrality`: a drop-in for `nx.betweenness_centrality`.
+  With one process it performs exactly the same floating-point operations,
+  so results are identical;
+  with several, per-chunk sums are added up in chunk order,
+  which can change the last bits of each value.
+- `betweenness_estimate`: betweenness from `k` sampled sources,
+  with a standard error and confidence interval for every node.
+- `adaptive_betweenness`: samples sources in batches
+  until the top-k ranking stops changing.
+
+Weighted graphs are supported through `weight` (e.g. `"weight_inv"`),
+exactly as in NetworkX: edge weights are treated as distances.
+
+`centrality_table` computes several measures (degree, weighted degree,
+PageRank and betweenness) from one CSRGraph conversion,
+concurrently if asked, and reports how long each one took;
+its betweenness runs the same vendored steps
+on a dict-of-dicts view of the CSR index.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from networkx.utils import create_py_random_state
+from scipy.stats import t as student_t
+
+from ._brandes import (
+    _accumulate_basic,
+    _accumulate_endpoints,
+    _rescale,
+    _single_source_dijkstra_path_basic,
+    _single_source_shortest_path_basic,
+)
+from .csr import CSRGraph, edge_weights
+
+_worker_state = None
+
+
+def _source_sums(G, sources, weight, endpoints):
+    """
+    Sum and sum of squares of each node's per-source dependencies.
+
+    The sums are accumulated in exactly the order `nx.betweenness_centrality`
+    uses, so the sums are the unscaled NetworkX values.
+    """
+    total = dict.fromkeys(G, 0.0)
+    squares = dict.fromkeys(G, 0.0)
+    accumulate = _accumulate_endpoints if endpoints else _accumulate_basic
+    extra = 1 if endpoints else 0
+    for s in sources:
+        if weight is None:
+            S, P, sigma, _ = _single_source_shortest_path_basic(G, s)
+        else:
+            S, P, sigma, _ = _single_source_dijkstra_path_basic(G, s, weight)
+        if endpoints:
+            squares[s] += (len(S) - 1) ** 2
+        _, delta = accumulate(total, S, P, sigma, s)
+        for w, d in delta.items():
+            if w != s:
+                squares[w] += (d + extra) ** 2
+    return total, squares
+
+
+def _init_worker(G, weight, endpoints):
+    global _worker_state
+    _worker_state = (G, weight, endpoints)
+
+
+def _worker_sums(sources):
+    G, weight, endpoints = _worker_state
+    return _source_sums(G, sources, weight, endpoints)
+
+
+class _Engine:
+    """
+    Runs batches of sources, in this process or in a pool of `n_jobs`.
+
+    Use as a context manager so that the pool is shut down afterwards.
+    """
+
+    def __init__(self, G, weight, endpoints, n_jobs):
+        self.G = G
+        self.weight = weight
+        self.endpoints = endpoints
+        self.n_jobs = n_jobs
+        self.pool = None
+
+    def __enter__(self):
+        if self.n_jobs > 1:
+            self.pool = ProcessPoolExecutor(
+                self.n_jobs,
+                initializer=_init_worker,
+                initargs=(self.G, self.weight, self.endpoints),
+            )
+        return self
+
+    def __exit__(self, *exc):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def sums(self, sources):
+        """Per-node sums over `sources`, split into chunks across the pool."""
+        sources = list(sources)
+        if self.pool is None or len(sources) < 2:
+            return _source_sums(self.G, sources, self.weight, self.endpoints)
+        # A few chunks per process evens out slow (high-reach) sources.
+        size = -(-len(sources) // (4 * self.n_jobs))
+        chunks = [sources[i : i + size] for i in range(0, len(sources), size)]
+        total = dict.fromkeys(self.G, 0.0)
+        squares = dict.fromkeys(self.G, 0.0)
+        for t, sq in self.pool.map(_worker_sums, chunks):
+            for v in total:
+                total[v] += t[v]
+                squares[v] += sq[v]
+        return total, squares
+
+
+def _rescaled(G, values, normalized, endpoints, sampled):
+    """Scale raw sums exactly as NetworkX does, `sampled=None` if exact."""
+    return _rescale(
+        values,
+        len(G),
+        normalized=normalized,
+        directed=G.is_directed(),
+        endpoints=endpoints,
+        sampled_nodes=sampled,
+    )
+
+
+def _estimate_frame(G, total, squares, sampled, normalized, endpoints, confidence):
+    """
+    Estimates, standard errors and confidence intervals from raw sums.
+
+    Each node's estimate is a scaled sum over the m sampled sources that
+    can contribute to it, drawn without replacement from `pop` candidates,
+    so its standard error is scale * sqrt(m * s^2 * (1 - m / pop)),
+    with s^2 the sample variance of the per-source dependencies.
+    """
+    nodes = list(G)
+    k, n = len(sampled), len(G)
+    exact = k == n
+    scaled = _rescaled(
+        G, dict(total), normalized, endpoints, None if exact else sampled
+    )
+    scale = _rescaled(
+        G, dict.fromkeys(G, 1.0), normalized, endpoints, None if exact else sampled
+    )
+
+    estimate = np.array([scaled[v] for v in nodes])
+    scale = np.array([scale[v] for v in nodes])
+    total = np.array([total[v] for v in nodes])
+    squares = np.array([squares[v] for v in nodes])
+
+    # Without endpoints, a node never lies on paths from itself.
+    m = np.full(n, float(k))
+    pop = float(n if endpoints else n - 1)
+    if not endpoints:
+        index = {v: i for i, v in enumerate(nodes)}
+        m[[index[v] for v in sampled]] -= 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / m
+        var = (squares - m * mean**2) / (m - 1)
+        stderr = scale * np.sqrt(np.clip(m * var * (1 - m / pop), 0, None))
+    stderr = np.nan_to_num(stderr, nan=0.0) if exact else stderr
+
+    with np.errstate(invalid="ignore"):
+        z = student_t.ppf(0.5 + confidence / 2, df=np.maximum(m - 1, 0))
+    z = np.nan_to_num(z, nan=0.0) if exact else z
+    return pd.DataFrame(
+        {
+            "betweenness": estimate,
+            "stderr": stderr,
+            "lower": np.clip(estimate - z * stderr, 0, None),
+            "upper": estimate + z * stderr,
+        },
+        index=pd.Index(nodes, name="node"),
+    )
+
+
+def _sample(G, k, seed):
+    """The k sources `nx.betweenness_centrality` would sample for this seed."""
+    return create_py_random_state(seed).sample(list(G.nodes()), k)
+
+
+def betweenness_centrality(
+    G, k=None, normalized=True, weight=None, endpoints=False, seed=None, n_jobs=1
+):
+    """
+    `nx.betweenness_centrality`, with the sources spread over `n_jobs` processes.
+
+    Takes the same arguments and, for the same `seed`,
+    samples the same `k` sources as NetworkX.
+
+    :param n_jobs: Number of processes. With 1 (the default) the result is
+        identical to NetworkX; with more it agrees to floating-point rounding.
+    :returns: A dict of node -> betweenness centrality.
+    """
+    if k == len(G):
+        k = None
+    sources = list(G) if k is None else _sample(G, k, seed)
+    with _Engine(G, weight, endpoints, n_jobs) as engine:
+        total, _ = engine.sums(sources)
+    return _rescaled(G, total, normalized, endpoints, None if k is None else sources)
+
+
+def betweenness_estimate(
+    G,
+    k,
+    normalized=True,
+    weight=None,
+    endpoints=False,
+    seed=None,
+    n_jobs=1,
+    confidence=0.95,
+):
+    """
+    Estimate betweenness centrality from `k` randomly sampled sources.
+
+    The `betweenness` column equals
+    `nx.betweenness_centrality(G, k=k, seed=seed, ...)`.
+
+    Intervals are Student-t intervals on the sampled dependencies.
+    Those are heavily skewed (most sources contribute nothing to a node),
+    so with small `k` the intervals cover less often than `confidence`,
+    mostly for low-betweenness nodes.
+
+    :param confidence: Nominal coverage of the `lower`-`upper` interval.
+    :returns: A DataFrame indexed by node, with columns
+        `betweenness`, `stderr`, `lower` and `upper`.
+    """
+    sources = _sample(G, k, seed)
+    with _Engine(G, weight, endpoints, n_jobs) as engine:
+        total, squares = engine.sums(sources)
+    return _estimate_frame(
+        G, total, squares, sources, normalized, endpoints, confidence
+    )
+
+
+def adaptive_betweenness(
+    G,
+    top_k=10,
+    batch_size=None,
+    patience=3,
+    normalized=True,
+    weight=None,
+    endpoints=False,
+    seed=None,
+    n_jobs=1,
+    confidence=0.95,
+):
+    """
+    Sample sources in batches until the top-k ranking is stable.
+
+    After every batch the nodes are ranked by their current estimate;
+    sampling stops once the `top_k` nodes, in order,
+    have not changed for `patience` batches in a row,
+    or once every node has been used as a source (giving exact values).
+
+    :param top_k: Length of the ranking that has to settle.
+    :param batch_size: Sources per batch; defaults to max(10, n / 50).
+    :param patience: Number of unchanged batches needed to stop.
+    :returns: A DataFrame as from `betweenness_estimate`,
+        with the number of sources used in `df.attrs["n_sources"]`.
+    """
+    order = _sample(G, len(G), seed)
+    batch_size = batch_size or max(10, len(G) // 50)
+    total = dict.fromkeys(G, 0.0)
+    squares = dict.fromkeys(G, 0.0)
+    ranking, unchanged, used = None, 0, 0
+    if not order:
+        df = _estimate_frame(G, total, squares, [], normalized, endpoints, confidence)
+    with _Engine(G, weight, endpoints, n_jobs) as engine:
+        while used < len(order) and unchanged < patience:
+            batch = order[used : used + batch_size]
+            t, sq = engine.sums(batch)
+            for v in total:
+                total[v] += t[v]
+                squares[v] += sq[v]
+            used += len(batch)
+
+            df = _estimate_frame(
+                G, total, squares, order[:used], normalized, endpoints, confidence
+            )
+            top = df["betweenness"].nlargest(top_k).index.tolist()
+            unchanged = unchanged + 1 if top == ranking else 0
+            ranking = top
+    df.attrs["n_sources"] = used
+    return df
+
+
+METRICS = ("degree", "weighted_degree", "pagerank", "betweenness")
+
+_table_state = None
+
+
+def _pagerank(shared):
+    """`nx.pagerank`, on the shared CSR index."""
+    n = len(shared["indptr"]) - 1
+    A = sp.csr_array(
+        (shared["weights"][shared["edge_ids"]], shared["indices"], shared["indptr"]),
+        shape=(n, n),
+    )
+    return pagerank_matrix(A)[0]
+
+
+def pagerank_matrix(A, nstart=None, alpha=0.85, max_iter=100, tol=1.0e-6):
+    """
+    `nx.pagerank`'s power iteration on a weighted adjacency matrix.
+
+    :param A: Sparse (n, n) matrix; row i holds the out-edge weights of node i.
+    :param nstart: Starting vector, e.g. the PageRank of a similar graph;
+        uniform if None.
+    :returns: The PageRank vector and the number of iterations it took.
+    """
+    n = A.shape[0]
+    if n == 0:
+        return np.empty(0), 0
+    S = A.sum(axis=1)
+    S[S != 0] = 1.0 / S[S != 0]
+    A = sp.dia_array((S[np.newaxis], 0), shape=A.shape).tocsr() @ A
+    p = np.repeat(1.0 / n, n)
+    x = p if nstart is None else np.asarray(nstart, dtype=float) / np.sum(nstart)
+    is_dangling = np.where(S == 0)[0]
+    for i in range(max_iter):
+        xlast = x
+        x = alpha * (x @ A + sum(x[is_dangling]) * p) + (1 - alpha) * p
+        if np.absolute(x - xlast).sum() < n * tol:
+            return x, i + 1
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+
+def _edge_length(u, v, length):
+    """Edge weight function for `_adjacency`, whose edge data is the length."""
+    return length
+
+
+def _adjacency(indptr, indices, lengths):
+    """
+    The CSR index as a {position: {neighbor: length}} dict of dicts,
+    which the vendored Brandes steps can walk like a NetworkX graph.
+
+    `lengths` holds the length of each CSR entry, or is None to count hops;
+    repeated entries keep their shortest length, as NetworkX does
+    for parallel edges.
+    """
+    adj = {}
+    for v in range(len(indptr) - 1):
+        nbrs = adj[v] = {}
+        for e in range(indptr[v], indptr[v + 1]):
+            w = indices[e]
+            length = 1 if lengths is None else lengths[e]
+            if w not in nbrs or length < nbrs[w]:
+                nbrs[w] = length
+    return adj
+
+
+def _metric(shared, metric, sources):
+    """One metric (or a chunk of betweenness sources) and its run time."""
+    start = time.perf_counter()
+    n = len(shared["indptr"]) - 1
+    if metric == "degree":
+        values = shared["degree"] / (n - 1) if n > 1 else np.ones(n)
+    elif metric == "weighted_degree":
+        weights = shared["weights"]
+        values = np.bincount(shared["edge_src"], weights, minlength=n)
+        values = values + np.bincount(shared["edge_dst"], weights, minlength=n)
+    elif metric == "pagerank":
+        values = _pagerank(shared)
+    elif metric == "betweenness":
+        weight = None if shared["lengths"] is None else _edge_length
+        total, _ = _source_sums(shared["adjacency"], sources, weight, False)
+        values = np.fromiter(total.values(), dtype=float, count=n)
+    else:
+        raise ValueError(f"Unknown metric {metric!r}; choose from {METRICS}.")
+    return metric, values, time.perf_counter() - start
+
+
+def _init_table_worker(shared):
+    global _table_state
+    _table_state = shared
+
+
+def _worker_metric(task):
+    return _metric(_table_state, *task)
+
+
+def centrality_table(
+    G, metrics=METRICS, weight="weight", distance=None, n_jobs=1
+) -> pd.DataFrame:
+    """
+    Several centrality measures of every node, from one conversion of G.
+
+    G is converted to a CSRGraph once (unless it already is one),
+    and every metric is computed from its arrays:
+
+    - `degree`: `nx.degree_centrality`.
+    - `weighted_degree`: the sum of `weight` over each node's edges,
+      as `G.degree(weight=weight)`.
+    - `pagerank`: `nx.pagerank(G, weight=weight)`.
+    - `betweenness`: `nx.betweenness_centrality(G, weight=distance)`.
+
+    With `n_jobs` > 1 the metrics run concurrently in a process pool,
+    with betweenness split into chunks of sources.
+    Values agree with NetworkX to floating-point rounding.
+
+    :param metrics: Names of the metrics to compute, in column order.
+    :param weight: Edge attribute used as edge strength.
+    :param distance: Edge attribute used as edge length for betweenness;
+        None counts hops.
+    :param n_jobs: Number of processes.
+    :returns: A DataFrame indexed by node with one column per metric.
+        `df.attrs["timings"]` is a dict of the seconds spent on the conversion
+        and on each metric, summed over processes.
+    """
+    metrics = list(metrics)
+    start = time.perf_counter()
+    C = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    shared = {
+        "indptr": C.indptr,
+        "indices": C.indices,
+        "edge_ids": C.edge_ids,
+        "edge_src": C.edge_src,
+        "edge_dst": C.edge_dst,
+        "degree": C.degree(),
+        "weights": edge_weights(C, weight),
+        "lengths": (
+            None if distance is None else edge_weights(C, distance)[C.edge_ids].tolist()
+        ),
+    }
+    if "betweenness" in metrics:
+        shared["adjacency"] = _adjacency(
+            C.indptr.tolist(), C.indices.tolist(), shared["lengths"]
+        )
+    timings = {"conversion": time.perf_counter() - start}
+
+    tasks = [(m, None) for m in metrics if m != "betweenness"]
+    if "betweenness" in metrics:
+        sources = list(range(len(C)))
+        size = max(1, -(-len(sources) // (4 * n_jobs)))
+        tasks += [
+            ("betweenness", sources[i : i + size]) for i in range(0, len(sources), size)
+        ] or [("betweenness", [])]
+    if n_jobs > 1:
+        with ProcessPoolExecutor(
+            n_jobs, initializer=_init_table_worker, initargs=(shared,)
+        ) as pool:
+            results = list(pool.map(_worker_metric, tasks))
+    else:
+        results = [_metric(shared, *task) for task in tasks]
+
+    columns = {}
+    for metric, values, elapsed in results:
+        columns[metric] = columns[metric] + values if metric in columns else values
+        timings[metric] = timings.get(metric, 0.0) + elapsed
+    if "betweenness" in columns:
+        scale = _rescale(
+            {None: 1.0},
+            len(C),
+            normalized=True,
+            directed=C.is_directed(),
+            endpoints=False,
+        )[None]
+        columns["betweenness"] = columns["betweenness"] * scale
+
+    df = pd.DataFrame(
+        {m: columns[m] for m in metrics}, index=pd.Index(C.node_ids, name="node")
+    )
+    df.attrs["timings"] = {k: timings[k] for k in ["conversion"] + metrics}
+    return df
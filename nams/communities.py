@@ -0,0 +1,276 @@
+"""
+Seeded Louvain community detection, over many seeds at once.
+
+Louvain's result depends on the order in which it visits nodes,
+so a single `community.best_partition(G, random_state=42)` call
+shows one of many partitions of similar modularity.
+`louvain_ensemble` runs Louvain once per seed, optionally in a process pool,
+and keeps every run:
+the best-modularity partition is the usual answer,
+and the co-assignment matrix shows how often each pair of nodes
+ends up in the same community.
+
+Each run works on the graph's CSR arrays rather than on NetworkX dicts,
+and the aggregation step between levels is a sparse matrix product.
+Runs are cached in memory by graph fingerprint, weight, resolution and seed,
+so asking again for the same seeds (e.g. when a notebook cell re-runs)
+costs one fingerprint, and asking for more seeds only runs the new ones.
+The cache holds at most `CACHE_SIZE` node labels in total
+and forgets the least recently used runs first.
+"""
+
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from .csr import CSRGraph, edge_weights
+
+_worker_state = None
+
+# Total number of node labels kept across all cached runs.
+CACHE_SIZE = 10_000_000
+
+# (fingerprint, weight, resolution, seed) -> (labels, modularity),
+# least recently used first.
+_runs = OrderedDict()
+
+
+def graph_fingerprint(G, weight="weight") -> str:
+    """
+    Hash of a graph's nodes, edges and edge weights.
+
+    Two graphs with the same nodes and weighted edges,
+    inserted in the same order, have the same fingerprint.
+
+    :param G: A NetworkX graph or CSRGraph.
+    :param weight: Edge attribute included in the hash.
+    """
+    C = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    return _fingerprint(C, edge_weights(C, weight))
+
+
+def _fingerprint(C, weights):
+    h = hashlib.sha256()
+    h.update(repr((C.directed, C.node_ids.tolist())).encode())
+    h.update(np.ascontiguousarray(C.edge_src, dtype=np.int64))
+    h.update(np.ascontiguousarray(C.edge_dst, dtype=np.int64))
+    h.update(np.ascontiguousarray(weights, dtype=float))
+    return h.hexdigest()[:32]
+
+
+def _adjacency(C, weights):
+    """Symmetric adjacency matrix; a self-loop of weight w is stored as 2w."""
+    n = len(C)
+    A = sp.coo_array((weights, (C.edge_src, C.edge_dst)), shape=(n, n))
+    return (A + A.T).tocsr()
+
+
+def modularity(A, labels, resolution=1.0) -> float:
+    """
+    Modularity of `labels` on the symmetric adjacency matrix `A`,
+    as `nx.community.modularity`.
+    """
+    two_m = A.sum()
+    if two_m == 0:
+        return 0.0
+    A = sp.coo_array(A)
+    same = labels[A.row] == labels[A.col]
+    tot = np.bincount(labels, weights=A.sum(axis=1))
+    return A.data[same].sum() / two_m - resolution * (tot**2).sum() / two_m**2
+
+
+def _move_nodes(A, resolution, rng):
+    """
+    Louvain's local moving phase on one level.
+
+    Visits the nodes in a random order,
+    moving each one to the neighbouring community with the largest gain,
+    until a full pass moves nothing.
+    Returns each node's community, numbered from 0.
+    """
+    n = A.shape[0]
+    indptr, indices, data = A.indptr.tolist(), A.indices.tolist(), A.data.tolist()
+    k = A.sum(axis=1).tolist()
+    scale = resolution / A.sum()
+    community = list(range(n))
+    tot = list(k)
+    order = rng.permutation(n).tolist()
+    moved = True
+    while moved:
+        moved = False
+        for i in order:
+            links = {}
+            for p in range(indptr[i], indptr[i + 1]):
+                j = indices[p]
+                if j != i:
+                    c = community[j]
+                    links[c] = links.get(c, 0.0) + data[p]
+            own = community[i]
+            ki = k[i]
+            tot[own] -= ki
+            best = own
+            best_gain = links.get(own, 0.0) - tot[own] * ki * scale
+            for c, w in links.items():
+                gain = w - tot[c] * ki * scale
+                if gain > best_gain:
+                    best, best_gain = c, gain
+            tot[best] += ki
+            if best != own:
+                community[i] = best
+                moved = True
+    return np.unique(community, return_inverse=True)[1]
+
+
+def _louvain(A, resolution, seed):
+    """
+    Louvain on the symmetric adjacency matrix `A`.
+
+    :returns: Each node's community, numbered in order of first appearance,
+        and the partition's modularity.
+    """
+    rng = np.random.default_rng(seed)
+    n = A.shape[0]
+    labels = np.arange(n)
+    if A.sum() == 0:
+        return labels, 0.0
+    level = A
+    while True:
+        community = _move_nodes(level, resolution, rng)
+        k = community.max() + 1
+        if k == level.shape[0]:
+            break
+        labels = community[labels]
+        H = sp.csr_array(
+            (np.ones(len(community)), (np.arange(len(community)), community))
+        )
+        level = (H.T @ level @ H).tocsr()
+    _, first, labels = np.unique(labels, return_index=True, return_inverse=True)
+    labels = np.argsort(np.argsort(first))[labels]
+    return labels, modularity(A, labels, resolution)
+
+
+def _init_worker(A, resolution):
+    global _worker_state
+    _worker_state = (A, resolution)
+
+
+def _worker_run(seed):
+    A, resolution = _worker_state
+    return _louvain(A, resolution, seed)
+
+
+class CommunityEnsemble:
+    """
+    Louvain partitions of one graph, one per seed.
+
+    :ivar node_ids: Node ids, in the order of the columns of `labels`.
+    :ivar seeds: The seed of each run.
+    :ivar labels: (runs, nodes) array of community numbers.
+    :ivar modularity: Modularity of each run.
+    """
+
+    def __init__(self, node_ids, seeds, labels, modularity):
+        self.node_ids = node_ids
+        self.seeds = list(seeds)
+        self.labels = labels
+        self.modularity = modularity
+
+    def __repr__(self):
+        return (
+            f"CommunityEnsemble({len(self.node_ids)} nodes, {len(self.seeds)} runs,"
+            f" best modularity {self.modularity.max():.4f})"
+        )
+
+    @property
+    def best(self) -> int:
+        """Index of the run with the highest modularity (the first, on ties)."""
+        return int(np.argmax(self.modularity))
+
+    @property
+    def partition(self) -> dict:
+        """The best run, as a {node: community} dict like `best_partition`'s."""
+        return dict(zip(self.node_ids.tolist(), self.labels[self.best].tolist()))
+
+    def coassignment(self) -> pd.DataFrame:
+        """
+        Fraction of runs that put each pair of nodes in the same community.
+
+        This is a dense (nodes, nodes) table.
+        """
+        runs, n = self.labels.shape
+        total = np.zeros((n, n))
+        for labels in self.labels:
+            H = sp.csr_array((np.ones(n), (np.arange(n), labels)))
+            total += (H @ H.T).toarray()
+        return pd.DataFrame(total / runs, index=self.node_ids, columns=self.node_ids)
+
+
+def louvain_ensemble(
+    G, seeds=10, weight="weight", resolution=1.0, n_jobs=1
+) -> CommunityEnsemble:
+    """
+    Run Louvain community detection once per seed.
+
+    Runs already computed for the same graph, weight, resolution and seed
+    are taken from the cache; the rest run in a process pool
+    when `n_jobs` > 1.
+    The cache is bounded by `CACHE_SIZE`,
+    so runs of graphs not used for a while are computed afresh.
+
+    :param G: An undirected NetworkX graph or CSRGraph.
+    :param seeds: Number of runs (seeded 0, 1, ...) or a list of seeds.
+    :param weight: Edge attribute used as edge weight; missing weights count 1.
+    :param resolution: Louvain's resolution parameter;
+        larger values give smaller communities.
+    :param n_jobs: Number of processes.
+    """
+    C = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    if C.is_directed():
+        raise ValueError("Louvain needs an undirected graph.")
+    seeds = list(range(seeds)) if isinstance(seeds, int) else list(seeds)
+    weights = edge_weights(C, weight)
+    key = (_fingerprint(C, weights), weight, resolution)
+
+    found = {}
+    for s in dict.fromkeys(seeds):
+        if key + (s,) in _runs:
+            _runs.move_to_end(key + (s,))
+            found[s] = _runs[key + (s,)]
+    todo = [s for s in dict.fromkeys(seeds) if s not in found]
+    if todo:
+        A = _adjacency(C, weights)
+        if n_jobs > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(
+                min(n_jobs, len(todo)),
+                initializer=_init_worker,
+                initargs=(A, resolution),
+            ) as pool:
+                results = list(pool.map(_worker_run, todo))
+        else:
+            results = [_louvain(A, resolution, s) for s in todo]
+        for s, result in zip(todo, results):
+            found[s] = _runs[key + (s,)] = result
+        _evict()
+
+    runs = [found[s] for s in seeds]
+    labels = np.array([r[0] for r in runs]).reshape(len(seeds), len(C))
+    return CommunityEnsemble(
+        C.node_ids, seeds, labels, np.array([r[1] for r in runs], dtype=float)
+    )
+
+
+def _evict():
+    """Drop the least recently used runs until at most CACHE_SIZE labels remain."""
+    size = sum(len(labels) for labels, _ in _runs.values())
+    while size > CACHE_SIZE:
+        labels, _ = _runs.popitem(last=False)[1]
+        size -= len(labels)
+
+
+def clear_cache():
+    """Forget every cached Louvain run."""
+    _runs.clear()
@@ -0,0 +1,340 @@
+"""
+A compact, array-backed graph type.
+
+`CSRGraph` keeps the same information as a simple NetworkX graph
+(node ids, node/edge attributes, directedness, graph attributes)
+in NumPy arrays instead of dicts of dicts:
+
+- `node_ids`: the node ids, in NetworkX node order.
+  `index` maps each node id back to its position.
+- `edge_src`, `edge_dst`: a columnar edge table of node positions,
+  in NetworkX edge order.
+  `edge_attrs` holds one array per edge attribute, aligned to that table.
+- `indptr`, `indices`, `edge_ids`: a CSR adjacency index over that table.
+  Row `i` lists the (out-)neighbors of node `i`, sorted by position,
+  and `edge_ids` gives the edge table row behind each entry.
+  Undirected edges appear in the rows of both of their endpoints.
+
+That costs a few dozen bytes per edge,
+against several hundred for a NetworkX graph.
+"""
+
+import copy
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+
+class _Missing:
+    """Placeholder for nodes or edges that lack a given attribute."""
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __reduce__(self):
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+def column(values) -> np.ndarray:
+    """
+    Store a sequence of values as a 1-D NumPy array.
+
+    Values of a single int/float/bool/str type get a fixed-width dtype;
+    anything else (mixed types, missing values, objects)
+    falls back to an object array, so no value is ever coerced.
+    """
+    values = list(values)
+    if len({type(v) for v in values}) == 1:
+        arr = np.asarray(values)
+        if arr.ndim == 1 and arr.dtype.kind in "biufU":
+            return arr
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _index_dtype(n):
+    """Use 32-bit indices whenever they are wide enough."""
+    return np.int32 if n < np.iinfo(np.int32).max else np.int64
+
+
+class CSRGraph:
+    """
+    An immutable graph stored as a columnar edge table plus a CSR index.
+
+    Build one with `CSRGraph.from_networkx(G)`
+    and go back with `to_networkx()`; the round trip is lossless
+    for simple (non-multi) graphs.
+
+    :param node_ids: Node ids, one per node.
+    :param edge_src: Position (in node_ids) of each edge's source node.
+    :param edge_dst: Position (in node_ids) of each edge's target node.
+    :param directed: Whether edges are directed.
+    :param node_attrs: Attribute name -> array aligned to node_ids.
+    :param edge_attrs: Attribute name -> array aligned to the edge table.
+    :param graph: Graph-level attributes.
+    :param csr: Optional precomputed (indptr, indices, edge_ids) for this edge
+        table, e.g. from a snapshot; built from the edge table if omitted.
+    """
+
+    def __init__(
+        self,
+        node_ids,
+        edge_src,
+        edge_dst,
+        directed=False,
+        node_attrs=None,
+        edge_attrs=None,
+        graph=None,
+        csr=None,
+    ):
+        self.node_ids = node_ids
+        self.index = {n: i for i, n in enumerate(node_ids.tolist())}
+        self.directed = directed
+        self.node_attrs = dict(node_attrs or {})
+        self.edge_attrs = dict(edge_attrs or {})
+        self.graph = dict(graph or {})
+
+        n = len(node_ids)
+        itype = _index_dtype(max(n, 2 * len(edge_src)))
+        self.edge_src = np.asarray(edge_src, dtype=itype)
+        self.edge_dst = np.asarray(edge_dst, dtype=itype)
+        if csr is None:
+            csr = _build_csr(n, self.edge_src, self.edge_dst, directed, itype)
+        self.indptr, self.indices, self.edge_ids = csr
+
+        self._degree = np.bincount(self.edge_src, minlength=n) + np.bincount(
+            self.edge_dst, minlength=n
+        )
+
+    @classmethod
+    def from_networkx(cls, G):
+        """Convert a NetworkX Graph or DiGraph."""
+        if G.is_multigraph():
+            raise TypeError("CSRGraph does not support multigraphs.")
+
+        nodes = list(G.nodes())
+        index = {n: i for i, n in enumerate(nodes)}
+        edges = list(G.edges(data=True))
+        m = len(edges)
+        src = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=m)
+        dst = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=m)
+
+        return cls(
+            column(nodes) if nodes else np.empty(0, dtype=np.int64),
+            src,
+            dst,
+            directed=G.is_directed(),
+            node_attrs=_attribute_columns(d for _, d in G.nodes(data=True)),
+            edge_attrs=_attribute_columns(d for _, _, d in edges),
+            graph=G.graph,
+        )
+
+    def to_networkx(self):
+        """Convert back into a NetworkX Graph or DiGraph."""
+        G = nx.DiGraph() if self.directed else nx.Graph()
+        G.graph.update(self.graph)
+        nodes = self.node_ids.tolist()
+        G.add_nodes_from(zip(nodes, _attribute_records(self.node_attrs, len(nodes))))
+        u = [nodes[i] for i in self.edge_src.tolist()]
+        v = [nodes[i] for i in self.edge_dst.tolist()]
+        G.add_edges_from(zip(u, v, _attribute_records(self.edge_attrs, len(u))))
+        return G
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def __iter__(self):
+        return iter(self.node_ids.tolist())
+
+    def __contains__(self, n):
+        return n in self.index
+
+    def __repr__(self):
+        kind = "directed" if self.directed else "undirected"
+        return (
+            f"CSRGraph({kind}, {self.number_of_nodes()} nodes, "
+            f"{self.number_of_edges()} edges)"
+        )
+
+    def copy(self):
+        """
+        A copy with its own attribute dicts.
+
+        The underlying arrays are shared, as they are never modified in place.
+        """
+        H = copy.copy(self)
+        H.node_attrs = dict(self.node_attrs)
+        H.edge_attrs = dict(self.edge_attrs)
+        H.graph = dict(self.graph)
+        return H
+
+    def is_directed(self):
+        return self.directed
+
+    def is_multigraph(self):
+        return False
+
+    def number_of_nodes(self):
+        return len(self.node_ids)
+
+    def number_of_edges(self):
+        return len(self.edge_src)
+
+    def nodes(self, data=False):
+        """Node ids, or (node, attribute dict) pairs if `data` is True."""
+        nodes = self.node_ids.tolist()
+        if not data:
+            return nodes
+        return list(zip(nodes, _attribute_records(self.node_attrs, len(nodes))))
+
+    def edges(self, data=False):
+        """Edges as (u, v) pairs, or (u, v, attribute dict) if `data` is True."""
+        nodes = self.node_ids.tolist()
+        u = [nodes[i] for i in self.edge_src.tolist()]
+        v = [nodes[i] for i in self.edge_dst.tolist()]
+        if not data:
+            return list(zip(u, v))
+        return list(zip(u, v, _attribute_records(self.edge_attrs, len(u))))
+
+    def neighbor_indices(self, i):
+        """Positions of the (out-)neighbors of the node at position `i`."""
+        return self.indices[self.indptr[i] : self.indptr[i + 1]]
+
+    def neighbors(self, n):
+        """The (out-)neighbors of node `n`, like `G.neighbors(n)`."""
+        try:
+            i = self.index[n]
+        except KeyError:
+            raise nx.NetworkXError(f"The node {n} is not in the graph.")
+        return self.node_ids[self.neighbor_indices(i)].tolist()
+
+    def reverse_csr(self):
+        """
+        (indptr, indices) arrays listing the in-neighbors of every node.
+
+        For undirected graphs this is just the CSR index itself.
+        The reversed index is built on first use and then kept.
+        """
+        if not self.directed:
+            return self.indptr, self.indices
+        if getattr(self, "_reverse_csr", None) is None:
+            order = np.lexsort((self.edge_src, self.edge_dst))
+            indptr = np.zeros_like(self.indptr)
+            np.cumsum(np.bincount(self.edge_dst, minlength=len(self)), out=indptr[1:])
+            self._reverse_csr = (indptr, self.edge_src[order])
+        return self._reverse_csr
+
+    def degree(self, n=None):
+        """
+        Degree of node `n`, or an array of every node's degree.
+
+        As in NetworkX, directed degree is in-degree plus out-degree
+        and self-loops count twice.
+        """
+        if n is None:
+            return self._degree
+        return int(self._degree[self.index[n]])
+
+    def has_edge(self, u, v):
+        """Whether the edge u-v (u->v if directed) exists."""
+        i = self.index.get(u)
+        j = self.index.get(v)
+        if i is None or j is None:
+            return False
+        row = self.neighbor_indices(i)
+        k = np.searchsorted(row, j)
+        return bool(k < len(row) and row[k] == j)
+
+    def subgraph(self, nodes):
+        """
+        The subgraph induced by `nodes`, as a new CSRGraph.
+
+        Nodes that are not in the graph are ignored,
+        and node and edge order follow this graph.
+        """
+        keep = np.zeros(len(self), dtype=bool)
+        keep[[self.index[n] for n in nodes if n in self.index]] = True
+        new_pos = np.cumsum(keep) - 1
+        edge_keep = keep[self.edge_src] & keep[self.edge_dst]
+        return CSRGraph(
+            self.node_ids[keep],
+            new_pos[self.edge_src[edge_keep]],
+            new_pos[self.edge_dst[edge_keep]],
+            directed=self.directed,
+            node_attrs={k: a[keep] for k, a in self.node_attrs.items()},
+            edge_attrs={k: a[edge_keep] for k, a in self.edge_attrs.items()},
+            graph=self.graph,
+        )
+
+    def adjacency_matrix(self, weight=None, dtype=None):
+        """
+        The adjacency matrix as a SciPy CSR array, rows/columns in node order.
+
+        :param weight: Edge attribute to use as entries; 1 for every edge if None.
+        """
+        if weight is None:
+            data = np.ones(len(self.indices), dtype=dtype or np.int64)
+        else:
+            data = np.asarray(self.edge_attrs[weight], dtype=dtype)[self.edge_ids]
+        n = len(self)
+        return sp.csr_array((data, self.indices, self.indptr), shape=(n, n))
+
+
+def _build_csr(n, src, dst, directed, itype):
+    """Sort the edge table into CSR (indptr, indices, edge_ids) arrays."""
+    rows, cols = src, dst
+    eids = np.arange(len(src), dtype=itype)
+    if not directed:
+        # Undirected edges are indexed from both ends (self-loops once).
+        back = rows != cols
+        rows = np.concatenate([src, dst[back]])
+        cols = np.concatenate([dst, src[back]])
+        eids = np.concatenate([eids, eids[back]])
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(n + 1, dtype=itype)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order], eids[order]
+
+
+def _attribute_columns(records):
+    """Turn per-node or per-edge attribute dicts into one column per key."""
+    records = list(records)
+    keys = dict.fromkeys(k for d in records for k in d)
+    return {k: column(d.get(k, MISSING) for d in records) for k in keys}
+
+
+def _attribute_records(columns, n):
+    """Turn attribute columns back into per-node or per-edge dicts."""
+    records = [{} for _ in range(n)]
+    for k, arr in columns.items():
+        for d, v in zip(records, arr.tolist()):
+            if v is not MISSING:
+                d[k] = v
+    return records
+
+
+def edge_weights(G, weight) -> np.ndarray:
+    """
+    Each edge's `weight` in a CSRGraph, as floats, in edge table order.
+
+    Edges without the attribute, or every edge if `weight` is None, count as 1,
+    as in `G.degree(weight=...)`.
+    """
+    values = G.edge_attrs.get(weight) if weight is not None else None
+    if values is None:
+        return np.ones(len(G.edge_src))
+    if values.dtype == object:
+        values = [1 if v is MISSING else v for v in values]
+    return np.asarray(values, dtype=float)
+
+
+def degree_centrality(G):
+    """`nx.degree_centrality` for either a NetworkX graph or a CSRGraph."""
+    if not isinstance(G, CSRGraph):
+        return nx.degree_centrality(G)
+    if len(G) <= 1:
+        return {n: 1 for n in G}
+    return dict(zip(G.nodes(), (G.degree() / (len(G) - 1)).tolist()))
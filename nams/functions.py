@@ -1,5 +1,61 @@
 import numpy as np
+import pandas as pd
 
 
 def ecdf(data):
     return np.sort(data), np.arange(1, len(data) + 1) / len(data)
+
+
+def grouped_top_k(groups, scores, k=1) -> pd.DataFrame:
+    """
+    The `k` highest-scoring nodes of every group.
+
+    Groups come out in sorted order, and nodes within a group
+    by descending score; ties keep the order of `groups`.
+    Every group appears, even if all of its scores are zero.
+
+    :param groups: node -> group, as a dict (e.g. a Louvain partition)
+        or a Series indexed by node.
+    :param scores: node -> score, as a dict or Series,
+        or an array aligned with `groups`.
+        Nodes without a score are left out.
+    :param k: Number of nodes to keep per group.
+    :returns: A DataFrame with columns `group`, `node` and `score`.
+    """
+    groups = pd.Series(groups)
+    if isinstance(scores, (dict, pd.Series)):
+        scores = pd.Series(scores).reindex(groups.index).to_numpy(dtype=float)
+    scores = np.asarray(scores, dtype=float)
+    scored = ~np.isnan(scores)
+    codes, labels = pd.factorize(groups.to_numpy()[scored], sort=True)
+    scores = scores[scored]
+    nodes = groups.index[scored]
+    if not len(scores):
+        return pd.DataFrame({"group": labels, "node": nodes, "score": scores})
+
+    if k == 1:
+        # idxmax picks the first of any tied maxima, without sorting.
+        top = pd.Series(scores).groupby(codes).idxmax().to_numpy()
+    else:
+        # Only nodes among the highest scores overall need sorting:
+        # a group with at least k nodes above the cut-off has its top k there,
+        # and the few groups without keep all their nodes.
+        n, n_groups = len(scores), len(labels)
+        cut = n - min(n, 4 * k * n_groups)
+        candidate = scores >= np.partition(scores, cut)[cut]
+        short = np.bincount(codes[candidate], minlength=n_groups) < np.minimum(
+            k, np.bincount(codes, minlength=n_groups)
+        )
+        candidate |= short[codes]
+        index = np.flatnonzero(candidate)
+        # Stable sorts keep ties in their original order,
+        # and small unsigned group codes let NumPy radix-sort the groups.
+        group = codes[index].astype(np.min_scalar_type(n_groups - 1))
+        order = np.argsort(-scores[index], kind="stable")
+        order = order[np.argsort(group[order], kind="stable")]
+        starts = np.searchsorted(group[order], np.arange(n_groups))
+        rank = np.arange(len(order)) - starts[group[order]]
+        top = index[order[rank < k]]
+    return pd.DataFrame(
+        {"group": labels[codes[top]], "node": nodes[top], "score": scores[top]}
+    )
@@ -1,14 +1,40 @@
 import gzip
 import json
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 import networkx as nx
+import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from pyprojroot import here
 from tqdm import tqdm
 
+from .cache import cached_graph
+
 datasets = here() / "data"
 
 
+def _add_edgelist(G, df, source, target, edge_attr=()):
+    """
+    Add the edges of an edge-list DataFrame to G in a single call.
+
+    The source, target and attribute columns are pulled out as whole arrays
+    and handed to `G.add_edges_from`, rather than walking `df.iterrows()`
+    and calling `G.add_edge` once per row.
+    """
+    sources = df[source].tolist()
+    targets = df[target].tolist()
+    if edge_attr:
+        attrs = df[list(edge_attr)].to_dict("records")
+        G.add_edges_from(zip(sources, targets, attrs))
+    else:
+        G.add_edges_from(zip(sources, targets))
+    return G
+
+
+@cached_graph(datasets / "moreno_seventh")
 def load_seventh_grader_network():
     # Read the edge list
     df = pd.read_csv(
@@ -28,15 +54,13 @@ def load_seventh_grader_network():
     meta.columns = ["gender"]
 
     # Construct graph from edge list.
-    G = nx.DiGraph()
-    for row in df.iterrows():
-        G.add_edge(row[1]["student1"], row[1]["student2"], count=row[1]["count"])
+    G = _add_edgelist(nx.DiGraph(), df, "student1", "student2", ["count"])
     # Add node metadata
-    for n in G.nodes():
-        G.nodes[n]["gender"] = meta.loc[n]["gender"]
+    nx.set_node_attributes(G, meta.loc[list(G.nodes()), "gender"].to_dict(), "gender")
     return G
 
 
+@cached_graph(datasets / "ego-facebook")
 def load_facebook_network():
     # Read the edge list
 
@@ -46,13 +70,12 @@ def load_facebook_network():
     df = df[[0, 1]]
     df.columns = ["user1", "user2"]
 
-    G = nx.DiGraph()
-    for row in df.iterrows():
-        G.add_edge(row[1]["user1"], row[1]["user2"])
+    G = _add_edgelist(nx.DiGraph(), df, "user1", "user2")
 
     return G
 
 
+@cached_graph(datasets / "sociopatterns-infectious")
 def load_sociopatterns_network():
     # Read the edge list
 
@@ -62,24 +85,29 @@ def load_sociopatterns_network():
         skiprows=2,
         header=None,
     )
-    df = df[[0, 1, 2]]
-    df.columns = ["person1", "person2", "weight"]
-
-    G = nx.Graph()
-    for row in df.iterrows():
-        p1 = row[1]["person1"]
-        p2 = row[1]["person2"]
-        if G.has_edge(p1, p2):
-            G.edges[p1, p2]["weight"] += 1
-        else:
-            G.add_edge(p1, p2, weight=1)
+    df = df[[0, 1]]
+    df.columns = ["person1", "person2"]
+
+    # Repeated contacts between a pair of people (in either direction)
+    # collapse into one edge, weighted by the number of contacts.
+    # Each pair keeps the orientation of its first contact.
+    pair = [
+        np.minimum(df["person1"], df["person2"]),
+        np.maximum(df["person1"], df["person2"]),
+    ]
+    edges = df.groupby(pair, sort=False).agg(
+        person1=("person1", "first"),
+        person2=("person2", "first"),
+        weight=("person1", "size"),
+    )
 
-    for n in sorted(G.nodes()):
-        G.nodes[n]["order"] = float(n)
+    G = _add_edgelist(nx.Graph(), edges, "person1", "person2", ["weight"])
+    nx.set_node_attributes(G, {n: float(n) for n in G.nodes()}, "order")
 
     return G
 
 
+@cached_graph(datasets / "moreno_innovation")
 def load_physicians_network():
     # Read the edge list
 
@@ -92,13 +120,12 @@ def load_physicians_network():
     df = df[[0, 1]]
     df.columns = ["doctor1", "doctor2"]
 
-    G = nx.Graph()
-    for row in df.iterrows():
-        G.add_edge(row[1]["doctor1"], row[1]["doctor2"])
+    G = _add_edgelist(nx.Graph(), df, "doctor1", "doctor2")
 
     return G
 
 
+@cached_graph(datasets / "moreno_propro")
 def load_propro_network():
     propro = pd.read_csv(
         datasets / "moreno_propro/out.moreno_propro_propro.txt",
@@ -113,6 +140,7 @@ def load_propro_network():
     return G
 
 
+@cached_graph(datasets / "moreno_crime")
 def load_crime_network():
     df = pd.read_csv(
         datasets / "moreno_crime/out.moreno_crime_crime",
@@ -131,27 +159,31 @@ def load_crime_network():
     roles.columns = ["roles"]
     roles.index += 1
 
-    # Add the edge data to the graph.
+    df = df.join(roles)
+    df["pid"] = "p" + df["personID"].astype(str)  # pid stands for "Person I.D."
+    df["cid"] = "c" + df["crimeID"].astype(str)  # cid stands for "Crime I.D."
+
+    # Add the nodes, interleaved so that node order follows the edge list.
+    nodes = np.column_stack([df["pid"], df["cid"]]).ravel().tolist()
+    partitions = ["person", "crime"] * len(df)
     G = nx.Graph()
-    for r, d in df.join(roles).iterrows():
-        pid = "p{0}".format(d["personID"])  # pid stands for "Person I.D."
-        cid = "c{0}".format(d["crimeID"])  # cid stands for "Crime I.D."
-        G.add_node(pid, bipartite="person")
-        G.add_node(cid, bipartite="crime")
-        G.add_edge(pid, cid, role=d["roles"])
+    G.add_nodes_from((n, {"bipartite": b}) for n, b in zip(nodes, partitions))
+
+    # Add the edge data to the graph.
+    df = df.rename(columns={"roles": "role"})
+    _add_edgelist(G, df, "pid", "cid", ["role"])
 
     # Read in the gender metadata
     gender = pd.read_csv(
         datasets / "moreno_crime/ent.moreno_crime_crime.person.sex", header=None
     )
-    gender.index += 1
-    for n, gender_code in gender.iterrows():
-        nodeid = "p{0}".format(n)
-        G.nodes[nodeid]["gender"] = gender_code[0]
+    gender.index = "p" + (gender.index + 1).astype(str)
+    nx.set_node_attributes(G, gender[0].to_dict(), "gender")
 
     return G
 
 
+@cached_graph(datasets / "moreno_oz")
 def load_university_social_network():
     G = nx.read_edgelist(
         datasets / "moreno_oz/out.moreno_oz_oz",
@@ -164,32 +196,110 @@ def load_university_social_network():
     return G
 
 
-def load_amazon_reviews():
-    # Read raw data.
-    data = []
-    with gzip.open(
-        datasets / "amazon_reviews/reviews_Digital_Music_5.json.gz", "rt"
-    ) as f:
-        for line in tqdm(f.readlines()):
-            # Clean data
-            line = line.strip("\n")
-            # Parse with JSON
-            j = json.loads(line)
-            data.append(j)
-
-    # Add nodes
-    G = nx.Graph()  # noqa: N806
-    for d in tqdm(data):
-        G.add_node(d["asin"], bipartite="product")
-        G.add_node(d["reviewerID"], bipartite="customer")
+def _parse_review_block(block):
+    """Pull the (reviewerID, asin) pair out of each JSON line in a bytes block."""
+    pairs = []
+    for line in block.splitlines():
+        j = json.loads(line)
+        pairs.append((j["reviewerID"], j["asin"]))
+    return pairs
+
+
+def _iter_review_blocks(f, block_size):
+    """Read `block_size` bytes at a time, cut back to the last full line."""
+    tail = b""
+    while True:
+        chunk = f.read(block_size)
+        if not chunk:
+            break
+        head, _, rest = (tail + chunk).rpartition(b"\n")
+        tail = rest
+        if head:
+            yield head
+    if tail.strip():
+        yield tail
+
+
+def _iter_review_pairs(path, n_jobs=1, block_size=1 << 22):
+    """
+    Stream (reviewerID, asin) pairs out of a gzipped JSON-lines review file.
+
+    The file is decompressed incrementally, `block_size` bytes at a time,
+    so the raw lines and parsed records never all sit in memory at once.
+    With `n_jobs > 1`, blocks are parsed in a process pool
+    with at most `2 * n_jobs` blocks in flight.
+    Pairs are yielded in file order either way.
+    """
+    with gzip.open(path, "rb") as f:
+        blocks = _iter_review_blocks(f, block_size)
+        if n_jobs == 1:
+            for block in blocks:
+                yield from _parse_review_block(block)
+            return
+
+        with ProcessPoolExecutor(n_jobs) as pool:
+            pending = deque()
+            for block in blocks:
+                pending.append(pool.submit(_parse_review_block, block))
+                if len(pending) >= 2 * n_jobs:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+
+@cached_graph(datasets / "amazon_reviews")
+def load_amazon_reviews(n_jobs=1):
+    """
+    Load the Amazon digital music reviews as a customer-product graph.
+
+    :param n_jobs: Number of processes used to parse the JSON lines.
+    """
+    reviews = _iter_review_pairs(
+        datasets / "amazon_reviews/reviews_Digital_Music_5.json.gz", n_jobs
+    )
 
-    # Add edges
-    for d in tqdm(data):
-        G.add_edge(d["reviewerID"], d["asin"])
+    G = nx.Graph()  # noqa: N806
+    for customer, product in tqdm(reviews):
+        G.add_node(product, bipartite="product")
+        G.add_node(customer, bipartite="customer")
+        G.add_edge(customer, product)
 
     return G
 
 
+def load_amazon_reviews_biadjacency(n_jobs=1):
+    """
+    Load the Amazon digital music reviews as a biadjacency matrix.
+
+    This skips building the NetworkX graph altogether.
+    Customers are rows and products are columns, both in the order
+    in which they first appear in the file (i.e. the node order of
+    `load_amazon_reviews`), so the matrix equals
+    `nx.bipartite.biadjacency_matrix(G, row_order=customers, column_order=products)`.
+
+    :param n_jobs: Number of processes used to parse the JSON lines.
+    :returns: A tuple of (scipy CSR array, customer ids, product ids).
+    """
+    reviews = _iter_review_pairs(
+        datasets / "amazon_reviews/reviews_Digital_Music_5.json.gz", n_jobs
+    )
+
+    customers, products = {}, {}
+    rows, cols = array("q"), array("q")
+    for customer, product in tqdm(reviews):
+        rows.append(customers.setdefault(customer, len(customers)))
+        cols.append(products.setdefault(product, len(products)))
+
+    rows = np.frombuffer(rows, dtype=np.int64)
+    cols = np.frombuffer(cols, dtype=np.int64)
+    mat = sp.coo_array(
+        (np.ones(len(rows), dtype=np.int64), (rows, cols)),
+        shape=(len(customers), len(products)),
+    ).tocsr()
+    mat.data[:] = 1  # A customer reviewing a product twice is still one edge.
+    return mat, list(customers), list(products)
+
+
 def load_game_of_thrones_data():
     books = pd.read_csv(datasets / "game_of_thrones_network/asoiaf.csv", index_col="id")
     return books
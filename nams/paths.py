@@ -0,0 +1,441 @@
+"""
+Reachability queries: does a path exist from one node to another?
+
+`bidirectional_path_exists` answers one question with a BFS
+from both ends at once, expanding the smaller frontier at every step.
+`ReachabilityIndex` precomputes component and DAG labels once,
+so that many `path_exists` questions are answered together,
+most of them by comparing labels rather than by searching the graph.
+"""
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+from scipy.sparse.csgraph import connected_components
+
+from .csr import CSRGraph
+
+
+def _expand(indptr, indices, frontier):
+    """All neighbors of the nodes in `frontier`, gathered in one array."""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return indices[offsets + np.arange(counts.sum())]
+
+
+def _dedupe(x):
+    """np.unique for small integer arrays, without its per-call overhead."""
+    x = np.sort(x)
+    return x[np.concatenate(([True], x[1:] != x[:-1]))] if x.size else x
+
+
+def _csr_reachable(G, source, targets):
+    """
+    Bidirectional BFS over a CSRGraph, on integer node positions.
+
+    Each step expands the smaller frontier as a whole,
+    with boolean arrays as the visited marks of either side.
+    """
+    fwd = G.indptr, G.indices
+    bwd = G.reverse_csr()
+    fwd_seen = np.zeros(len(G), dtype=bool)
+    bwd_seen = np.zeros(len(G), dtype=bool)
+    fwd_front = np.array([source])
+    bwd_front = _dedupe(np.asarray(targets))
+    fwd_seen[fwd_front] = True
+    bwd_seen[bwd_front] = True
+    if bwd_seen[source]:
+        return True
+
+    while fwd_front.size and bwd_front.size:
+        if fwd_front.size <= bwd_front.size:
+            nbrs = _expand(*fwd, fwd_front)
+            if bwd_seen[nbrs].any():
+                return True
+            fwd_front = _dedupe(nbrs[~fwd_seen[nbrs]])
+            fwd_seen[fwd_front] = True
+        else:
+            nbrs = _expand(*bwd, bwd_front)
+            if fwd_seen[nbrs].any():
+                return True
+            bwd_front = _dedupe(nbrs[~bwd_seen[nbrs]])
+            bwd_seen[bwd_front] = True
+    return False
+
+
+def _nx_reachable(G, source, targets):
+    """
+    Bidirectional BFS over a NetworkX graph.
+
+    Adjacency dicts are walked in place rather than copied into lists.
+    """
+    succ = G._adj
+    pred = G._pred if G.is_directed() else G._adj
+    fwd_seen = {source}
+    bwd_seen = set(targets)
+    if source in bwd_seen:
+        return True
+
+    fwd_front = [source]
+    bwd_front = list(bwd_seen)
+    while fwd_front and bwd_front:
+        if len(fwd_front) <= len(bwd_front):
+            adj, front, seen, other = succ, fwd_front, fwd_seen, bwd_seen
+        else:
+            adj, front, seen, other = pred, bwd_front, bwd_seen, fwd_seen
+        next_front = []
+        for node in front:
+            for nbr in adj[node]:
+                if nbr in other:
+                    return True
+                if nbr not in seen:
+                    seen.add(nbr)
+                    next_front.append(nbr)
+        if front is fwd_front:
+            fwd_front = next_front
+        else:
+            bwd_front = next_front
+    return False
+
+
+def bidirectional_path_exists(G, node1, node2) -> bool:
+    """
+    Whether a path exists from node1 to node2, searching from both ends at once.
+
+    Edge direction is followed in directed graphs.
+    A node only has a path to itself if it sits on a cycle
+    (or, in an undirected graph, has any neighbor at all).
+
+    :param G: A NetworkX graph or a CSRGraph.
+    :raises nx.NetworkXError: If node1 is not in G.
+    """
+    if node1 not in G:
+        raise nx.NetworkXError(f"The node {node1} is not in the graph.")
+    if node2 not in G:
+        return False
+
+    if isinstance(G, CSRGraph):
+        source, target = G.index[node1], G.index[node2]
+        if source == target:
+            # Searching backwards from the predecessors of node2
+            # rules out the empty path.
+            indptr, indices = G.reverse_csr()
+            return _csr_reachable(
+                G, source, indices[indptr[target] : indptr[target + 1]]
+            )
+        return _csr_reachable(G, source, [target])
+
+    if node1 == node2:
+        pred = G._pred if G.is_directed() else G._adj
+        return _nx_reachable(G, node1, pred[node2])
+    return _nx_reachable(G, node1, [node2])
+
+
+def _union_find(n, src, dst):
+    """
+    Label the connected components of an undirected edge list.
+
+    A vectorised union-find: every round hooks the larger root of each
+    edge onto the smaller one, then compresses paths by pointer jumping,
+    until both ends of every edge share a root.
+    Each component ends up labelled by its smallest node position.
+    """
+    parent = np.arange(n)
+    while True:
+        ru, rv = parent[src], parent[dst]
+        if (ru == rv).all():
+            return parent
+        np.minimum.at(parent, np.maximum(ru, rv), np.minimum(ru, rv))
+        while True:
+            grandparent = parent[parent]
+            if (grandparent == parent).all():
+                break
+            parent = grandparent
+
+
+def _dfs_order(indptr, indices, roots):
+    """
+    Pre- and post-order numbers of a depth-first traversal of a DAG.
+
+    Children are visited in CSR order, starting from each root in turn.
+    """
+    k = len(indptr) - 1
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    nxt = indptr[:-1]
+    pre = [-1] * k
+    post = [0] * k
+    n_pre = n_post = 0
+    for root in roots.tolist():
+        pre[root] = n_pre
+        n_pre += 1
+        stack = [root]
+        while stack:
+            u = stack[-1]
+            p = nxt[u]
+            if p < indptr[u + 1]:
+                nxt[u] = p + 1
+                v = indices[p]
+                if pre[v] < 0:
+                    pre[v] = n_pre
+                    n_pre += 1
+                    stack.append(v)
+            else:
+                stack.pop()
+                post[u] = n_post
+                n_post += 1
+    return pre, post
+
+
+def _interval_labels(indptr, indices, roots, fronts, n_labels, rng):
+    """
+    (pre, post, low) labels from `n_labels` randomised DFS traversals of a DAG.
+
+    `low` is the lowest post-order number among everything a node reaches.
+    `fronts` must list every node after all of its children.
+
+    :returns: An int32 array of shape (3, n_labels, number of nodes).
+    """
+    k = len(indptr) - 1
+    counts = np.diff(indptr)
+    rows = np.repeat(np.arange(k), counts)
+    labels = np.empty((3, n_labels, k), dtype=np.int32)
+    for i in range(n_labels):
+        shuffled = indices[np.lexsort((rng.random(len(indices)), rows))]
+        pre, post = _dfs_order(indptr, shuffled, rng.permutation(roots))
+        low = np.array(post)
+        for front in fronts:
+            children = _expand(indptr, indices, front)
+            np.minimum.at(low, np.repeat(front, counts[front]), low[children])
+        labels[:, i] = pre, post, low
+    return labels
+
+
+def _nested(labels, a, b):
+    """Whether b's [low, post] interval lies inside a's for every label."""
+    _, post, low = labels
+    return ((low[:, a] <= low[:, b]) & (post[:, b] <= post[:, a])).all(axis=0)
+
+
+def _tree_descendant(labels, a, b):
+    """Whether b is a descendant of a in at least one of the DFS trees."""
+    pre, post, _ = labels
+    return ((pre[:, a] <= pre[:, b]) & (post[:, b] <= post[:, a])).any(axis=0)
+
+
+def _reach_mask(indptr, indices, source):
+    """Boolean mask of everything reachable from `source`, itself included."""
+    seen = np.zeros(len(indptr) - 1, dtype=bool)
+    front = np.array([source])
+    while front.size:
+        seen[front] = True
+        nbrs = _expand(indptr, indices, front)
+        front = _dedupe(nbrs[~seen[nbrs]])
+    return seen
+
+
+class ReachabilityIndex:
+    """
+    Precomputed answers to "does a path exist from node1 to node2?".
+
+    Undirected graphs are reduced to connected components with union-find,
+    after which every query is a single label comparison.
+
+    Directed graphs are condensed into their strongly connected components,
+    which form a DAG, and every DAG node is labelled so that most queries
+    are settled in O(1):
+
+    - its level, the length of its longest path to a sink
+      (u can only reach v if u's level is higher);
+    - `n_labels` interval labels from randomised depth-first traversals,
+      both along and against the edges (if u reaches v, v's interval nests
+      inside u's going forwards and u's inside v's going backwards; if v is
+      a DFS-tree descendant of u, u certainly reaches v);
+    - ancestor/descendant bitmasks of up to 64 well-connected landmarks
+      (u reaches v if a landmark lies between them, and cannot if a
+      landmark reaches u but not v, or v but not u reaches a landmark).
+
+    The few pairs left over are settled by one pruned BFS over the DAG
+    per distinct source.
+
+    Answers match `path_exists` in `nams.solutions.paths`: in particular,
+    a node only has a path to itself if it has a neighbor (undirected)
+    or sits on a cycle (directed).
+
+    :param G: A NetworkX graph or a CSRGraph.
+    :param n_labels: Number of interval labels per direction (directed only).
+    :param n_landmarks: Number of landmarks, at most 64 (directed only).
+    :param seed: Seed for the random traversal orders.
+    """
+
+    def __init__(self, G, n_labels=3, n_landmarks=64, seed=0):
+        if not isinstance(G, CSRGraph):
+            G = CSRGraph.from_networkx(G)
+        self.graph = G
+        self.directed = G.is_directed()
+        self._positions = pd.Index(G.node_ids)
+
+        n = len(G)
+        src, dst = G.edge_src, G.edge_dst
+        self_loop = np.zeros(n, dtype=bool)
+        self_loop[src[src == dst]] = True
+
+        if self.directed:
+            _, self.component = connected_components(
+                G.adjacency_matrix(), directed=True, connection="strong"
+            )
+            self._build_dag(src, dst, n_labels, n_landmarks, seed)
+        else:
+            roots = _union_find(n, src, dst)
+            _, self.component = np.unique(roots, return_inverse=True)
+
+        sizes = np.bincount(self.component)
+        self.on_cycle = self_loop | (sizes[self.component] > 1)
+
+    def _build_dag(self, src, dst, n_labels, n_landmarks, seed):
+        """Condense the graph and compute the DAG node labels."""
+        comp = self.component
+        k = comp.max() + 1 if len(comp) else 0
+        cu, cv = comp[src], comp[dst]
+        keep = cu != cv
+        pairs = np.unique(cu[keep].astype(np.int64) * k + cv[keep])
+        dag_src, dag_dst = pairs // k, pairs % k
+
+        fwd = (
+            np.concatenate([[0], np.cumsum(np.bincount(dag_src, minlength=k))]),
+            dag_dst,
+        )
+        bwd = (
+            np.concatenate([[0], np.cumsum(np.bincount(dag_dst, minlength=k))]),
+            dag_src[np.argsort(dag_dst, kind="stable")],
+        )
+        self._dag = fwd
+
+        # Peel off sinks level by level (Kahn's algorithm, run backwards).
+        level = np.zeros(k, dtype=np.int64)
+        remaining = np.diff(fwd[0])
+        front = np.flatnonzero(remaining == 0)
+        fronts = []
+        while front.size:
+            level[front] = len(fronts)
+            fronts.append(front)
+            preds = _expand(*bwd, front)
+            np.subtract.at(remaining, preds, 1)
+            front = _dedupe(preds[remaining[preds] == 0])
+        self.level = level
+
+        rng = np.random.default_rng(seed)
+        sources = np.flatnonzero(np.diff(bwd[0]) == 0)
+        sinks = np.flatnonzero(np.diff(fwd[0]) == 0)
+        self.forward = _interval_labels(*fwd, sources, fronts, n_labels, rng)
+        self.backward = _interval_labels(*bwd, sinks, fronts[::-1], n_labels, rng)
+
+        degree = np.diff(fwd[0]) + np.diff(bwd[0])
+        landmarks = np.argsort(-degree, kind="stable")[: min(n_landmarks, 64)]
+        self.descendants = np.zeros(k, dtype=np.uint64)
+        self.ancestors = np.zeros(k, dtype=np.uint64)
+        for bit, landmark in enumerate(landmarks.tolist()):
+            flag = np.uint64(1 << bit)
+            self.descendants[_reach_mask(*fwd, landmark)] |= flag
+            self.ancestors[_reach_mask(*bwd, landmark)] |= flag
+
+        self._seen = np.zeros(k, dtype=bool)
+
+    def _may_reach(self, cu, cv):
+        """Whether DAG nodes cu might reach cv, judging by the labels alone."""
+        zero = np.uint64(0)
+        du, dv = self.descendants[cu], self.descendants[cv]
+        au, av = self.ancestors[cu], self.ancestors[cv]
+        return (
+            (self.level[cu] > self.level[cv])
+            & _nested(self.forward, cu, cv)
+            & _nested(self.backward, cv, cu)
+            & ((du & ~dv) == zero)
+            & ((av & ~au) == zero)
+        )
+
+    def _must_reach(self, cu, cv):
+        """Whether DAG nodes cu certainly reach cv, judging by the labels alone."""
+        zero = np.uint64(0)
+        return (
+            _tree_descendant(self.forward, cu, cv)
+            | _tree_descendant(self.backward, cv, cu)
+            | ((self.ancestors[cu] & self.descendants[cv]) != zero)
+        )
+
+    def _dag_reaches(self, source, targets):
+        """
+        Which of the DAG nodes in `targets` can be reached from `source`.
+
+        The BFS skips nodes whose labels show that they cannot reach
+        any of the targets, and stops once all of them are found.
+        """
+        seen = self._seen
+        visited = [np.array([source])]
+        seen[source] = True
+        front = visited[0]
+        while front.size and not seen[targets].all():
+            nbrs = _expand(*self._dag, front)
+            nbrs = _dedupe(nbrs[~seen[nbrs]])
+            # Keep nodes that might reach at least one target.
+            might = np.zeros(len(nbrs), dtype=bool)
+            for t in np.unique(targets):
+                might |= (nbrs == t) | self._may_reach(nbrs, np.full_like(nbrs, t))
+            front = nbrs[might]
+            seen[front] = True
+            visited.append(front)
+        found = seen[targets]
+        for front in visited:
+            seen[front] = False
+        return found
+
+    def query_indices(self, sources, targets):
+        """
+        Batch path queries on node positions (indices into `graph.node_ids`).
+
+        :returns: A boolean array, True where a path exists.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        cu = self.component[sources]
+        cv = self.component[targets]
+        same_node = sources == targets
+        result = (cu == cv) & ~same_node
+        result[same_node] = self.on_cycle[sources[same_node]]
+        if not self.directed:
+            return result
+
+        # Settle what the labels can, then search for the rest,
+        # grouped by source component.
+        candidate = (cu != cv) & self._may_reach(cu, cv)
+        confirmed = candidate & self._must_reach(cu, cv)
+        result[confirmed] = True
+        rows = np.flatnonzero(candidate & ~confirmed)
+        rows = rows[np.argsort(cu[rows], kind="stable")]
+        starts = np.flatnonzero(np.diff(cu[rows], prepend=-1))
+        for group in np.split(rows, starts[1:]):
+            if group.size:
+                result[group] = self._dag_reaches(cu[group[0]], cv[group])
+        return result
+
+    def query(self, sources, targets):
+        """
+        Batch path queries on node ids.
+
+        :param sources: Array-like of node ids to start from.
+        :param targets: Array-like of node ids to reach, aligned with sources.
+        :returns: A boolean array, True where a path exists.
+        """
+        sources = self._positions.get_indexer(np.asarray(sources))
+        targets = self._positions.get_indexer(np.asarray(targets))
+        if (sources < 0).any():
+            raise nx.NetworkXError("Some source nodes are not in the graph.")
+        result = np.zeros(len(sources), dtype=bool)
+        found = targets >= 0
+        result[found] = self.query_indices(sources[found], targets[found])
+        return result
+
+    def path_exists(self, node1, node2):
+        """Single-pair query, with the same answer as `path_exists`."""
+        return bool(self.query([node1], [node2])[0])
@@ -1,36 +1,366 @@
+import weakref
+
 import networkx as nx
+import numpy as np
 import pandas as pd
 
+from nams import TemporalGraph
 
-def busiest_route(pass_air_data, year):
-    return pass_air_data[
-        pass_air_data.groupby(["YEAR"])["PASSENGERS"].transform(max)
-        == pass_air_data["PASSENGERS"]
-    ].query(f"YEAR == {year}")
 
+class RouteIndex:
+    """
+    Passenger counts sorted by route and year, with one slice per route.
 
-def plot_time_series(pass_air_data, origin, dest):
-    pass_air_data.query(f"ORIGIN == '{origin}' and DEST == '{dest}'").plot(
-        "YEAR", "PASSENGERS"
+    Routes are keyed by `origin * len(airports) + dest`
+    over integer airport codes;
+    `keys` holds each route's key once, sorted,
+    and `offsets[i]:offsets[i + 1]` is the slice of route i
+    in `year_values` and `passengers`, in year order.
+
+    :param airports: Index of airport codes.
+    :param origin: Origin code of every row.
+    :param dest: Destination code of every row.
+    :param year: Year of every row.
+    :param passengers: Passengers of every row.
+    """
+
+    def __init__(self, airports, origin, dest, year, passengers):
+        self.airports = airports
+        keys = origin.astype(np.int64) * len(airports) + dest
+        order = np.lexsort((year, keys))
+        self.year_values = year[order]
+        self.passengers = passengers[order]
+        self.years = np.unique(year)
+        self.keys, offsets = np.unique(keys[order], return_index=True)
+        self.offsets = np.append(offsets, len(order))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _find(self, origins, dests):
+        """Route number of each (origin, dest) pair; -1 for unknown routes."""
+        o = self.airports.get_indexer(origins)
+        d = self.airports.get_indexer(dests)
+        keys = o.astype(np.int64) * len(self.airports) + d
+        if len(self.keys) == 0:
+            return np.full(len(keys), -1)
+        i = np.searchsorted(self.keys, keys).clip(max=len(self.keys) - 1)
+        found = (o >= 0) & (d >= 0) & (self.keys[i] == keys)
+        return np.where(found, i, -1)
+
+    def slice(self, origin, dest) -> slice:
+        """Rows of the route from `origin` to `dest`; empty if there is none."""
+        try:
+            key = self.airports.get_loc(origin) * len(self.airports)
+            key += self.airports.get_loc(dest)
+        except KeyError:
+            return slice(0, 0)
+        i = np.searchsorted(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return slice(0, 0)
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def series(self, origin, dest) -> pd.Series:
+        """Passengers on the route from `origin` to `dest`, indexed by year."""
+        rows = self.slice(origin, dest)
+        return pd.Series(
+            self.passengers[rows],
+            index=pd.Index(self.year_values[rows], name="YEAR"),
+            name="PASSENGERS",
+        )
+
+    def matrix(self, routes, years=None) -> np.ndarray:
+        """
+        Passengers of many routes as one (routes, years) matrix.
+
+        Rows of the same route and year are added up.
+        Years a route was not flown, and unknown routes, are NaN.
+
+        :param routes: (origin, dest) pairs.
+        :param years: Column years; all years in the table by default.
+        """
+        routes = list(routes)
+        years = self.years if years is None else np.asarray(years)
+        origins, dests = zip(*routes) if routes else ((), ())
+        found = self._find(list(origins), list(dests))
+        route = np.flatnonzero(found >= 0)
+        starts = self.offsets[found[route]]
+        lengths = self.offsets[found[route] + 1] - starts
+        rows = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        rows += np.arange(len(rows))
+        route = np.repeat(route, lengths)
+
+        order = np.argsort(years, kind="stable")
+        column = np.searchsorted(years, self.year_values[rows], sorter=order)
+        column = column.clip(max=max(len(years) - 1, 0))
+        keep = years[order][column] == self.year_values[rows]
+        cell = route[keep] * len(years) + order[column[keep]]
+        size = len(routes) * len(years)
+        total = np.bincount(cell, weights=self.passengers[rows[keep]], minlength=size)
+        flown = np.bincount(cell, minlength=size) > 0
+        return np.where(flown, total, np.nan).reshape(len(routes), len(years))
+
+
+class RouteTable:
+    """
+    The passengers table, sorted once for per-year and per-route queries.
+
+    Rows are kept in `rows`, sorted by year and then by passengers,
+    busiest first (ties in their original order),
+    so each year is one contiguous block whose first rows are its top routes.
+    ORIGIN and DEST are stored as integer codes into `airports`,
+    and `routes` is a RouteIndex over the same rows,
+    so a route's time series is found by binary search.
+    No query looks at the rows of other years or routes.
+
+    :param data: A passengers DataFrame with YEAR, ORIGIN, DEST
+        and PASSENGERS columns, as returned by `load_airports_data`.
+    """
+
+    def __init__(self, data):
+        year = data["YEAR"].to_numpy()
+        passengers = data["PASSENGERS"].to_numpy()
+        order = np.lexsort((-passengers, year))
+        self.rows = data.iloc[order]
+        self.year_values = year[order]
+        self.passengers = passengers[order]
+        self.years, offsets = np.unique(self.year_values, return_index=True)
+        self.offsets = np.append(offsets, len(order))
+
+        codes, airports = pd.factorize(
+            pd.concat([data["ORIGIN"], data["DEST"]], ignore_index=True)
+        )
+        self.airports = pd.Index(airports)
+        self.origin = codes[: len(data)][order]
+        self.dest = codes[len(data) :][order]
+        self.routes = RouteIndex(
+            self.airports, self.origin, self.dest, self.year_values, self.passengers
+        )
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _bounds(self, year):
+        """Start and stop of the block of `year`'s rows."""
+        i = np.searchsorted(self.years, year)
+        if i == len(self.years) or self.years[i] != year:
+            return 0, 0
+        return self.offsets[i], self.offsets[i + 1]
+
+    def year(self, year) -> pd.DataFrame:
+        """All routes of `year`, busiest first."""
+        return self.rows.iloc[slice(*self._bounds(year))]
+
+    def top_routes(self, year, k=10) -> pd.DataFrame:
+        """The `k` busiest routes of `year`."""
+        return self.year(year).iloc[:k]
+
+    def busiest_route(self, year) -> pd.DataFrame:
+        """The busiest route(s) of `year`; all of them if several tie."""
+        start, stop = self._bounds(year)
+        passengers = -self.passengers[start:stop]
+        if len(passengers):
+            stop = start + np.searchsorted(passengers, passengers[0], "right")
+        return self.rows.iloc[start:stop]
+
+    def series(self, origin, dest) -> pd.Series:
+        """Passengers on the route from `origin` to `dest`, indexed by year."""
+        return self.routes.series(origin, dest)
+
+
+_frame_caches = {}
+
+
+def _cached(data, name, build):
+    """
+    `build(data)`, computed once per DataFrame and name.
+
+    Entries are dropped when the DataFrame is garbage collected
+    or passed to `invalidate`, and rebuilt when its number of rows changes.
+    Values edited in place keep the same rows, so they are not noticed:
+    hashing the columns on every call would cost more than most queries.
+    """
+    key = id(data)
+    cached = _frame_caches.get(key)
+    if cached is None or cached[0]() is not data or cached[1] != len(data):
+        ref = weakref.ref(data, lambda _: _frame_caches.pop(key, None))
+        cached = _frame_caches[key] = (ref, len(data), {})
+    if name not in cached[2]:
+        cached[2][name] = build(data)
+    return cached[2][name]
+
+
+def invalidate(pass_air_data):
+    """
+    Forget everything cached about a passengers DataFrame,
+    so that it is rebuilt on next use.
+
+    Call it after editing the DataFrame's values in place.
+    """
+    _frame_caches.pop(id(pass_air_data), None)
+
+
+def route_table(pass_air_data) -> RouteTable:
+    """
+    The RouteTable of a passengers DataFrame, built on first use and then cached.
+
+    The cache entry is dropped when the DataFrame is garbage collected,
+    and rebuilt if its number of rows changes;
+    after editing values in place, call `invalidate(data)` first.
+    """
+    return _cached(pass_air_data, "routes", RouteTable)
+
+
+def _year_series(pass_air_data):
+    passengers = pass_air_data["PASSENGERS"]
+    edges = pd.DataFrame(
+        {
+            "ORIGIN": pass_air_data["ORIGIN"],
+            "DEST": pass_air_data["DEST"],
+            "YEAR": pass_air_data["YEAR"],
+            "weight": passengers,
+            "weight_inv": 1 / passengers.where(passengers != 0, 1),
+            "airlines": pass_air_data["UNIQUE_CARRIER_NAME"],
+        }
+    )
+    return TemporalGraph.from_pandas_edgelist(
+        edges,
+        "ORIGIN",
+        "DEST",
+        "YEAR",
+        edge_attr=["weight", "weight_inv", "airlines"],
+        directed=True,
     )
 
 
-def add_opinionated_edges(G):
-    G = nx.DiGraph(G)
-    sort_degree = sorted(
-        nx.degree_centrality(G).items(), key=lambda x: x[1], reverse=True
+def year_series(pass_air_data) -> TemporalGraph:
+    """
+    The route network of every year, as one cached TemporalGraph.
+
+    Edges carry `weight` (passengers), `weight_inv` (1 / passengers,
+    with 0 passengers counted as 1) and `airlines`.
+    A route listed twice in one year keeps its last row,
+    as in a MultiDiGraph keyed by year.
+    Cached like `route_table`.
+    """
+    return _cached(pass_air_data, "years", _year_series)
+
+
+def _scan_order(pass_air_data):
+    """
+    Where each airport and route first appears in `passenger_graph`,
+    the MultiDiGraph that `nx.from_pandas_edgelist` builds row by row
+    (origin, then destination), over the node positions of `year_series`.
+
+    :returns: The first position of every node in that insertion order,
+        and the sorted route keys with the first row of each route.
+    """
+    ends, airports = pd.factorize(
+        pd.concat([pass_air_data["ORIGIN"], pass_air_data["DEST"]], ignore_index=True)
+    )
+    src, dst = ends[: len(pass_air_data)], ends[len(pass_air_data) :]
+    _, node_first = np.unique(np.column_stack([src, dst]).ravel(), return_index=True)
+    route_keys, route_first = np.unique(
+        src.astype(np.int64) * len(airports) + dst, return_index=True
+    )
+    return node_first, route_keys, route_first
+
+
+def year_network(pass_air_data, year) -> nx.DiGraph:
+    """
+    The route network of one year, as a new DiGraph.
+
+    Only airports with a route in that year are included;
+    a year without any rows gives an empty DiGraph.
+    The graph is built from the cached `year_series`,
+    so it is safe to modify, and other years are not rescanned.
+    Nodes and edges are added in the order of a scan over `passenger_graph`
+    (by source airport, then route), as the notebook's original loop did.
+    """
+    T = year_series(pass_air_data)
+    if year not in T.times:
+        return nx.DiGraph()
+    t = T.times.index(year)
+    lo, hi = T.offsets[t], T.offsets[t + 1]
+    src = T.edge_src[lo:hi].astype(np.int64)
+    dst = T.edge_dst[lo:hi]
+    node_first, route_keys, route_first = _cached(
+        pass_air_data, "scan order", _scan_order
+    )
+    route = route_first[np.searchsorted(route_keys, src * len(T.node_ids) + dst)]
+    order = np.lexsort((route, node_first[src]))
+    ids = T.node_ids
+    attrs = [
+        T.edge_attrs[a][lo:hi][order].tolist()
+        for a in ("weight", "weight_inv", "airlines")
+    ]
+    G = nx.DiGraph()
+    G.add_edges_from(
+        (u, v, {"weight": w, "weight_inv": w_inv, "airlines": airlines})
+        for u, v, w, w_inv, airlines in zip(
+            ids[src[order]].tolist(), ids[dst[order]].tolist(), *attrs
+        )
     )
-    top_count = 0
-    for n, v in sort_degree:
-        count = 0
-        for node, val in sort_degree:
-            if node != n:
-                if node not in G._adj[n]:
-                    G.add_edge(n, node)
-                    count += 1
-                    if count == 25:
-                        break
-        top_count += 1
-        if top_count == 20:
-            break
     return G
+
+
+def busiest_route(pass_air_data, year):
+    return route_table(pass_air_data).busiest_route(year)
+
+
+def plot_time_series(pass_air_data, origin, dest):
+    series = route_table(pass_air_data).series(origin, dest)
+    series.reset_index().plot("YEAR", "PASSENGERS")
+
+
+def _digraph_degree(G):
+    """The degree of every node of `nx.DiGraph(G)`, without building it."""
+    if G.is_multigraph():
+        G = nx.DiGraph(G)
+    degree = np.fromiter((d for _, d in G.degree()), dtype=np.int64, count=len(G))
+    if not G.is_directed():
+        # Each edge becomes two arcs, except self-loops, which stay one.
+        index = {n: i for i, n in enumerate(G)}
+        loops = [index[n] for n in nx.nodes_with_selfloops(G)]
+        degree = 2 * degree
+        degree[loops] -= 2
+    return degree
+
+
+def suggest_edges(G, hubs=20, per_hub=25) -> list:
+    """
+    New routes from the busiest airports, as `add_opinionated_edges` adds them.
+
+    Nodes are ranked by degree centrality (ties in graph order).
+    Each of the top `hubs` nodes gets an edge to the first `per_hub` nodes
+    in that ranking that it is not already connected to.
+    Candidates are found with a set difference over each hub's neighbours'
+    ranks, so only the first few ranks past them are looked at.
+
+    :returns: (hub, node) pairs, hub by hub, in ranking order.
+    """
+    nodes = list(G)
+    rank = np.argsort(-_digraph_degree(G), kind="stable")
+    rank_of = np.empty(len(nodes), dtype=np.int64)
+    rank_of[rank] = np.arange(len(nodes))
+    index = {n: i for i, n in enumerate(nodes)}
+
+    edges = []
+    for r in range(min(hubs, len(nodes))):
+        hub = rank[r]
+        taken = [r] + [rank_of[index[v]] for v in G.adj[nodes[hub]]]
+        candidates = np.arange(min(per_hub + len(taken), len(nodes)))
+        candidates = np.setdiff1d(candidates, taken, assume_unique=False)
+        edges += [(nodes[hub], nodes[rank[c]]) for c in candidates[:per_hub]]
+    return edges
+
+
+def add_opinionated_edges(G):
+    """
+    A directed copy of G with new edges from its top 20 hubs,
+    25 per hub, to the highest-degree airports they do not yet reach.
+    See `suggest_edges`.
+    """
+    new_G = nx.DiGraph(G)
+    new_G.add_edges_from(suggest_edges(G))
+    return new_G
@@ -1,9 +1,110 @@
+import weakref
+
 import networkx as nx
+import numpy as np
 import pandas as pd
+import scipy.sparse as sp
+
+
+class PartitionIndex:
+    """
+    Which partition every node of a bipartite graph belongs to.
+
+    Partition values (e.g. "person", "crime") are stored once, in `values`;
+    each node only gets a small integer code into them, in `codes`,
+    aligned to `nodes` (graph node order).
+    Nodes without the attribute get code -1.
+    The node array of each partition is built on first use and kept
+    until nodes are added or removed.
+
+    :param G: A graph whose nodes carry a partition attribute.
+    :param attr: Name of that attribute.
+    """
+
+    def __init__(self, G, attr="bipartite"):
+        self.attr = attr
+        self.nodes = pd.Index([])
+        self.values = []
+        self.codes = np.empty(0, dtype=np.int8)
+        self.add_nodes_from(list(G), [d.get(attr) for _, d in G.nodes(data=True)])
+
+    def add_nodes_from(self, nodes, values):
+        """Add nodes, with their partition values (None if they have none)."""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        for value in uniques:
+            if value not in self.values:
+                self.values.append(value)
+        remap = np.array([self.values.index(v) for v in uniques] + [-1])
+        self.nodes = self.nodes.append(pd.Index(nodes))
+        dtype = np.min_scalar_type(-max(len(self.values), 1))
+        self.codes = np.concatenate([self.codes, remap[codes]]).astype(dtype)
+        self._members = {}
+
+    def remove_nodes_from(self, nodes):
+        """Remove nodes; unknown nodes are ignored."""
+        keep = ~self.nodes.isin(list(nodes))
+        self.nodes = self.nodes[keep]
+        self.codes = self.codes[keep]
+        self._members = {}
+
+    def sync(self, G):
+        """
+        Catch up with nodes added to or removed from G.
+
+        NetworkX keeps nodes in insertion order and appends new ones,
+        so any change to G's nodes changes either their number
+        or the last node; the check compares just those two.
+        When they differ, new nodes are appended with their partition values
+        and the index is put back into G's node order.
+        """
+        last = next(reversed(G._node), None)
+        if len(G) == len(self.nodes) and (not len(G) or last == self.nodes[-1]):
+            return self
+        nodes = pd.Index(list(G))
+        added = nodes[self.nodes.get_indexer(nodes) < 0].tolist()
+        self.add_nodes_from(added, [G.nodes[n].get(self.attr) for n in added])
+        order = self.nodes.get_indexer(nodes)
+        self.nodes, self.codes = self.nodes[order], self.codes[order]
+        return self
+
+    def members(self, partition) -> np.ndarray:
+        """The nodes in `partition`, in graph node order."""
+        if partition not in self._members:
+            code = self.values.index(partition) if partition in self.values else -2
+            self._members[partition] = self.nodes[self.codes == code].to_numpy()
+        return self._members[partition]
+
+    def biadjacency_order(self, row_partition, column_partition):
+        """Row and column node orders for a biadjacency matrix."""
+        return self.members(row_partition), self.members(column_partition)
+
+
+_partition_indexes = weakref.WeakKeyDictionary()
+
+
+def partition_index(G, attr="bipartite") -> PartitionIndex:
+    """
+    The PartitionIndex of G, built on first use and then cached.
+
+    Nodes added to or removed from G are picked up on the next call
+    (see `PartitionIndex.sync`).
+    Partition attributes are read once per node,
+    so after editing them call `invalidate(G)`.
+    """
+    cached = _partition_indexes.setdefault(G, {})
+    if attr not in cached:
+        cached[attr] = PartitionIndex(G, attr)
+    return cached[attr].sync(G)
+
+
+def invalidate(G):
+    """Forget everything cached about G, so that it is rebuilt on next use."""
+    _partition_indexes.pop(G, None)
+    _projections.pop(G, None)
 
 
 def extract_partition_nodes(G: nx.Graph, partition: str):
-    nodeset = [n for n, d in G.nodes(data=True) if d["bipartite"] == partition]
+    nodeset = partition_index(G).members(partition).tolist()
     if len(nodeset) == 0:
         raise Exception(f"No nodes exist in the partition {partition}!")
     return nodeset
@@ -22,7 +123,7 @@ def draw_bipartite_graph_example():
     """Draw an example bipartite graph and its corresponding projection."""
     import matplotlib.pyplot as plt
     import nxviz as nv
-    from nxviz import annotate, plots, highlights
+    from nxviz import annotate, highlights
 
     fig, ax = plt.subplots(nrows=1, ncols=2, figsize=(8, 4))
     plt.sca(ax[0])
@@ -55,6 +156,176 @@ def find_most_similar_people(pG: nx.Graph):
     return dcs.sort_values(ascending=False).head(10)
 
 
+class BipartiteProjection:
+    """
+    Weighted projection of a bipartite graph onto one partition,
+    computed from its sparse biadjacency matrix B.
+
+    The full projection `B @ B.T` is only built by `project()`,
+    and then cached; until then, `weights(node)` only projects
+    the two-hop neighborhood of `node` (its row of `B @ B.T`).
+    Weights are numbers of shared neighbors,
+    as in `nx.bipartite.weighted_projected_graph`.
+
+    :param G: A bipartite graph.
+    :param nodes: The nodes of the partition to project onto.
+    """
+
+    def __init__(self, G, nodes):
+        self.nodes = pd.Index(nodes)
+        partition = set(self.nodes)
+        self.others = pd.Index([n for n in G if n not in partition])
+        edges = [(n, nbr) for n in self.nodes for nbr in G.neighbors(n)]
+        rows = self.nodes.get_indexer([n for n, _ in edges])
+        cols = self.others.get_indexer([nbr for _, nbr in edges])
+        self.biadjacency = sp.csr_array(
+            (np.ones(len(edges), dtype=np.int64), (rows, cols)),
+            shape=(len(self.nodes), len(self.others)),
+        )
+        self._transposed = self.biadjacency.T.tocsr()
+        self._projection = None
+
+    def project(self):
+        """The full projection `B @ B.T` without its diagonal, computed once."""
+        if self._projection is None:
+            P = self.biadjacency @ self._transposed
+            P = (P - sp.diags_array(P.diagonal(), dtype=P.dtype)).tocsr()
+            P.eliminate_zeros()
+            P.sort_indices()
+            self._projection = P
+        return self._projection
+
+    def _row(self, i):
+        """Positions and weights of the projected neighbors of node `i`."""
+        if self._projection is not None:
+            P = self._projection
+            span = slice(P.indptr[i], P.indptr[i + 1])
+            return P.indices[span], P.data[span]
+        B, Bt = self.biadjacency, self._transposed
+        hop1 = B.indices[B.indptr[i] : B.indptr[i + 1]]
+        hop2 = np.concatenate(
+            [Bt.indices[Bt.indptr[j] : Bt.indptr[j + 1]] for j in hop1] or [[]]
+        ).astype(np.int64)
+        nbrs, weights = np.unique(hop2, return_counts=True)
+        keep = nbrs != i
+        return nbrs[keep], weights[keep]
+
+    def weights(self, node) -> pd.Series:
+        """Weight of every projected neighbor of `node`, indexed by neighbor."""
+        i = self.nodes.get_loc(node)
+        nbrs, weights = self._row(i)
+        return pd.Series(weights, index=self.nodes[nbrs], name="weight")
+
+    def neighbors(self, node) -> list:
+        """The projected neighbors of `node`."""
+        return self.weights(node).index.tolist()
+
+    def _score(self, rows, cols, shared, metric):
+        """Turn shared-neighbor counts between rows and cols into `metric`."""
+        if metric == "shared":
+            return shared
+        degree = self.degree[rows], self.degree[cols]
+        if metric == "cosine":
+            return shared / np.sqrt(degree[0] * degree[1])
+        if metric == "jaccard":
+            return shared / (degree[0] + degree[1] - shared)
+        raise ValueError(f"Unknown similarity metric {metric!r}.")
+
+    @property
+    def degree(self):
+        """Number of neighbors of every node, in the original bipartite graph."""
+        return np.diff(self.biadjacency.indptr)
+
+    def similarity(self, metric="shared"):
+        """
+        The full projection with every weight turned into a similarity score.
+
+        :param metric: "shared" (number of shared neighbors),
+            "cosine" or "jaccard" (of the two nodes' neighbor sets).
+        """
+        P = self.project()
+        rows = np.repeat(np.arange(P.shape[0]), np.diff(P.indptr))
+        data = self._score(rows, P.indices, P.data, metric)
+        return sp.csr_array((data, P.indices, P.indptr), shape=P.shape)
+
+    def most_similar(self, node, k=10, metric="shared") -> pd.Series:
+        """
+        The `k` projected neighbors most similar to `node`, best first.
+
+        Only `node`'s row of the projection is computed
+        (or read, if `project()` has been called).
+        """
+        i = self.nodes.get_loc(node)
+        nbrs, shared = self._row(i)
+        scores = self._score(np.full(len(nbrs), i), nbrs, shared, metric)
+        top = _top_k(scores, k)
+        return pd.Series(scores[top], index=self.nodes[nbrs[top]], name=metric)
+
+    def top_nodes(self, k=10, by="degree", metric="shared") -> pd.Series:
+        """
+        The `k` nodes that are most similar to other nodes, best first.
+
+        :param by: "degree" ranks nodes by their degree centrality
+            in the projected graph, as `nx.degree_centrality` would;
+            "weight" by the sum of their similarity scores.
+        :param metric: Similarity score summed when `by="weight"`.
+        """
+        if by == "degree":
+            n = len(self.nodes)
+            values = np.diff(self.project().indptr) / max(n - 1, 1)
+        elif by == "weight":
+            values = self.similarity(metric).sum(axis=1)
+        else:
+            raise ValueError(f"Unknown ranking {by!r}.")
+        top = _top_k(values, k)
+        return pd.Series(values[top], index=self.nodes[top])
+
+
+def _top_k(values, k):
+    """Positions of the k largest values, largest first, without a full sort."""
+    if k < len(values):
+        candidates = np.argpartition(-values, k - 1)[:k]
+    else:
+        candidates = np.arange(len(values))
+    # Break ties by position, so results do not depend on argpartition.
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+_projections = weakref.WeakKeyDictionary()
+
+
+def bipartite_projection(G, partition, attr="bipartite") -> BipartiteProjection:
+    """
+    The BipartiteProjection of G onto `partition`, built on first use
+    and then cached.
+
+    The projection is rebuilt when G's nodes change
+    (i.e. when `partition_index` has to sync);
+    after adding or removing edges between existing nodes,
+    call `invalidate(G)`.
+    """
+    index = partition_index(G, attr)
+    cached = _projections.setdefault(G, {})
+    entry = cached.get((partition, attr))
+    if entry is None or entry[0] is not index.nodes:
+        entry = cached[(partition, attr)] = (
+            index.nodes,
+            BipartiteProjection(G, index.members(partition)),
+        )
+    return entry[1]
+
+
+def most_similar_nodes(G, partition, k=10, by="degree", metric="shared"):
+    """
+    The `k` nodes of `partition` that are most similar to others,
+    straight from the bipartite graph G (see `BipartiteProjection.top_nodes`).
+    """
+    projection = bipartite_projection(G, partition)
+    if len(projection.nodes) == 0:
+        raise Exception(f"No nodes exist in the partition {partition}!")
+    return projection.top_nodes(k, by=by, metric=metric)
+
+
 def find_connected_persons(G, person, crime):
     """Answer to exercise on people implicated in crimes"""
     # Step 0: Check that the given "person" and "crime" are connected.
@@ -63,14 +334,15 @@ def find_connected_persons(G, person, crime):
             f"Graph does not have a connection between {person} and {crime}!"
         )
 
-    # Step 1: calculate weighted projection for person nodes.
-    person_nodes = extract_partition_nodes(G, "person")
-    person_graph = nx.bipartite.weighted_projected_graph(G, person_nodes)
+    # Step 1: calculate the weighted projection of `person`'s
+    # two-hop neighborhood only, from the graph's cached biadjacency matrix.
+    weights = bipartite_projection(G, "person").weights(person)
 
     # Step 2: Find neighbors of the given `person` node in projected graph.
-    candidate_neighbors = set(person_graph.neighbors(person))
+    candidate_neighbors = set(weights.index)
 
-    # Step 3: Remove candidate neighbors from the set if they are implicated in the given crime.
+    # Step 3: Remove candidate neighbors from the set
+    # if they are implicated in the given crime.
     for p in G.neighbors(crime):
         if p in candidate_neighbors:
             candidate_neighbors.remove(p)
@@ -78,7 +350,7 @@ def find_connected_persons(G, person, crime):
     # Step 4: Rank-order the candidate neighbors by number of shared connections.
     data = []
     for nbr in candidate_neighbors:
-        data.append(dict(node=nbr, weight=person_graph.edges[person, nbr]["weight"]))
+        data.append(dict(node=nbr, weight=weights[nbr]))
     return pd.DataFrame(data).sort_values("weight", ascending=False)
 
 
@@ -1,32 +1,115 @@
-import pandas as pd
+from itertools import chain
+
 import networkx as nx
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from nams import CSRGraph, TemporalGraph, grouped_top_k
+from nams.centrality import centrality_table
+from nams.csr import edge_weights
+
+
+def _weight_columns(G, weights):
+    """
+    Source and target positions of G's edges,
+    and an (edges, weights) array of their weights, in one pass over the edges.
+
+    Edges without a weight count as 1, as in `G.degree(weight=...)`.
+    """
+    if isinstance(G, CSRGraph):
+        columns = [edge_weights(G, w) for w in weights]
+        W = np.column_stack(columns) if columns else np.empty((len(G.edge_src), 0))
+        return G.edge_src, G.edge_dst, W
+
+    # One flat stream of (source, target, *weights) rows:
+    # materializing the edge tuples first is several times slower.
+    index = {n: i for i, n in enumerate(G)}
+    m = G.number_of_edges()
+    rows = np.fromiter(
+        chain.from_iterable(
+            (index[u], index[v], *[d.get(w, 1) for w in weights])
+            for u, v, d in G.edges(data=True)
+        ),
+        dtype=float,
+        count=m * (len(weights) + 2),
+    ).reshape(m, len(weights) + 2)
+    return rows[:, 0].astype(np.int64), rows[:, 1].astype(np.int64), rows[:, 2:]
+
+
+def weighted_degrees(G, weights=("weight",)) -> pd.DataFrame:
+    """
+    In-, out- and total weighted degree (strength) of every node,
+    for several edge weights at once.
+
+    Columns are a (weight, "in" | "out" | "total") MultiIndex.
+    For undirected graphs all three are the same,
+    and, as in `G.degree(weight=...)`, self-loops count twice.
+
+    :param G: A NetworkX graph or CSRGraph.
+    :param weights: An edge attribute name, or a list of them.
+        Edges without the attribute count as 1.
+    """
+    if isinstance(weights, str):
+        weights = [weights]
+    weights = list(weights)
+    n = len(G)
+    src, dst, W = _weight_columns(G, weights)
+    m, edges = len(src), np.arange(len(src))
+    out_strength = sp.csr_array((np.ones(m), (src, edges)), shape=(n, m)) @ W
+    in_strength = sp.csr_array((np.ones(m), (dst, edges)), shape=(n, m)) @ W
+    total = out_strength + in_strength
+    if not G.is_directed():
+        out_strength = in_strength = total
+
+    nodes = G.node_ids if isinstance(G, CSRGraph) else list(G)
+    return pd.DataFrame(
+        np.hstack([in_strength, out_strength, total]),
+        index=pd.Index(nodes),
+        columns=pd.MultiIndex.from_product([["in", "out", "total"], weights]),
+    ).swaplevel(axis=1)[weights]
 
 
 def weighted_degree(G, weight):
-    result = dict()
-    for node in G.nodes():
-        weight_degree = 0
-        for n in G.edges([node], data=True):
-            weight_degree += n[2]["weight"]
-        result[node] = weight_degree
+    """
+    Weighted degree of every node: the sum of `weight` over its edges.
+
+    Unlike `weighted_degrees`, this keeps the original semantics:
+    directed graphs sum over out-edges only,
+    an undirected self-loop counts once,
+    sums keep the type of the edge weights,
+    and an edge without `weight` raises a KeyError.
+    It is one pass over the edges rather than one per node.
+
+    :param G: A NetworkX graph.
+    :param weight: The edge attribute to sum.
+    :returns: A dict keyed by node.
+    """
+    result = dict.fromkeys(G, 0)
+    directed = G.is_directed()
+    for u, v, d in G.edges(data=True):
+        result[u] += d[weight]
+        if not directed and u != v:
+            result[v] += d[weight]
     return result
 
 
-def correlation_centrality(G):
-    cor = pd.DataFrame.from_records(
-        [
-            nx.pagerank(G, weight="weight"),
-            nx.betweenness_centrality(G, weight="weight_inv"),
-            weighted_degree(G, "weight"),
-            nx.degree_centrality(G),
-        ]
+def correlation_centrality(G, n_jobs=1):
+    table = centrality_table(
+        G,
+        ["pagerank", "betweenness", "weighted_degree", "degree"],
+        weight="weight",
+        distance="weight_inv",
+        n_jobs=n_jobs,
     )
-    return cor.T.corr()
+    return table.corr()
 
 
-def evol_betweenness(graphs):
-    evol = [nx.betweenness_centrality(graph, weight="weight_inv") for graph in graphs]
-    evol_df = pd.DataFrame.from_records(evol).fillna(0)
+def evol_betweenness(graphs, n_jobs=1):
+    evol = TemporalGraph.from_graphs(graphs).centrality(
+        "betweenness", distance="weight_inv", n_jobs=n_jobs
+    )
+    evol_df = evol.T.fillna(0)
 
     set_of_char = set()
     for i in range(5):
@@ -36,12 +119,10 @@ def evol_betweenness(graphs):
 
 
 def most_important_node_in_partition(graph, partition_dict):
-    max_d = {}
-    deg = nx.degree_centrality(graph)
-    for group in partition_dict:
-        temp = 0
-        for character in partition_dict[group]:
-            if deg[character] > temp:
-                max_d[group] = character
-                temp = deg[character]
-    return max_d
+    groups = {
+        character: group
+        for group, characters in partition_dict.items()
+        for character in characters
+    }
+    top = grouped_top_k(groups, nx.degree_centrality(graph), k=1)
+    return dict(zip(top["group"], top["node"]))
@@ -1,19 +1,27 @@
 """Solutions to Hubs chapter."""
 
 import matplotlib.pyplot as plt
-import networkx as nx
-import pandas as pd
+import numpy as np
 import nxviz as nv
+import pandas as pd
 from nxviz import annotate
 
-from nams import ecdf
+from nams import CSRGraph, ecdf
+from nams.csr import degree_centrality
+
+
+def _num_neighbors(G):
+    """Number of neighbors of every node, as a pandas Series."""
+    if isinstance(G, CSRGraph):
+        return pd.Series(np.diff(G.indptr), index=G.nodes())
+    return pd.Series({n: len(list(G.neighbors(n))) for n in G.nodes()})
 
 
 def rank_ordered_neighbors(G):
     """
     Uses a pandas Series to help with sorting.
     """
-    s = pd.Series({n: len(list(G.neighbors(n))) for n in G.nodes()})
+    s = _num_neighbors(G)
     return s.sort_values(ascending=False)
 
 
@@ -36,7 +44,7 @@ def rank_ordered_neighbors_generator(G):
 
 def ecdf_degree_centrality(G):
     """ECDF of degree centrality."""
-    x, y = ecdf(list(nx.degree_centrality(G).values()))
+    x, y = ecdf(list(degree_centrality(G).values()))
     plt.scatter(x, y)
     plt.xlabel("degree centrality")
     plt.ylabel("cumulative fraction")
@@ -44,7 +52,7 @@ def ecdf_degree_centrality(G):
 
 def ecdf_degree(G):
     """ECDF of degree."""
-    num_neighbors = [len(list(G.neighbors(n))) for n in G.nodes()]
+    num_neighbors = _num_neighbors(G).values
     x, y = ecdf(num_neighbors)
     plt.scatter(x, y)
     plt.xlabel("degree")
@@ -90,22 +98,27 @@ are also the ones that have edges that cross the circos plot.
 
 def dc_node_order(G):
     """Comparison of degree centrality by maximum difference in node order."""
-    import matplotlib.pyplot as plt
     import pandas as pd
-    import networkx as nx
 
     # Degree centralities
-    dcs = pd.Series(nx.degree_centrality(G))
+    dcs = pd.Series(degree_centrality(G))
 
     # Maximum node order difference
-    maxdiffs = dict()
-    for n, d in G.nodes(data=True):
-        diffs = []
-        for nbr in G.neighbors(n):
-            diffs.append(abs(G.nodes[nbr]["order"] - d["order"]))
-        maxdiffs[n] = max(diffs)
-    maxdiffs = pd.Series(maxdiffs)
-
-    ax = pd.DataFrame(dict(degree_centrality=dcs, max_diff=maxdiffs)).plot(
+    if isinstance(G, CSRGraph):
+        order = G.node_attrs["order"]
+        rows = np.repeat(np.arange(len(G)), np.diff(G.indptr))
+        maxdiffs = np.full(len(G), -np.inf)
+        np.maximum.at(maxdiffs, rows, np.abs(order[G.indices] - order[rows]))
+        maxdiffs = pd.Series(maxdiffs, index=G.nodes())
+    else:
+        maxdiffs = dict()
+        for n, d in G.nodes(data=True):
+            diffs = []
+            for nbr in G.neighbors(n):
+                diffs.append(abs(G.nodes[nbr]["order"] - d["order"]))
+            maxdiffs[n] = max(diffs)
+        maxdiffs = pd.Series(maxdiffs)
+
+    pd.DataFrame(dict(degree_centrality=dcs, max_diff=maxdiffs)).plot(
         x="degree_centrality", y="max_diff", kind="scatter"
     )
@@ -1,19 +1,79 @@
 """Solutions to I/O chapter"""
 
+import networkx as nx
+import numpy as np
+import pandas as pd
 
-def filter_graph(G, minimum_num_trips):
+
+def _edge_column(G, attr):
+    """
+    G's edges as a columnar table: source and target positions in node order,
+    and the value of `attr` on every edge, in `G.edges` order.
+    """
+    index = {n: i for i, n in enumerate(G)}
+    rows = [(index[u], index[v], d[attr]) for u, v, d in G.edges(data=True)]
+    src, dst, values = zip(*rows) if rows else ((), (), ())
+    return (
+        np.array(src, dtype=np.int64),
+        np.array(dst, dtype=np.int64),
+        np.array(values, dtype=float),
+    )
+
+
+def filter_graph(G, minimum_num_trips, view=False):
     """
     Filter the graph such that
     only edges that have minimum_num_trips or more
     are present.
+
+    All nodes are kept.
+    By default a new graph is built in one pass over the edges that pass,
+    rather than copying G and removing the rest one at a time.
+
+    :param view: Return a read-only view of G instead of a new graph.
     """
-    G_filtered = G.copy()
-    for u, v, d in G.edges(data=True):
-        if d["num_trips"] < minimum_num_trips:
-            G_filtered.remove_edge(u, v)
+    if view:
+        return nx.subgraph_view(
+            G, filter_edge=lambda u, v: G[u][v]["num_trips"] >= minimum_num_trips
+        )
+    G_filtered = G.__class__()
+    G_filtered.graph.update(G.graph)
+    G_filtered.add_nodes_from((n, d.copy()) for n, d in G.nodes(data=True))
+    G_filtered.add_edges_from(
+        (u, v, d.copy())
+        for u, v, d in G.edges(data=True)
+        if d["num_trips"] >= minimum_num_trips
+    )
     return G_filtered
 
 
+def filter_sweep(G, thresholds, attr="num_trips") -> pd.DataFrame:
+    """
+    Edge and node counts of `filter_graph(G, t)` for many thresholds t.
+
+    Edges are counted by binary search in the sorted `attr` values.
+    A node counts if it keeps at least one edge,
+    i.e. if the largest `attr` over its edges reaches t,
+    so isolated nodes (which `filter_graph` keeps) are not counted.
+
+    :param thresholds: Minimum values of `attr` to try.
+    :returns: A DataFrame indexed by threshold,
+        with columns `num_edges` and `num_nodes`.
+    """
+    src, dst, values = _edge_column(G, attr)
+    node_max = np.full(len(G), -np.inf)
+    np.maximum.at(node_max, src, values)
+    np.maximum.at(node_max, dst, values)
+    thresholds = np.asarray(thresholds)
+    return pd.DataFrame(
+        {
+            "num_edges": len(values) - np.searchsorted(np.sort(values), thresholds),
+            "num_nodes": len(G) - np.searchsorted(np.sort(node_max), thresholds),
+        },
+        index=pd.Index(thresholds, name=attr),
+    )
+
+
 def test_graph_integrity(G):
     """Test integrity of raw Divvy graph."""
     assert len(G.nodes()) == 300
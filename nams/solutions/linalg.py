@@ -1,3 +1,9 @@
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+
+
 def adjacency_matrix_power():
     ans = """
 1. The diagonals equal to the degree of each node.
@@ -13,3 +19,119 @@ while for the middle nodes, there are 2 paths
 from itself back to itself!
 """
     return ans
+
+
+def _projection_blocks(M, block_size, upper):
+    """
+    Yield the off-diagonal entries of `M @ M.T`, one block of rows at a time,
+    as (rows, cols, weights) arrays.
+
+    Only `block_size` rows of the product exist at any time.
+    With `upper=True`, each pair is only yielded once (as row < col).
+    """
+    M = sp.csr_array(M)
+    Mt = M.T.tocsr()
+    for start in range(0, M.shape[0], block_size):
+        block = (M[start : start + block_size] @ Mt).tocoo()
+        rows = block.row.astype(np.int64) + start
+        cols = block.col.astype(np.int64)
+        keep = cols > rows if upper else cols != rows
+        yield rows[keep], cols[keep], block.data[keep]
+
+
+def projection_top_pairs(M, k=10, block_size=1024, upper=True):
+    """
+    The k largest off-diagonal entries of `M @ M.T`, e.g. the k most similar
+    pairs of customers from a customer-product biadjacency matrix.
+
+    `M @ M.T` is computed `block_size` rows at a time and each block
+    is immediately reduced to its best k pairs,
+    so memory stays bounded whatever the number of rows.
+    Ties are broken by (row, col).
+
+    :param M: A sparse matrix, e.g. from `nx.bipartite.biadjacency_matrix`.
+    :param upper: Count each pair once; otherwise (i, j) and (j, i) both appear.
+    :returns: (rows, cols, weights) arrays, largest weight first.
+    """
+    best = (np.empty(0, dtype=np.int64),) * 2 + (np.empty(0),)
+    for block in _projection_blocks(M, block_size, upper):
+        rows, cols, weights = (np.concatenate(pair) for pair in zip(best, block))
+        if len(weights) > k:
+            kth = np.partition(weights, len(weights) - k)[len(weights) - k]
+            keep = weights >= kth
+            rows, cols, weights = rows[keep], cols[keep], weights[keep]
+        top = np.lexsort((cols, rows, -weights))[:k]
+        best = rows[top], cols[top], weights[top]
+    return best
+
+
+def projection_edges(M, threshold, block_size=1024, upper=True, spill_dir=None):
+    """
+    All off-diagonal entries of `M @ M.T` that are at least `threshold`.
+
+    `M @ M.T` is computed `block_size` rows at a time and each block
+    is immediately filtered.
+    With `spill_dir`, each filtered block is written to disk as it is done,
+    and the result is returned as memory-mapped `.npy` arrays in that
+    directory, so that even the kept edges need not fit in memory.
+
+    :param M: A sparse matrix, e.g. from `nx.bipartite.biadjacency_matrix`.
+    :param upper: Count each pair once; otherwise (i, j) and (j, i) both appear.
+    :param spill_dir: Directory to spill partial results and the result to.
+    :returns: (rows, cols, weights) arrays, in row order.
+    """
+    blocks = []
+    for i, (rows, cols, weights) in enumerate(_projection_blocks(M, block_size, upper)):
+        keep = weights >= threshold
+        block = rows[keep], cols[keep], weights[keep]
+        if spill_dir is not None:
+            block = _spill(block, Path(spill_dir), f"block{i:06d}")
+        blocks.append(block)
+
+    if spill_dir is None:
+        columns = zip(*blocks) if blocks else _empty_edges(M.dtype)
+        return tuple(np.concatenate(column) for column in columns)
+
+    # Copy the spilled blocks, one at a time, into the final arrays.
+    spill_dir = Path(spill_dir)
+    result = []
+    for j, name in enumerate(["rows", "cols", "weights"]):
+        paths = [block[j] for block in blocks]
+        parts = [np.load(path, mmap_mode="r") for path in paths]
+        dtype = parts[0].dtype if parts else _empty_edges(M.dtype)[j][0].dtype
+        out = np.lib.format.open_memmap(
+            spill_dir / f"{name}.npy",
+            mode="w+",
+            dtype=dtype,
+            shape=(sum(len(part) for part in parts),),
+        )
+        offset = 0
+        for part in parts:
+            out[offset : offset + len(part)] = part
+            offset += len(part)
+        out.flush()
+        del parts
+        for path in paths:
+            path.unlink()
+        result.append(out)
+    return tuple(result)
+
+
+def _empty_edges(dtype):
+    """One empty (rows, cols, weights) block."""
+    return (
+        [np.empty(0, dtype=np.int64)],
+        [np.empty(0, dtype=np.int64)],
+        [np.empty(0, dtype=dtype)],
+    )
+
+
+def _spill(block, spill_dir, prefix):
+    """Save a (rows, cols, weights) block to disk and return the file paths."""
+    spill_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, arr in zip(["rows", "cols", "weights"], block):
+        path = spill_dir / f"{prefix}-{name}.npy"
+        np.save(path, arr)
+        paths.append(path)
+    return paths
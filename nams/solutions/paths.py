@@ -5,6 +5,9 @@ import networkx as nx
 import pandas as pd
 import seaborn as sns
 
+from nams.centrality import betweenness_centrality
+from nams.paths import bidirectional_path_exists
+
 
 def bfs_algorithm():
     """
@@ -103,6 +106,19 @@ def path_exists_deque(node1, node2, G):
     return False
 
 
+def path_exists_bidirectional(node1, node2, G):
+    """
+    This function checks whether a path exists between two nodes (node1,
+    node2) in graph G, searching from both ends at once.
+
+    It answers exactly what `path_exists`, `path_exists_for_loop` and
+    `path_exists_deque` answer, including following edge direction in
+    directed graphs, and accepts either a NetworkX graph or a CSRGraph;
+    see `nams.paths.bidirectional_path_exists`.
+    """
+    return bidirectional_path_exists(G, node1, node2)
+
+
 import nxviz as nv
 from nxviz import annotate, highlights
 
@@ -125,9 +141,13 @@ def plot_path_with_neighbors(G, n1, n2):
         highlights.arc_edge(g, n1, n2, sort_by="order")
 
 
-def plot_degree_betweenness(G):
-    """Plot scatterplot between degree and betweenness centrality."""
-    bc = pd.Series(nx.betweenness_centrality(G))
+def plot_degree_betweenness(G, n_jobs=1):
+    """
+    Plot scatterplot between degree and betweenness centrality.
+
+    :param n_jobs: Number of processes used for betweenness centrality.
+    """
+    bc = pd.Series(betweenness_centrality(G, n_jobs=n_jobs))
     dc = pd.Series(nx.degree_centrality(G))
 
     df = pd.DataFrame(dict(bc=bc, dc=dc))
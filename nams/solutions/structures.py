@@ -5,6 +5,9 @@ from itertools import combinations
 import networkx as nx
 from nxviz import circos
 
+from nams import CSRGraph
+from nams.structures import component_labels, k_cliques
+
 
 def triangle_finding_strategies():
     """
@@ -119,11 +122,11 @@ def size_k_maximal_cliques(G, k):
 def find_k_cliques(G, k):
     """
     Find all cliques of size k.
+
+    Each clique is yielded exactly once, as a tuple of nodes;
+    see `k_cliques` for how.
     """
-    for clique in nx.find_cliques(G):
-        if len(clique) >= k:
-            for nodeset in combinations(clique, k):
-                yield nodeset
+    yield from k_cliques(G, k)
 
 
 def visual_insights():
@@ -139,15 +142,35 @@ i.e. there is no path between them.
     print(ans)
 
 
-def label_connected_component_subgraphs(G):
-    """Label all connected component subgraphs."""
-    G = G.copy()
-    for i, nodeset in enumerate(nx.connected_components(G)):
-        for n in nodeset:
-            G.nodes[n]["subgraph"] = i
+def label_connected_component_subgraphs(G, inplace=False):
+    """
+    Label all connected component subgraphs.
+
+    :param inplace: Write the `subgraph` node attribute into G itself
+        instead of into a copy of it.
+    """
+    labels = component_labels(G)
+    if not inplace:
+        G = G.copy()
+    if isinstance(G, CSRGraph):
+        G.node_attrs["subgraph"] = labels.to_numpy()
+    else:
+        nx.set_node_attributes(G, labels.to_dict(), "subgraph")
     return G
 
 
-def plot_cc_subgraph(G):
-    """Plot all connected component subgraphs."""
+def plot_cc_subgraph(G, labels=None):
+    """
+    Plot all connected component subgraphs.
+
+    :param labels: Component labels from `component_labels`,
+        plotted as the `subgraph` attribute of a copy of G.
+        If G has no `subgraph` attribute yet, they are computed.
+        G itself is never modified.
+    """
+    if labels is None and any("subgraph" not in d for _, d in G.nodes(data=True)):
+        labels = component_labels(G)
+    if labels is not None:
+        G = G.copy()
+        nx.set_node_attributes(G, labels.to_dict(), "subgraph")
     c = circos(G, node_color_by="subgraph", group_by="subgraph")
@@ -0,0 +1,381 @@
+"""
+Graph structures of undirected graphs, for every node at once.
+
+`TriangleIndex` lists every triangle of a graph in one vectorised pass
+and answers the Structures chapter's triangle and open-triad questions
+for any node from those.
+`k_cliques` and `count_k_cliques` enumerate or count the cliques of size k
+along a degeneracy ordering, optionally over a process pool.
+`component_labels` labels connected components on the sparse adjacency matrix.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+from .csr import CSRGraph
+
+
+def _list_triangles(n, lo, hi, rank, edge_keys, max_wedges=1 << 22):
+    """
+    All triangles of a loop-free undirected edge list, as an (t, 3) array.
+
+    Each edge points from its lower- to its higher-ranked end, so every
+    triangle is found exactly once: as a pair of out-neighbors (v, w) of
+    its lowest-ranked node that are themselves adjacent.
+    Ranking by degree keeps the out-neighbor lists, and so the number
+    of (v, w) pairs ("wedges") checked, small.
+    Wedges are generated and checked `max_wedges` at a time.
+    """
+    flip = rank[lo] > rank[hi]
+    a, b = np.where(flip, hi, lo), np.where(flip, lo, hi)
+    order = np.lexsort((rank[b], a))
+    a, b = a[order], b[order]
+    row_end = np.cumsum(np.bincount(a, minlength=n))[a]
+
+    # Position p forms a wedge with every later position in its row.
+    n_pairs = row_end - np.arange(len(a)) - 1
+    total = np.cumsum(n_pairs)
+    found = [np.empty((0, 3), dtype=np.int64)]
+    start = 0
+    while start < len(a):
+        budget = (total[start - 1] if start else 0) + max_wedges
+        stop = max(int(np.searchsorted(total, budget, side="right")), start + 1)
+        first = np.repeat(np.arange(start, stop), n_pairs[start:stop])
+        offsets = np.cumsum(n_pairs[start:stop]) - n_pairs[start:stop]
+        second = (
+            first + 1 + np.arange(len(first)) - np.repeat(offsets, n_pairs[start:stop])
+        )
+        v, w = b[first], b[second]
+        keys = np.minimum(v, w) * n + np.maximum(v, w)
+        pos = np.searchsorted(edge_keys, keys).clip(max=len(edge_keys) - 1)
+        closed = edge_keys[pos] == keys
+        found.append(np.column_stack([a[first], v, w])[closed])
+        start = stop
+    return np.concatenate(found)
+
+
+class TriangleIndex:
+    """
+    Triangles and open triads of every node of an undirected graph, at once.
+
+    Instead of testing every pair of neighbors of one node with `G.has_edge`,
+    all triangles are listed in one vectorised pass over sorted edge arrays;
+    from those, every edge knows how many triangles it closes.
+    A neighbor `a` of `node` is then in a triangle with it
+    if their edge closes at least one triangle,
+    and in an open triad with it if `node` has some other neighbor
+    that `a` is not connected to, i.e. if
+    `degree(node) - 1 - triangles(node, a) > 0`.
+
+    Answers match `in_triangle`, `get_triangle_neighbors`
+    and `get_open_triangles_neighbors` in `nams.solutions.structures`,
+    including for self-loops
+    (which make a node its own neighbor);
+    triangle counts match `nx.triangles`, which ignores self-loops.
+
+    :param G: An undirected NetworkX graph or CSRGraph.
+    """
+
+    def __init__(self, G):
+        if G.is_directed():
+            raise nx.NetworkXNotImplemented("not implemented for directed type")
+        if not isinstance(G, CSRGraph):
+            G = CSRGraph.from_networkx(G)
+        self.graph = G
+        self._positions = pd.Index(G.node_ids)
+        n = len(G)
+
+        src = G.edge_src.astype(np.int64)
+        dst = G.edge_dst.astype(np.int64)
+        self.self_loop = np.zeros(n, dtype=bool)
+        self.self_loop[src[src == dst]] = True
+
+        # Loop-free edges, sorted by (lo, hi).
+        keep = src != dst
+        lo, hi = np.minimum(src[keep], dst[keep]), np.maximum(src[keep], dst[keep])
+        edge_keys = lo * n + hi
+        order = np.argsort(edge_keys)
+        lo, hi, edge_keys = lo[order], hi[order], edge_keys[order]
+        self.degree = np.bincount(lo, minlength=n) + np.bincount(hi, minlength=n)
+
+        rank = np.empty(n, dtype=np.int64)
+        rank[np.argsort(self.degree, kind="stable")] = np.arange(n)
+        self.triangle_array = _list_triangles(n, lo, hi, rank, edge_keys)
+        self.triangles = np.bincount(self.triangle_array.ravel(), minlength=n)
+
+        # Triangles closed by each edge, laid out along a loop-free CSR index.
+        t = self.triangle_array
+        tri_edges = np.concatenate(
+            [
+                np.minimum(t[:, i], t[:, j]) * n + np.maximum(t[:, i], t[:, j])
+                for i, j in [(0, 1), (0, 2), (1, 2)]
+            ]
+        )
+        per_edge = np.bincount(
+            np.searchsorted(edge_keys, tri_edges), minlength=len(edge_keys)
+        )
+        rows = np.concatenate([lo, hi])
+        order = np.argsort(rows, kind="stable")
+        self._indptr = np.concatenate([[0], np.cumsum(self.degree)])
+        self._indices = np.concatenate([hi, lo])[order]
+        self._edge_triangles = np.concatenate([per_edge, per_edge])[order]
+
+    def _position(self, node):
+        i = self._positions.get_indexer([node])[0]
+        if i < 0:
+            raise nx.NetworkXError(f"The node {node} is not in the graph.")
+        return i
+
+    def _row(self, i):
+        span = slice(self._indptr[i], self._indptr[i + 1])
+        return self._indices[span], self._edge_triangles[span]
+
+    def _triangle_positions(self, i):
+        nbrs, closed = self._row(i)
+        if self.self_loop[i] and len(nbrs):
+            # (node, nbr) is a connected pair of neighbors for every nbr.
+            return np.append(nbrs, i)
+        return nbrs[closed > 0]
+
+    def _open_positions(self, i):
+        nbrs, closed = self._row(i)
+        return nbrs[self.degree[i] - 1 - closed > 0]
+
+    def _ids(self, positions):
+        return set(self.graph.node_ids[positions].tolist())
+
+    def triangle_counts(self) -> pd.Series:
+        """Number of triangles through every node, as in `nx.triangles`."""
+        return pd.Series(self.triangles, index=self._positions)
+
+    def in_triangles(self) -> pd.Series:
+        """Whether each node is in a triangle relationship (see `in_triangle`)."""
+        looped = self.self_loop & (self.degree > 0)
+        return pd.Series((self.triangles > 0) | looped, index=self._positions)
+
+    def in_triangle(self, node) -> bool:
+        """Same answer as `in_triangle(G, node)`."""
+        return bool(len(self._triangle_positions(self._position(node))))
+
+    def triangle_neighbors(self, node) -> set:
+        """Same answer as `get_triangle_neighbors(G, node)`."""
+        return self._ids(self._triangle_positions(self._position(node)))
+
+    def open_triangles_neighbors(self, node) -> set:
+        """Same answer as `get_open_triangles_neighbors(G, node)`."""
+        return self._ids(self._open_positions(self._position(node)))
+
+    def all_triangle_neighbors(self) -> dict:
+        """`triangle_neighbors` of every node, as a dict of node -> set."""
+        return {
+            n: self._ids(self._triangle_positions(i))
+            for i, n in enumerate(self.graph.node_ids.tolist())
+        }
+
+    def all_open_triangles_neighbors(self) -> dict:
+        """`open_triangles_neighbors` of every node, as a dict of node -> set."""
+        return {
+            n: self._ids(self._open_positions(i))
+            for i, n in enumerate(self.graph.node_ids.tolist())
+        }
+
+    def triangle_list(self) -> list:
+        """Every triangle once, as a tuple of three node ids."""
+        ids = self.graph.node_ids
+        return [tuple(t) for t in ids[self.triangle_array].tolist()]
+
+
+def _degeneracy_order(adj):
+    """
+    Smallest-last ordering: repeatedly remove a node of minimum degree.
+
+    Orienting every edge from the earlier to the later node in this order
+    leaves each node with at most `degeneracy` out-neighbors.
+    """
+    degree = [len(nbrs) for nbrs in adj]
+    buckets = [set() for _ in range(max(degree, default=0) + 1)]
+    for v, d in enumerate(degree):
+        buckets[d].add(v)
+    removed = [False] * len(adj)
+    order = []
+    low = 0
+    for _ in range(len(adj)):
+        low = max(low - 1, 0)
+        while not buckets[low]:
+            low += 1
+        v = buckets[low].pop()
+        removed[v] = True
+        order.append(v)
+        for u in adj[v]:
+            if not removed[u]:
+                buckets[degree[u]].remove(u)
+                degree[u] -= 1
+                buckets[degree[u]].add(u)
+    return order
+
+
+def _oriented_adjacency(G):
+    """
+    Node ids, plus the later neighbors of every node in degeneracy order.
+
+    Self-loops are ignored, as in `nx.find_cliques`.
+    """
+    nodes = list(G)
+    index = {n: i for i, n in enumerate(nodes)}
+    adj = [{index[u] for u in G.neighbors(n) if u != n} for n in nodes]
+    rank = [0] * len(nodes)
+    for r, v in enumerate(_degeneracy_order(adj)):
+        rank[v] = r
+    later = [
+        frozenset(u for u in nbrs if rank[u] > rank[v]) for v, nbrs in enumerate(adj)
+    ]
+    order = sorted(range(len(nodes)), key=rank.__getitem__)
+    return nodes, later, order
+
+
+def _extend_cliques(clique, candidates, need, later):
+    """Yield every way to add `need` mutually adjacent candidates to clique."""
+    if need == 1:
+        for u in candidates:
+            yield clique + (u,)
+        return
+    for u in candidates:
+        rest = candidates & later[u]
+        if len(rest) >= need - 1:
+            yield from _extend_cliques(clique + (u,), rest, need - 1, later)
+
+
+def _count_cliques(candidates, need, later):
+    """Number of ways to add `need` mutually adjacent candidates."""
+    if need == 1:
+        return len(candidates)
+    if need == 2:
+        return sum(len(candidates & later[u]) for u in candidates)
+    total = 0
+    for u in candidates:
+        rest = candidates & later[u]
+        if len(rest) >= need - 1:
+            total += _count_cliques(rest, need - 1, later)
+    return total
+
+
+_clique_state = None
+
+
+def _init_clique_worker(later, k):
+    global _clique_state
+    _clique_state = (later, k)
+
+
+def _cliques_from(roots):
+    later, k = _clique_state
+    return [c for v in roots for c in _extend_cliques((v,), later[v], k - 1, later)]
+
+
+def _count_from(roots):
+    later, k = _clique_state
+    return sum(_count_cliques(later[v], k - 1, later) for v in roots)
+
+
+def _root_chunks(order, n_jobs):
+    """Split the root nodes into interleaved chunks, a few per process."""
+    n_chunks = 4 * n_jobs
+    return [order[i::n_chunks] for i in range(n_chunks)]
+
+
+def k_cliques(G, k, n_jobs=1):
+    """
+    Yield every clique of size k exactly once, as a tuple of nodes.
+
+    Edges are oriented along a degeneracy ordering,
+    and every clique is grown only from its earliest node
+    through later neighbors,
+    so no node has more than `degeneracy(G)` candidates to extend with
+    and no clique is produced twice.
+    Cliques are streamed rather than collected,
+    except with `n_jobs > 1`, where the root nodes are split across
+    worker processes and each finished chunk of cliques is yielded in turn.
+
+    :param k: Clique size, at least 1.
+    :param n_jobs: Number of processes.
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1.")
+    nodes, later, order = _oriented_adjacency(G)
+    if k == 1:
+        yield from ((n,) for n in nodes)
+        return
+    if n_jobs == 1:
+        for v in order:
+            for clique in _extend_cliques((v,), later[v], k - 1, later):
+                yield tuple(nodes[i] for i in clique)
+        return
+    with ProcessPoolExecutor(
+        n_jobs, initializer=_init_clique_worker, initargs=(later, k)
+    ) as pool:
+        for chunk in pool.map(_cliques_from, _root_chunks(order, n_jobs)):
+            for clique in chunk:
+                yield tuple(nodes[i] for i in clique)
+
+
+def count_k_cliques(G, k, n_jobs=1) -> int:
+    """
+    Count the cliques of size k without building them.
+
+    Same search as `k_cliques`, except that the last two levels
+    only count candidates, so the cliques are never materialised.
+
+    :param k: Clique size, at least 1.
+    :param n_jobs: Number of processes.
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1.")
+    nodes, later, order = _oriented_adjacency(G)
+    if k == 1:
+        return len(nodes)
+    if n_jobs == 1:
+        return sum(_count_cliques(later[v], k - 1, later) for v in order)
+    with ProcessPoolExecutor(
+        n_jobs, initializer=_init_clique_worker, initargs=(later, k)
+    ) as pool:
+        return sum(pool.map(_count_from, _root_chunks(order, n_jobs)))
+
+
+def _adjacency(G):
+    """The adjacency matrix of G in node order, without copying any attributes."""
+    if isinstance(G, CSRGraph):
+        return G.adjacency_matrix()
+    index = {n: i for i, n in enumerate(G)}
+    m = G.number_of_edges()
+    src = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int64, count=m)
+    dst = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int64, count=m)
+    return sp.csr_array((np.ones(m, dtype=np.int8), (src, dst)), shape=(len(G), len(G)))
+
+
+def component_labels(G, connection="weak") -> pd.Series:
+    """
+    Connected component label of every node, as a Series indexed by node.
+
+    Labels are dense integers, numbered in order of each component's first node,
+    which for undirected graphs (and weak components) is the order
+    of `nx.connected_components` (`nx.weakly_connected_components`).
+    They are computed by scipy on the sparse adjacency matrix,
+    without copying the graph.
+
+    :param G: A NetworkX graph or CSRGraph.
+    :param connection: "weak" or "strong"; only used for directed graphs.
+    """
+    _, labels = connected_components(
+        _adjacency(G), directed=G.is_directed(), connection=connection
+    )
+    # Renumber so that components appear in order of their first node.
+    _, first = np.unique(labels, return_index=True)
+    order = np.empty(len(first), dtype=np.int64)
+    order[np.argsort(first)] = np.arange(len(first))
+    index = G.node_ids if isinstance(G, CSRGraph) else list(G)
+    return pd.Series(order[labels], index=index, name="subgraph")
@@ -0,0 +1,427 @@
+"""
+A series of graph snapshots over one shared node index.
+
+`TemporalGraph` keeps the edges of every snapshot
+(the books of Game of Thrones, the years of the airport data)
+in one columnar edge table, sorted by snapshot,
+with `offsets` marking where each snapshot's edges start and end.
+A snapshot is then a slice of that table:
+building it as a CSRGraph costs time in the number of its own edges,
+not in the size of the whole series.
+
+Nodes get one position in the shared index,
+so per-snapshot results line up as the rows of a node x time DataFrame.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+from .centrality import centrality_table, pagerank_matrix
+from .csr import MISSING, CSRGraph, _attribute_columns, column
+
+
+class TemporalGraph:
+    """
+    Graph snapshots that share one node index.
+
+    Build one with `TemporalGraph.from_pandas_edgelist`
+    or `TemporalGraph.from_graphs`.
+
+    :param node_ids: Node ids of the shared index.
+    :param edge_src: Position (in node_ids) of each edge's source node.
+    :param edge_dst: Position (in node_ids) of each edge's target node.
+    :param edge_time: Position (in times) of each edge's snapshot.
+    :param times: Snapshot labels, in order.
+    :param directed: Whether edges are directed.
+    :param edge_attrs: Attribute name -> array aligned to the edge table.
+    """
+
+    def __init__(
+        self,
+        node_ids,
+        edge_src,
+        edge_dst,
+        edge_time,
+        times,
+        directed=False,
+        edge_attrs=None,
+    ):
+        self.node_ids = node_ids
+        self.times = list(times)
+        self.directed = directed
+        # A stable sort keeps each snapshot's edges in their original order.
+        order = np.argsort(edge_time, kind="stable")
+        self.edge_src = np.asarray(edge_src)[order]
+        self.edge_dst = np.asarray(edge_dst)[order]
+        self.edge_attrs = {
+            k: np.asarray(a)[order] for k, a in (edge_attrs or {}).items()
+        }
+        self.offsets = np.zeros(len(self.times) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(edge_time, minlength=len(self.times)), out=self.offsets[1:]
+        )
+
+    @classmethod
+    def from_pandas_edgelist(
+        cls, df, source, target, time, edge_attr=None, directed=False
+    ):
+        """
+        One snapshot per distinct value of the `time` column, in sorted order.
+
+        As with `nx.from_pandas_edgelist`, a repeated edge within a snapshot
+        keeps the attributes of its last row.
+        Rows without a time belong to no snapshot and are dropped.
+
+        :param edge_attr: A column name or list of column names to keep.
+        """
+        if isinstance(edge_attr, str):
+            edge_attr = [edge_attr]
+        edge_attr = list(edge_attr or [])
+        ends, nodes = pd.factorize(
+            pd.concat([df[source], df[target]], ignore_index=True)
+        )
+        src, dst = ends[: len(df)], ends[len(df) :]
+        edge_time, times = pd.factorize(df[time], sort=True)
+
+        u, v = (src, dst) if directed else (np.minimum(src, dst), np.maximum(src, dst))
+        repeated = pd.DataFrame({"t": edge_time, "u": u, "v": v}).duplicated(
+            keep="last"
+        )
+        keep = ~repeated.to_numpy() & (edge_time >= 0)
+        return cls(
+            column(nodes),
+            src[keep],
+            dst[keep],
+            edge_time[keep],
+            times.tolist(),
+            directed=directed,
+            edge_attrs={a: column(df[a].to_numpy()[keep]) for a in edge_attr},
+        )
+
+    @classmethod
+    def from_graphs(cls, graphs, times=None):
+        """
+        Stack NetworkX graphs (all directed or all undirected) as snapshots.
+
+        :param times: Snapshot labels; 0, 1, 2, ... if omitted.
+        """
+        graphs = list(graphs)
+        times = list(range(len(graphs))) if times is None else list(times)
+        index = {}
+        src, dst, edge_time, records = [], [], [], []
+        for t, G in enumerate(graphs):
+            for u, v, d in G.edges(data=True):
+                src.append(index.setdefault(u, len(index)))
+                dst.append(index.setdefault(v, len(index)))
+                edge_time.append(t)
+                records.append(d)
+        return cls(
+            column(index) if index else np.empty(0, dtype=np.int64),
+            np.array(src, dtype=np.int64),
+            np.array(dst, dtype=np.int64),
+            np.array(edge_time, dtype=np.int64),
+            times,
+            directed=bool(graphs) and graphs[0].is_directed(),
+            edge_attrs=_attribute_columns(records),
+        )
+
+    def __len__(self):
+        return len(self.times)
+
+    def __repr__(self):
+        kind = "directed" if self.directed else "undirected"
+        return (
+            f"<TemporalGraph ({kind}) with {len(self.times)} snapshots, "
+            f"{len(self.node_ids)} nodes and {len(self.edge_src)} edges>"
+        )
+
+    def _position(self, time):
+        try:
+            return self.times.index(time)
+        except ValueError:
+            raise KeyError(f"No snapshot {time!r}.")
+
+    def snapshot(self, time) -> CSRGraph:
+        """
+        The graph at snapshot `time`, as a CSRGraph.
+
+        Only nodes with an edge in that snapshot are included,
+        in shared-index order.
+        """
+        t = self._position(time)
+        lo, hi = self.offsets[t], self.offsets[t + 1]
+        src, dst = self.edge_src[lo:hi], self.edge_dst[lo:hi]
+        active = np.unique(np.concatenate([src, dst]))
+        return CSRGraph(
+            self.node_ids[active],
+            np.searchsorted(active, src),
+            np.searchsorted(active, dst),
+            directed=self.directed,
+            edge_attrs={k: a[lo:hi] for k, a in self.edge_attrs.items()},
+            graph={"time": time},
+        )
+
+    def to_networkx(self, time):
+        """The graph at snapshot `time`, as a NetworkX graph."""
+        return self.snapshot(time).to_networkx()
+
+    def _edge_keys(self, time, weight):
+        """Sorted edge keys of one snapshot and their weights (1 if missing)."""
+        if time is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        t = self._position(time)
+        lo, hi = self.offsets[t], self.offsets[t + 1]
+        src = self.edge_src[lo:hi].astype(np.int64)
+        dst = self.edge_dst[lo:hi].astype(np.int64)
+        if not self.directed:
+            src, dst = np.minimum(src, dst), np.maximum(src, dst)
+        keys = src * len(self.node_ids) + dst
+        values = self.edge_attrs.get(weight)
+        if values is None:
+            weights = np.ones(hi - lo)
+        elif values.dtype == object:
+            values = values[lo:hi].tolist()
+            weights = np.array([1 if v is MISSING else v for v in values], dtype=float)
+        else:
+            weights = values[lo:hi].astype(float)
+        order = np.argsort(keys)
+        return keys[order], weights[order]
+
+    def _delta(self, before, after):
+        """The delta between two `_edge_keys` results."""
+        (keys0, w0), (keys1, w1) = before, after
+        keys = np.concatenate([keys0, keys1])
+        weights = np.concatenate([w0, w1])
+        is_after = np.repeat([False, True], [len(keys0), len(keys1)])
+        # A stable sort merges the two sorted runs in linear time.
+        order = np.argsort(keys, kind="stable")
+        keys, weights, is_after = keys[order], weights[order], is_after[order]
+        old = np.where(is_after, np.nan, weights)
+        new = np.where(is_after, weights, np.nan)
+        # An edge in both snapshots appears twice in a row, before then after.
+        both = np.flatnonzero(keys[1:] == keys[:-1])
+        new[both] = new[both + 1]
+        keep = old != new
+        keep[both + 1] = False
+        n = len(self.node_ids)
+        return keys[keep] // n, keys[keep] % n, old[keep], new[keep]
+
+    def delta(self, before, after, weight="weight"):
+        """
+        The edges that differ between two snapshots.
+
+        :param before: Time of the earlier snapshot, or None for an empty graph.
+        :param after: Time of the later snapshot.
+        :returns: (src, dst, old, new) arrays over shared node positions,
+            one entry per edge that was added, removed or reweighted;
+            `old` (`new`) is NaN where the edge is absent before (after).
+        """
+        return self._delta(
+            self._edge_keys(before, weight), self._edge_keys(after, weight)
+        )
+
+    def evolution(self, weight="weight"):
+        """
+        Walk through the snapshots, updating a `SnapshotState` by each delta.
+
+        :returns: An iterator of (time, state); the same state object
+            is updated in place, so take `state.frame()` before moving on.
+        """
+        state = SnapshotState(len(self.node_ids), self.directed, self.node_ids)
+        previous = self._edge_keys(None, weight)
+        for time in self.times:
+            current = self._edge_keys(time, weight)
+            state.apply(self._delta(previous, current))
+            previous = current
+            yield time, state
+
+    def centrality(
+        self, metric="degree", weight="weight", distance=None, n_jobs=1
+    ) -> pd.DataFrame:
+        """
+        One centrality measure of every node in every snapshot.
+
+        Snapshots are computed with `centrality_table`,
+        spread over `n_jobs` processes.
+
+        :param metric: One of `nams.centrality.METRICS`.
+        :param weight: Edge attribute used as edge strength.
+        :param distance: Edge attribute used as edge length for betweenness.
+        :returns: A node x time DataFrame, NaN where a node has no edges
+            in a snapshot.
+        """
+        args = [(self.snapshot(t), [metric], weight, distance) for t in self.times]
+        if n_jobs > 1:
+            with ProcessPoolExecutor(n_jobs) as pool:
+                columns = list(pool.map(_snapshot_metric, args))
+        else:
+            columns = [_snapshot_metric(a) for a in args]
+        df = pd.concat(columns, axis=1, keys=self.times)
+        return df.reindex(pd.Index(self.node_ids, name="node"))
+
+
+def _snapshot_metric(args):
+    C, metrics, weight, distance = args
+    return centrality_table(C, metrics, weight=weight, distance=distance)[metrics[0]]
+
+
+class SnapshotState:
+    """
+    Degree, strength, PageRank and components of one snapshot,
+    updated in place from the edge delta to the next one.
+
+    Everything is kept over the shared node index of a TemporalGraph;
+    nodes without edges in the current snapshot are inactive.
+    Degree and strength are updated from the delta alone.
+    PageRank is warm-started from the previous vector,
+    and components are only recomputed inside components that lost an edge.
+    When the delta is larger than the new snapshot
+    (as between two books that share few edges),
+    PageRank and components are computed from scratch instead.
+
+    :param n: Number of nodes in the shared index.
+    :param directed: Whether edges are directed;
+        components are then weakly connected components.
+    :param node_ids: Node ids, used to label `frame()`.
+    """
+
+    def __init__(self, n, directed=False, node_ids=None):
+        self.n = n
+        self.directed = directed
+        self.node_ids = np.arange(n) if node_ids is None else node_ids
+        self.degree = np.zeros(n, dtype=np.int64)
+        self.strength = np.zeros(n)
+        self.adjacency = sp.csr_array((n, n), dtype=float)
+        self.pattern = sp.csr_array((n, n), dtype=np.int64)
+        self.pagerank = np.full(n, np.nan)
+        self.components = np.full(n, -1, dtype=np.int64)
+        self.n_edges = 0
+        self.iterations = 0
+
+    @property
+    def active(self):
+        """Which nodes have at least one edge."""
+        return self.degree > 0
+
+    def _symmetric(self, src, dst, values):
+        """A sparse delta matrix, mirrored for undirected graphs (not self-loops)."""
+        if not self.directed:
+            back = src != dst
+            src, dst = np.concatenate([src, dst[back]]), np.concatenate(
+                [dst, src[back]]
+            )
+            values = np.concatenate([values, values[back]])
+        return sp.csr_array((values, (src, dst)), shape=(self.n, self.n))
+
+    def apply(self, delta):
+        """Move to the next snapshot, given the `TemporalGraph.delta` to it."""
+        src, dst, old, new = delta
+        was, now = ~np.isnan(old), ~np.isnan(new)
+        count = now.astype(np.int64) - was
+        change = np.nan_to_num(new) - np.nan_to_num(old)
+        previously_active = self.active
+
+        self.degree += np.bincount(src, count, self.n).astype(np.int64)
+        self.degree += np.bincount(dst, count, self.n).astype(np.int64)
+        self.strength += np.bincount(src, change, self.n) + np.bincount(
+            dst, change, self.n
+        )
+        self.pattern = self.pattern + self._symmetric(src, dst, count)
+        self.pattern.eliminate_zeros()
+        # Float differences can leave a removed edge at about 1e-16
+        # instead of zero, so keep only the entries of edges that exist.
+        self.adjacency = (
+            (self.adjacency + self._symmetric(src, dst, change))
+            .multiply(self.pattern != 0)
+            .tocsr()
+        )
+        self.adjacency.eliminate_zeros()
+        self.strength[self.degree == 0] = 0.0
+        self.n_edges += int(count.sum())
+
+        # When most edges changed, starting over is cheaper and no less accurate.
+        if len(src) > self.n_edges:
+            previously_active = np.zeros(self.n, dtype=bool)
+            self.components[:] = -1
+            was = np.zeros(len(src), dtype=bool)
+        self._update_pagerank(previously_active)
+        self._update_components(src[was & ~now], dst[was & ~now], src[now], dst[now])
+
+    def _update_pagerank(self, previously_active):
+        active = np.flatnonzero(self.active)
+        A = self.adjacency[active][:, active]
+        nstart = None
+        if previously_active.any():
+            # Newcomers start from the uniform value; the rest where they were.
+            nstart = np.where(
+                previously_active[active], self.pagerank[active], 1.0 / len(active)
+            )
+        x, self.iterations = pagerank_matrix(A, nstart=nstart)
+        self.pagerank[:] = np.nan
+        self.pagerank[active] = x
+
+    def _update_components(self, removed_src, removed_dst, src, dst):
+        labels = self.components
+        fresh = labels.max() + 1
+        if not len(removed_src) and fresh == 0:
+            _, labels[:] = connected_components(self.pattern, directed=False)
+            labels[~self.active] = -1
+            return
+        # Components that lost an edge may have split: relabel them from scratch.
+        touched = np.unique(labels[np.concatenate([removed_src, removed_dst])])
+        inside = np.flatnonzero(np.isin(labels, touched))
+        if len(inside):
+            pattern = self.pattern[inside][:, inside]
+            _, sub = connected_components(pattern, directed=False)
+            labels[inside] = fresh + sub
+            fresh += sub.max() + 1
+        # New nodes start on their own, then edges merge their components.
+        new_nodes = np.flatnonzero((labels < 0) & self.active)
+        labels[new_nodes] = fresh + np.arange(len(new_nodes))
+        labels[~self.active] = -1
+        if len(src):
+            ends = np.concatenate([labels[src], labels[dst]])
+            ids, ends = np.unique(ends, return_inverse=True)
+            k = len(ids)
+            half = len(src)
+            merged = sp.csr_array(
+                (np.ones(half), (ends[:half], ends[half:])), shape=(k, k)
+            )
+            _, root = connected_components(merged, directed=False)
+            # Map every merged label to the smallest label in its group.
+            smallest = np.full(root.max() + 1, np.iinfo(np.int64).max)
+            np.minimum.at(smallest, root, ids)
+            remap = np.arange(labels.max() + 2)
+            remap[ids] = smallest[root]
+            active = labels >= 0
+            labels[active] = remap[labels[active]]
+        # Keep label ids small.
+        _, labels[labels >= 0] = np.unique(labels[labels >= 0], return_inverse=True)
+
+    def frame(self) -> pd.DataFrame:
+        """
+        The current snapshot's values for its active nodes, in shared order.
+
+        Columns are `degree` (degree centrality), `strength`, `pagerank`
+        and `component`, a dense component label
+        numbered in order of each component's first node.
+        """
+        active = np.flatnonzero(self.active)
+        n = len(active)
+        degree = self.degree[active] / (n - 1) if n > 1 else np.ones(n)
+        _, first, component = np.unique(
+            self.components[active], return_index=True, return_inverse=True
+        )
+        return pd.DataFrame(
+            {
+                "degree": degree,
+                "strength": self.strength[active],
+                "pagerank": self.pagerank[active],
+                "component": np.argsort(np.argsort(first))[component],
+            },
+            index=pd.Index(self.node_ids[active], name="node"),
+        )
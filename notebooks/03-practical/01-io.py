@@ -597,6 +597,28 @@ def _(G, G_________, ___, ____, ___________, d):
 
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""
+    Why 50 trips? `filter_sweep` counts the edges and connected stations
+    that would remain for many thresholds at once,
+    without building a filtered graph for each one.
+    """)
+    return
+
+
+
+
+@app.cell
+def _(G):
+    from nams.solutions.io import filter_sweep
+
+    filter_sweep(G, [1, 5, 10, 25, 50, 100, 200])
+    return
+
+
+
+
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(r"""
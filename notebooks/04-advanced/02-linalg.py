@@ -740,17 +740,23 @@ def _(mo):
 
 @app.cell
 def _():
-    from nams.solutions.bipartite import extract_partition_nodes
+    from nams.solutions.bipartite import partition_index
 
-    return (extract_partition_nodes,)
+    return (partition_index,)
 
 
 
 
 @app.cell
-def _(G_amzn, extract_partition_nodes, nx):
-    customer_nodes = extract_partition_nodes(G_amzn, "customer")
-    mat = nx.bipartite.biadjacency_matrix(G_amzn, row_order=customer_nodes)
+def _(G_amzn, nx, partition_index):
+    # The partition index is built once per graph and gives both orderings.
+    customer_nodes, product_nodes = partition_index(G_amzn).biadjacency_order(
+        "customer", "product"
+    )
+    customer_nodes = customer_nodes.tolist()
+    mat = nx.bipartite.biadjacency_matrix(
+        G_amzn, row_order=customer_nodes, column_order=product_nodes
+    )
     return customer_nodes, mat
 
 
@@ -984,6 +990,36 @@ def _(G_amzn, customer_mat, customer_nodes, np, nx, sp, time):
 
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""
+    ### Blocked matrices
+
+    `mat @ mat.T` holds every customer pair with a shared review in memory at once,
+    which stops fitting in memory at a few hundred thousand customers.
+    Computing it a block of rows at a time,
+    and keeping only the best pairs from each block,
+    gives the same answer with bounded memory.
+    """)
+    return
+
+
+
+
+@app.cell
+def _(customer_nodes, mat, time):
+    from nams.solutions.linalg import projection_top_pairs
+
+    _start = time()
+    (_c1,), (_c2,), (_weight,) = projection_top_pairs(mat, k=1, block_size=1024)
+    _end = time()
+    print(f"{_end - _start:.3f} seconds")
+    print(f"Most similar customers: {customer_nodes[_c1]}, {customer_nodes[_c2]}, {_weight}")
+    return
+
+
+
+
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(r"""
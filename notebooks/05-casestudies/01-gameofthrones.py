@@ -99,13 +99,12 @@ def _():
 def _():
     import pandas as pd
     import networkx as nx
-    import community
     import numpy as np
     import matplotlib.pyplot as plt
     import warnings
 
     warnings.filterwarnings("ignore")
-    return community, np, nx, pd, plt
+    return np, nx, pd, plt
 
 
 
@@ -574,6 +573,32 @@ def _(graphs, nx, pd, plt):
 
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""
+    `TemporalGraph` keeps all five books in one edge table over a shared set of characters,
+    and gives back the same evolution as a character x book table in one call.
+    """)
+    return
+
+
+
+
+@app.cell
+def _(books):
+    from nams import TemporalGraph
+
+    book_series = TemporalGraph.from_pandas_edgelist(
+        books, "Source", "Target", time="book", edge_attr=["weight", "weight_inv"]
+    )
+    book_series.centrality("degree").loc[
+        ["Eddard-Stark", "Tyrion-Lannister", "Jon-Snow"]
+    ]
+    return
+
+
+
+
 @app.cell
 def _(evol_df):
     set_of_char = set()
@@ -680,6 +705,9 @@ def _(mo):
     A network is said to have community structure if the nodes of the network can be easily grouped into (potentially overlapping) sets of nodes such that each set of nodes is densely connected internally. There are multiple algorithms and definitions to calculate these communities in a network.
 
     We will use the Louvain community detection algorithm to find the modules in our graph.
+    Louvain's result depends on its random seed,
+    so we run it with 20 seeds and keep the partition with the highest modularity.
+    `ensemble.coassignment()` tells us how often two characters land in the same community across the runs.
     """)
     return
 
@@ -687,10 +715,12 @@ def _(mo):
 
 
 @app.cell(hide_code=True)
-def _(community, graphs):
+def _(graphs):
     import nxviz as nv
+    from nams.communities import louvain_ensemble
 
-    partition = community.best_partition(graphs[0], random_state=42)
+    ensemble = louvain_ensemble(graphs[0], seeds=20)
+    partition = ensemble.partition
 
     for n in graphs[0].nodes():
         graphs[0].nodes[n]["partition"] = partition[n]
@@ -703,7 +733,7 @@ def _(community, graphs):
         node_color_by="partition",
         backend="plotly",
     )
-    return (partition,)
+    return ensemble, partition
 
 
 
@@ -740,6 +770,16 @@ def _(partition_dict):
 
 
 
+@app.cell
+def _(ensemble):
+    # Characters who join Tyrion's community in some runs but not all.
+    together = ensemble.coassignment()["Tyrion-Lannister"]
+    together[(together > 0) & (together < 1)].sort_values(ascending=False)
+    return
+
+
+
+
 @app.cell
 def _(partition_dict):
     partition_dict[2]
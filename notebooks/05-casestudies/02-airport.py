@@ -356,7 +356,9 @@ def _(pass_air_data, plot_time_series):
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(r"""
-    Before moving to the next part of the chapter let's create a method to extract edges from `passenger_graph` for a particular year so we can better analyse the data on a granular scale.
+    `route_table` sorts the passengers table once, by year and busiest route,
+    so the top routes of any year can be looked up without rescanning it.
+    Move the slider to browse the years.
     """)
     return
 
@@ -364,22 +366,38 @@ def _(mo):
 
 
 @app.cell
-def _(nx):
-    def year_network(G, year):
-        year_network = nx.DiGraph()
-        for edge in G.edges:
-            source, target, edge_year = edge
-            if edge_year == year:
-                attr = G[source][target][edge_year]
-                year_network.add_edge(
-                    source,
-                    target,
-                    weight=attr["PASSENGERS"],
-                    weight_inv=1
-                    / (attr["PASSENGERS"] if attr["PASSENGERS"] != 0.0 else 1),
-                    airlines=attr["UNIQUE_CARRIER_NAME"],
-                )
-        return year_network
+def _(mo):
+    year_slider = mo.ui.slider(1990, 2015, value=2015, label="Year")
+    year_slider
+    return (year_slider,)
+
+
+
+
+@app.cell
+def _(pass_air_data, year_slider):
+    from nams.solutions.airport import route_table
+
+    route_table(pass_air_data).top_routes(year_slider.value, k=10)
+    return
+
+
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(r"""
+    Before moving to the next part of the chapter let's create a method to extract the network of a particular year so we can better analyse the data on a granular scale.
+    `year_network` builds it straight from `pass_air_data`: all years are grouped once and cached, so asking for another year does not rescan the table.
+    """)
+    return
+
+
+
+
+@app.cell
+def _():
+    from nams.solutions.airport import year_network
 
     return (year_network,)
 
@@ -387,8 +405,8 @@ def _(nx):
 
 
 @app.cell
-def _(passenger_graph, year_network):
-    pass_2015_network = year_network(passenger_graph, 2015)
+def _(pass_air_data, year_network):
+    pass_2015_network = year_network(pass_air_data, 2015)
     return (pass_2015_network,)
 
 
@@ -798,9 +816,20 @@ def _(PR_2015_scores):
 
 
 @app.cell
-def _(nx, pass_2015_network):
+def _():
+    from nams.centrality import betweenness_centrality
+
+    return (betweenness_centrality,)
+
+
+
+
+@app.cell
+def _(betweenness_centrality, pass_2015_network):
+    # nx.betweenness_centrality with the work split over 4 processes;
+    # values agree with NetworkX up to floating-point rounding.
     top_10_bc = sorted(
-        nx.betweenness_centrality(pass_2015_network, weight=None).items(),
+        betweenness_centrality(pass_2015_network, weight=None, n_jobs=4).items(),
         key=lambda x: x[1],
         reverse=True,
     )[0:10]
@@ -874,9 +903,11 @@ def _(mo):
 
 
 @app.cell
-def _(nx, pass_2015_network):
+def _(betweenness_centrality, pass_2015_network):
     sorted(
-        nx.betweenness_centrality(pass_2015_network, weight="weight_inv").items(),
+        betweenness_centrality(
+            pass_2015_network, weight="weight_inv", n_jobs=4
+        ).items(),
         key=lambda x: x[1],
         reverse=True,
     )[0:10]
@@ -966,8 +997,18 @@ def _(mo):
 
 
 @app.cell
-def _(nx, pass_2015_network):
-    components = list(nx.weakly_connected_components(pass_2015_network))
+def _():
+    from nams.structures import component_labels
+
+    return (component_labels,)
+
+
+
+
+@app.cell
+def _(component_labels, pass_2015_network):
+    # One weakly connected component label per airport.
+    components = component_labels(pass_2015_network)
     return (components,)
 
 
@@ -975,8 +1016,7 @@ def _(nx, pass_2015_network):
 
 @app.cell
 def _(components):
-    for c in components:
-        print(len(c))
+    print(components.value_counts(sort=False))
     return
 
 
@@ -984,8 +1024,8 @@ def _(components):
 
 @app.cell
 def _(components):
-    print(components[1])
-    print(components[2])
+    print(set(components.index[components == 1]))
+    print(set(components.index[components == 2]))
     return
 
 
@@ -1197,8 +1237,11 @@ def _(mo):
 
 
 @app.cell
-def _(strongly_connected_components):
-    pass_2015_strong_nodes = max(strongly_connected_components, key=len)
+def _(component_labels, pass_2015_network):
+    strong_labels = component_labels(pass_2015_network, connection="strong")
+    pass_2015_strong_nodes = strong_labels.index[
+        strong_labels == strong_labels.value_counts().idxmax()
+    ]
     return (pass_2015_strong_nodes,)
 
 
@@ -0,0 +1,151 @@
+"""
+Passenger-table queries from the airport case study.
+
+- `busiest_route`: the original whole-table `groupby().transform(max)` and
+  `.query()` against a cached `RouteTable`, once per year as a slider would.
+- Route time series: `.query()` on ORIGIN and DEST against `RouteTable.series`,
+  and thousands of routes at once with `RouteIndex.matrix`
+  against a `pivot_table` of the whole table.
+- A year-slider sweep: the notebook's `year_network` scan of a MultiDiGraph
+  against `year_network` on the passengers frame, for five years.
+- New routes for the shortest-path exercise: the original
+  `add_opinionated_edges` against `suggest_edges` and the new version,
+  on preferential-attachment graphs.
+
+The real passenger data is large, so a synthetic table of the same shape
+(from `temporal.py`) is used.
+
+    python scripts/benchmarks/airport.py
+"""
+
+import time
+import warnings
+
+import networkx as nx
+import pandas as pd
+from temporal import passengers
+from temporal import year_network as scan_year_network
+
+from nams.solutions.airport import (
+    add_opinionated_edges,
+    route_table,
+    suggest_edges,
+    year_network,
+    year_series,
+)
+
+warnings.filterwarnings("ignore")
+
+
+def busiest_route(pass_air_data, year):
+    """The original `busiest_route`."""
+    return pass_air_data[
+        pass_air_data.groupby(["YEAR"])["PASSENGERS"].transform(max)
+        == pass_air_data["PASSENGERS"]
+    ].query(f"YEAR == {year}")
+
+
+def opinionated_edges(G):
+    """The original `add_opinionated_edges`."""
+    G = nx.DiGraph(G)
+    sort_degree = sorted(
+        nx.degree_centrality(G).items(), key=lambda x: x[1], reverse=True
+    )
+    top_count = 0
+    for n, v in sort_degree:
+        count = 0
+        for node, val in sort_degree:
+            if node != n:
+                if node not in G._adj[n]:
+                    G.add_edge(n, node)
+                    count += 1
+                    if count == 25:
+                        break
+        top_count += 1
+        if top_count == 20:
+            break
+    return G
+
+
+def timed(label, run):
+    start = time.perf_counter()
+    result = run()
+    print(f"  {label:<40}{time.perf_counter() - start:>9.4f} s")
+    return result
+
+
+def main():
+    data = passengers()
+    years = sorted(data.YEAR.unique())
+    routes = list(zip(data.ORIGIN[:200], data.DEST[:200]))
+    print(f"synthetic passengers: {len(data)} rows, {len(years)} years")
+
+    timed(
+        "busiest_route per year, original",
+        lambda: [busiest_route(data, y) for y in years],
+    )
+    table = timed("route_table (built once)", lambda: route_table(data))
+    timed(
+        "busiest_route per year, RouteTable",
+        lambda: [table.busiest_route(y) for y in years],
+    )
+    timed("top_routes(k=10) per year", lambda: [table.top_routes(y) for y in years])
+
+    timed(
+        f"{len(routes)} route series, query",
+        lambda: [data.query(f"ORIGIN == '{o}' and DEST == '{d}'") for o, d in routes],
+    )
+    timed(
+        f"{len(routes)} route series, RouteTable",
+        lambda: [table.series(o, d) for o, d in routes],
+    )
+
+    many = list(zip(data.ORIGIN[:5000], data.DEST[:5000]))
+    timed(
+        f"{len(many)} routes x years, pivot_table",
+        lambda: data.pivot_table(
+            index=["ORIGIN", "DEST"],
+            columns="YEAR",
+            values="PASSENGERS",
+            aggfunc="sum",
+        ).reindex(pd.MultiIndex.from_tuples(many)),
+    )
+    timed(
+        f"{len(many)} routes x years, RouteIndex.matrix",
+        lambda: table.routes.matrix(many),
+    )
+
+    sweep = years[-5:]
+    G = timed(
+        "MultiDiGraph",
+        lambda: nx.from_pandas_edgelist(
+            data,
+            "ORIGIN",
+            "DEST",
+            edge_key="YEAR",
+            edge_attr=["PASSENGERS", "UNIQUE_CARRIER_NAME"],
+            create_using=nx.MultiDiGraph(),
+        ),
+    )
+    timed(
+        f"{len(sweep)} years, MultiDiGraph scan",
+        lambda: [scan_year_network(G, y) for y in sweep],
+    )
+    timed("year_series (built once)", lambda: year_series(data))
+    timed(
+        f"{len(sweep)} years, year_network",
+        lambda: [year_network(data, y) for y in sweep],
+    )
+
+    for n in [1000, 100_000]:
+        G = nx.barabasi_albert_graph(n, 5, seed=0)
+        print(f"preferential attachment: {n} nodes, {G.number_of_edges()} edges")
+        before = timed("add_opinionated_edges, original", lambda: opinionated_edges(G))
+        timed("nx.DiGraph(G) copy alone", lambda: nx.DiGraph(G))
+        timed("suggest_edges", lambda: suggest_edges(G))
+        after = timed("add_opinionated_edges", lambda: add_opinionated_edges(G))
+        print(f"    same edges: {list(before.edges) == list(after.edges)}")
+
+
+if __name__ == "__main__":
+    main()
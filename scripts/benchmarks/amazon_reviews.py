@@ -0,0 +1,123 @@
+"""
+Compare wall time and peak RSS of `load_amazon_reviews`
+against the original readlines-based implementation.
+
+Each implementation runs in a fresh process so that peak RSS is not
+polluted by the other. If the real review file is missing, a synthetic
+one with the same record layout is generated:
+
+    python scripts/benchmarks/amazon_reviews.py --synthetic 500000 --n-jobs 4
+"""
+
+import argparse
+import gzip
+import json
+import multiprocessing as mp
+import os
+import random
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+REVIEWS = "amazon_reviews/reviews_Digital_Music_5.json.gz"
+
+
+def legacy_load_amazon_reviews(datasets):
+    """The original loader: readlines, parse everything, then two more passes."""
+    import networkx as nx
+
+    data = []
+    with gzip.open(datasets / REVIEWS, "rt") as f:
+        for line in f.readlines():
+            line = line.strip("\n")
+            j = json.loads(line)
+            data.append(j)
+
+    G = nx.Graph()
+    for d in data:
+        G.add_node(d["asin"], bipartite="product")
+        G.add_node(d["reviewerID"], bipartite="customer")
+    for d in data:
+        G.add_edge(d["reviewerID"], d["asin"])
+    return G
+
+
+def streaming_load_amazon_reviews(datasets, n_jobs):
+    """The current loader, pointed at `datasets` with the cache disabled."""
+    os.environ["NAMS_CACHE"] = "0"
+    from nams import load_data as cf
+
+    cf.datasets = datasets
+    return cf.load_amazon_reviews(n_jobs=n_jobs)
+
+
+def run(name, datasets, n_jobs, queue):
+    """Build the graph, then report wall time, peak RSS and graph size."""
+    start = time.perf_counter()
+    if name == "legacy":
+        G = legacy_load_amazon_reviews(datasets)
+    else:
+        G = streaming_load_amazon_reviews(datasets, n_jobs)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((elapsed, rss, len(G), G.number_of_edges()))
+
+
+def write_synthetic(path, n_reviews, seed=42):
+    """Write a gzipped JSON-lines file shaped like the Amazon review dump."""
+    rng = random.Random(seed)
+    n_customers = max(n_reviews // 10, 1)
+    n_products = max(n_reviews // 15, 1)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt") as f:
+        for i in range(n_reviews):
+            review = {
+                "reviewerID": f"A{rng.randrange(n_customers):012d}",
+                "asin": f"B{rng.randrange(n_products):09d}",
+                "reviewerName": "Synthetic Reviewer",
+                "helpful": [0, 0],
+                "reviewText": "Lorem ipsum dolor sit amet. " * 20,
+                "overall": 5.0,
+                "summary": "Synthetic review",
+                "unixReviewTime": 1400000000 + i,
+                "reviewTime": "05 13, 2014",
+            }
+            f.write(json.dumps(review) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--synthetic", type=int, default=200_000)
+    parser.add_argument("--n-jobs", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    from pyprojroot import here
+
+    datasets = here() / "data"
+    tmp = None
+    if not (datasets / REVIEWS).exists():
+        tmp = tempfile.TemporaryDirectory()
+        datasets = Path(tmp.name)
+        print(f"Review file missing; generating {args.synthetic} synthetic reviews.")
+        write_synthetic(datasets / REVIEWS, args.synthetic)
+
+    ctx = mp.get_context("spawn")
+    cases = [("legacy", 1), ("streaming", 1), ("streaming", args.n_jobs)]
+    print(f"{'implementation':<20}{'wall (s)':>10}{'peak RSS (MiB)':>16}{'nodes':>10}")
+    for name, n_jobs in cases:
+        queue = ctx.Queue()
+        p = ctx.Process(target=run, args=(name, datasets, n_jobs, queue))
+        p.start()
+        elapsed, rss, n_nodes, _ = queue.get()
+        p.join()
+        label = name if name == "legacy" else f"{name} (n_jobs={n_jobs})"
+        print(f"{label:<20}{elapsed:>10.2f}{rss:>16.1f}{n_nodes:>10}")
+
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Time `nams.centrality` against `nx.betweenness_centrality`.
+
+For each graph: exact NetworkX, exact with 1 and `--jobs` processes,
+a k-source estimate, and the adaptive top-10 estimate,
+with the largest absolute error against the exact values
+and whether the top 10 matches.
+
+    python scripts/benchmarks/betweenness.py --jobs 4
+"""
+
+import argparse
+import time
+import warnings
+
+import networkx as nx
+import pandas as pd
+
+from nams import centrality
+from nams import load_data as cf
+
+warnings.filterwarnings("ignore")
+
+
+def got_graph(book):
+    """Weighted Game of Thrones co-occurrence graph of one book."""
+    books = cf.load_game_of_thrones_data()
+    edges = books[books["book"] == book].assign(weight_inv=lambda d: 1 / d["weight"])
+    return nx.from_pandas_edgelist(
+        edges, "Source", "Target", edge_attr=["weight", "weight_inv"]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--k", type=int, default=200)
+    args = parser.parse_args()
+
+    graphs = [
+        ("got book 5, weight_inv", got_graph(5), "weight_inv"),
+        ("random 3000 nodes", nx.gnm_random_graph(3000, 15000, seed=0), None),
+    ]
+    for name, G, weight in graphs:
+        print(f"{name}: {len(G)} nodes, {G.number_of_edges()} edges")
+        start = time.perf_counter()
+        exact = pd.Series(nx.betweenness_centrality(G, weight=weight))
+        print(f"  {'networkx':<24}{time.perf_counter() - start:>8.2f} s")
+        top = exact.nlargest(10).index.tolist()
+
+        runs = [
+            (
+                "exact, 1 process",
+                lambda: centrality.betweenness_centrality(G, weight=weight),
+            ),
+            (
+                f"exact, {args.jobs} processes",
+                lambda: centrality.betweenness_centrality(
+                    G, weight=weight, n_jobs=args.jobs
+                ),
+            ),
+            (
+                f"estimate, k={args.k}",
+                lambda: centrality.betweenness_estimate(
+                    G, args.k, weight=weight, seed=0, n_jobs=args.jobs
+                )["betweenness"],
+            ),
+            (
+                "adaptive, top 10",
+                lambda: centrality.adaptive_betweenness(
+                    G, weight=weight, seed=0, n_jobs=args.jobs
+                )["betweenness"],
+            ),
+        ]
+        for label, run in runs:
+            start = time.perf_counter()
+            result = pd.Series(run())
+            elapsed = time.perf_counter() - start
+            error = (result - exact).abs().max()
+            same_top = result.nlargest(10).index.tolist() == top
+            print(
+                f"  {label:<24}{elapsed:>8.2f} s"
+                f"  max error {error:.1e}  same top 10: {same_top}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Projected-neighbor queries: `nx.bipartite.weighted_projected_graph`
+against `BipartiteProjection` in single-row and full-projection mode
+and the per-graph cache `bipartite_projection`,
+and the top-10 most similar persons from a projected graph's
+degree centrality against `most_similar_nodes`.
+
+    python scripts/benchmarks/bipartite.py --queries 100
+"""
+
+import argparse
+import random
+import time
+import warnings
+
+import networkx as nx
+
+from nams import load_data as cf
+from nams.solutions import bipartite
+
+warnings.filterwarnings("ignore")
+
+
+def synthetic_graph(n_persons=20_000, n_crimes=5_000, n_edges=60_000, seed=0):
+    """A random person-crime graph, with the `bipartite` attribute set."""
+    rng = random.Random(seed)
+    G = nx.Graph()
+    G.add_nodes_from((f"p{i}" for i in range(n_persons)), bipartite="person")
+    G.add_nodes_from((f"c{i}" for i in range(n_crimes)), bipartite="crime")
+    G.add_edges_from(
+        (f"p{rng.randrange(n_persons)}", f"c{rng.randrange(n_crimes)}")
+        for _ in range(n_edges)
+    )
+    return G
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for name, G in [
+        ("crime", cf.load_crime_network()),
+        ("synthetic", synthetic_graph()),
+    ]:
+        persons = bipartite.extract_partition_nodes(G, "person")
+        queries = rng.sample(persons, min(args.queries, len(persons)))
+        print(f"{name}: {len(persons)} persons, {G.number_of_edges()} edges")
+
+        start = time.perf_counter()
+        nx.bipartite.weighted_projected_graph(G, persons)
+        print(
+            f"  {'networkx projection, once':<36}{time.perf_counter() - start:>9.3f} s"
+        )
+
+        start = time.perf_counter()
+        for p in queries:
+            bipartite.BipartiteProjection(G, persons).weights(p)
+        elapsed = (time.perf_counter() - start) / len(queries)
+        print(f"  {'single row, fresh engine per query':<36}{elapsed:>9.3f} s")
+
+        start = time.perf_counter()
+        for p in queries:
+            bipartite.bipartite_projection(G, "person").weights(p)
+        elapsed = (time.perf_counter() - start) / len(queries)
+        print(f"  {'bipartite_projection, per query':<36}{elapsed:>9.6f} s")
+
+        projection = bipartite.BipartiteProjection(G, persons)
+        start = time.perf_counter()
+        projection.project()
+        print(f"  {'B @ B.T, once':<36}{time.perf_counter() - start:>9.3f} s")
+        start = time.perf_counter()
+        for p in queries:
+            projection.weights(p)
+        elapsed = (time.perf_counter() - start) / len(queries)
+        print(f"  {'cached projection, per query':<36}{elapsed:>9.6f} s")
+
+        start = time.perf_counter()
+        projected = nx.bipartite.projected_graph(G, persons)
+        bipartite.find_most_similar_people(projected)
+        elapsed = time.perf_counter() - start
+        print(f"  {'top 10, projected graph':<36}{elapsed:>9.3f} s")
+        for metric in ["shared", "cosine", "jaccard"]:
+            start = time.perf_counter()
+            bipartite.most_similar_nodes(G, "person", by="weight", metric=metric)
+            elapsed = time.perf_counter() - start
+            print(f"  {'top 10, sparse, ' + metric:<36}{elapsed:>9.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+The four measures of `correlation_centrality`, computed one NetworkX call
+at a time, against one `centrality_table` call,
+with the per-metric timings that `centrality_table` reports.
+
+    python scripts/benchmarks/centrality_table.py --jobs 2
+"""
+
+import argparse
+import time
+import warnings
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from nams import load_data as cf
+from nams.centrality import centrality_table
+
+warnings.filterwarnings("ignore")
+
+METRICS = ["pagerank", "betweenness", "weighted_degree", "degree"]
+
+
+def separately(G):
+    """The original correlation_centrality measures, one call each."""
+    return pd.DataFrame(
+        {
+            "pagerank": nx.pagerank(G, weight="weight"),
+            "betweenness": nx.betweenness_centrality(G, weight="weight_inv"),
+            "weighted_degree": dict(G.degree(weight="weight")),
+            "degree": nx.degree_centrality(G),
+        }
+    )
+
+
+def got_graph(book):
+    """Weighted Game of Thrones co-occurrence graph of one book."""
+    books = cf.load_game_of_thrones_data()
+    edges = books[books["book"] == book].assign(weight_inv=lambda d: 1 / d["weight"])
+    return nx.from_pandas_edgelist(
+        edges, "Source", "Target", edge_attr=["weight", "weight_inv"]
+    )
+
+
+def synthetic_graph(n=2000, m=10_000, seed=0):
+    """A random graph with integer weights and their inverses."""
+    G = nx.gnm_random_graph(n, m, seed=seed)
+    rng = np.random.default_rng(seed)
+    for (_, _, d), w in zip(G.edges(data=True), rng.integers(1, 10, m)):
+        d["weight"] = int(w)
+        d["weight_inv"] = 1 / w
+    return G
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=2)
+    args = parser.parse_args()
+
+    graphs = [(f"got book {b}", got_graph(b)) for b in range(1, 6)]
+    graphs.append(("random 2000 nodes", synthetic_graph()))
+    for name, G in graphs:
+        print(f"{name}: {len(G)} nodes, {G.number_of_edges()} edges")
+        start = time.perf_counter()
+        reference = separately(G)
+        print(f"  {'networkx, one call each':<28}{time.perf_counter() - start:>8.3f} s")
+        for jobs in [1, args.jobs]:
+            start = time.perf_counter()
+            table = centrality_table(
+                G, METRICS, weight="weight", distance="weight_inv", n_jobs=jobs
+            )
+            elapsed = time.perf_counter() - start
+            error = (table - reference.loc[table.index]).abs().max().max()
+            print(
+                f"  {f'centrality_table, {jobs} jobs':<28}{elapsed:>8.3f} s"
+                f"  max error {error:.1e}"
+            )
+        timings = ", ".join(f"{k} {v:.3f}" for k, v in table.attrs["timings"].items())
+        print(f"    per metric (s): {timings}")
+
+
+if __name__ == "__main__":
+    main()
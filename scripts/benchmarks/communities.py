@@ -0,0 +1,85 @@
+"""
+Louvain over several seeds: one `community.best_partition` (python-louvain)
+or `nx.community.louvain_communities` call per seed
+against `louvain_ensemble`, serially, in a process pool and from its cache.
+
+Graphs: Game of Thrones book 1 and a synthetic power-law cluster graph.
+"Best Q" is the highest modularity among the runs.
+
+    python scripts/benchmarks/communities.py --seeds 10 --jobs 2
+"""
+
+import argparse
+import time
+import warnings
+
+import community
+import networkx as nx
+
+from nams import load_data as cf
+from nams.communities import clear_cache, louvain_ensemble
+
+warnings.filterwarnings("ignore")
+
+
+def python_louvain(G, seeds):
+    return max(
+        community.modularity(community.best_partition(G, random_state=s), G)
+        for s in seeds
+    )
+
+
+def networkx_louvain(G, seeds):
+    return max(
+        nx.community.modularity(G, nx.community.louvain_communities(G, seed=s))
+        for s in seeds
+    )
+
+
+def uncached(G, seeds, n_jobs):
+    clear_cache()
+    return louvain_ensemble(G, seeds, n_jobs=n_jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--jobs", type=int, default=2)
+    parser.add_argument("--nodes", type=int, default=5000)
+    args = parser.parse_args()
+    seeds = list(range(args.seeds))
+
+    books = cf.load_game_of_thrones_data()
+    graphs = [
+        (
+            "got book 1",
+            nx.from_pandas_edgelist(
+                books[books.book == 1], "Source", "Target", edge_attr="weight"
+            ),
+        ),
+        ("power-law cluster", nx.powerlaw_cluster_graph(args.nodes, 5, 0.3, seed=0)),
+    ]
+    for name, G in graphs:
+        print(
+            f"{name}: {len(G)} nodes, {G.number_of_edges()} edges, {args.seeds} seeds"
+        )
+        clear_cache()
+        for label, run in [
+            ("python-louvain", lambda: python_louvain(G, seeds)),
+            ("networkx louvain", lambda: networkx_louvain(G, seeds)),
+            ("louvain_ensemble, 1 job", lambda: louvain_ensemble(G, seeds)),
+            (
+                f"louvain_ensemble, {args.jobs} jobs",
+                lambda: uncached(G, seeds, args.jobs),
+            ),
+            ("louvain_ensemble, cached", lambda: louvain_ensemble(G, seeds)),
+        ]:
+            start = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - start
+            best = result if isinstance(result, float) else result.modularity.max()
+            print(f"  {label:<28}{elapsed:>9.3f} s  best Q {best:.4f}")
+
+
+if __name__ == "__main__":
+    main()
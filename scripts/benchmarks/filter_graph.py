@@ -0,0 +1,77 @@
+"""
+Filtering a trip graph by `num_trips`, as in the I/O chapter:
+
+- one threshold: the original copy-then-remove `filter_graph`
+  against the new one and its `view=True` mode;
+- a threshold sweep: one original `filter_graph` per threshold,
+  counting edges and non-isolated nodes, against one `filter_sweep` call.
+
+The Divvy trips file is not in the repository, so synthetic trip graphs
+with heavy-tailed trip counts are used:
+one the size of Divvy 2013 and one for a larger bike-share system.
+
+    python scripts/benchmarks/filter_graph.py
+"""
+
+import time
+
+import networkx as nx
+import numpy as np
+
+from nams.solutions.io import filter_graph, filter_sweep
+
+THRESHOLDS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+
+def copy_and_remove(G, minimum_num_trips):
+    """The original `filter_graph`."""
+    G_filtered = G.copy()
+    for u, v, d in G.edges(data=True):
+        if d["num_trips"] < minimum_num_trips:
+            G_filtered.remove_edge(u, v)
+    return G_filtered
+
+
+def trip_graph(stations, edges, seed=0):
+    G = nx.gnm_random_graph(stations, edges, seed=seed, directed=True)
+    rng = np.random.default_rng(seed)
+    for (_, _, d), n in zip(G.edges(data=True), rng.zipf(1.6, edges).tolist()):
+        d["num_trips"] = n
+    return G
+
+
+def timed(label, run):
+    start = time.perf_counter()
+    result = run()
+    print(f"  {label:<40}{time.perf_counter() - start:>9.3f} s")
+    return result
+
+
+def main():
+    for name, G in [
+        ("divvy-sized", trip_graph(300, 44_422)),
+        ("larger system", trip_graph(3000, 1_000_000)),
+    ]:
+        print(f"{name}: {len(G)} stations, {G.number_of_edges()} edges")
+        before = timed("filter_graph(50), original", lambda: copy_and_remove(G, 50))
+        after = timed("filter_graph(50)", lambda: filter_graph(G, 50))
+        timed("filter_graph(50, view=True)", lambda: filter_graph(G, 50, view=True))
+        print(f"    same graph: {list(before.edges) == list(after.edges)}")
+
+        def counts():
+            rows = []
+            for t in THRESHOLDS:
+                H = copy_and_remove(G, t)
+                rows.append((H.number_of_edges(), sum(d > 0 for _, d in H.degree())))
+            return rows
+
+        slow = timed(f"{len(THRESHOLDS)} thresholds, original", counts)
+        fast = timed(
+            f"{len(THRESHOLDS)} thresholds, filter_sweep",
+            lambda: filter_sweep(G, THRESHOLDS),
+        )
+        print(f"    same counts: {slow == list(fast.itertuples(index=False))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Top nodes per community: the original running-max loop
+of `most_important_node_in_partition` against `grouped_top_k`,
+on the Game of Thrones communities and on millions of random scores.
+
+    python scripts/benchmarks/grouped_top_k.py --nodes 3000000 --groups 5000
+"""
+
+import argparse
+import time
+import warnings
+
+import community
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from nams import grouped_top_k
+from nams import load_data as cf
+
+warnings.filterwarnings("ignore")
+
+
+def running_max(scores, partition_dict):
+    """The original loop, which skips groups whose best score is zero."""
+    max_d = {}
+    for group in partition_dict:
+        temp = 0
+        for character in partition_dict[group]:
+            if scores[character] > temp:
+                max_d[group] = character
+                temp = scores[character]
+    return max_d
+
+
+def timed(label, run):
+    start = time.perf_counter()
+    result = run()
+    print(f"  {label:<32}{time.perf_counter() - start:>9.3f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=3_000_000)
+    parser.add_argument("--groups", type=int, default=5000)
+    args = parser.parse_args()
+
+    books = cf.load_game_of_thrones_data()
+    G = nx.from_pandas_edgelist(books[books.book == 1], "Source", "Target")
+    partition = community.best_partition(G, random_state=42)
+    partition_dict = {}
+    for character, group in partition.items():
+        partition_dict.setdefault(group, []).append(character)
+    scores = nx.degree_centrality(G)
+    print(f"game of thrones book 1: {len(G)} nodes, {len(partition_dict)} groups")
+    old = timed("running max", lambda: running_max(scores, partition_dict))
+    top = timed("grouped_top_k", lambda: grouped_top_k(partition, scores))
+    print(f"  same answer: {old == dict(zip(top['group'], top['node']))}")
+
+    rng = np.random.default_rng(0)
+    groups = pd.Series(rng.integers(0, args.groups, args.nodes))
+    scores = rng.random(args.nodes)
+    partition_dict = {
+        g: list(members) for g, members in groups.groupby(groups).groups.items()
+    }
+    print(f"random: {args.nodes} nodes, {args.groups} groups")
+    timed("running max", lambda: running_max(scores, partition_dict))
+    for k in [1, 10]:
+        timed(f"grouped_top_k, k={k}", lambda: grouped_top_k(groups, scores, k=k))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Incremental snapshot updates with `SnapshotState` against recomputing
+degree centrality, strength, PageRank and components for every snapshot.
+
+- Game of Thrones, five books: NetworkX on each book's graph,
+  `centrality_table` and `component_labels` on each `TemporalGraph` snapshot,
+  and `TemporalGraph.evolution`.
+  Consecutive books share few edges, so most updates start over.
+- A synthetic series where 1% of edges change between snapshots.
+
+The error is the largest absolute difference to the snapshot recompute.
+
+    python scripts/benchmarks/incremental.py
+"""
+
+import argparse
+import time
+import warnings
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from nams import TemporalGraph
+from nams import load_data as cf
+from nams.centrality import centrality_table
+from nams.structures import component_labels
+
+warnings.filterwarnings("ignore")
+
+
+def networkx_full(graphs):
+    """The four measures on each NetworkX graph."""
+    for G in graphs:
+        nx.degree_centrality(G)
+        dict(G.degree(weight="weight"))
+        nx.pagerank(G, weight="weight")
+        list(nx.connected_components(G))
+
+
+def snapshot_full(series):
+    """The four measures recomputed on every snapshot."""
+    frames = []
+    for t in series.times:
+        C = series.snapshot(t)
+        df = centrality_table(C, ["degree", "weighted_degree", "pagerank"])
+        df["component"] = component_labels(C).to_numpy()
+        frames.append(df)
+    return frames
+
+
+def incremental(series):
+    """The four measures updated from snapshot to snapshot."""
+    frames, iterations = [], []
+    for _, state in series.evolution():
+        frames.append(state.frame())
+        iterations.append(state.iterations)
+    return frames, iterations
+
+
+def churn_series(n=50_000, m=250_000, snapshots=10, churn=0.01, seed=0):
+    """Snapshots of a random graph where `churn` of the edges change each time."""
+    rng = np.random.default_rng(seed)
+    edges = pd.DataFrame(
+        {
+            "u": rng.integers(0, n, m),
+            "v": rng.integers(0, n, m),
+            "weight": rng.integers(1, 10, m).astype(float),
+        }
+    )
+    frames = []
+    for t in range(snapshots):
+        frames.append(edges.assign(t=t))
+        k = int(churn * m)
+        drop = rng.choice(len(edges), k, replace=False)
+        edges = pd.concat(
+            [
+                edges.drop(edges.index[drop]),
+                pd.DataFrame(
+                    {
+                        "u": rng.integers(0, n, k),
+                        "v": rng.integers(0, n, k),
+                        "weight": rng.integers(1, 10, k).astype(float),
+                    }
+                ),
+            ],
+            ignore_index=True,
+        )
+    return TemporalGraph.from_pandas_edgelist(
+        pd.concat(frames), "u", "v", "t", edge_attr="weight"
+    )
+
+
+def compare(series):
+    start = time.perf_counter()
+    full = snapshot_full(series)
+    print(f"  {'snapshot recompute':<28}{time.perf_counter() - start:>8.3f} s")
+    start = time.perf_counter()
+    updated, iterations = incremental(series)
+    elapsed = time.perf_counter() - start
+    error = max(
+        (a[["degree", "pagerank"]] - b[["degree", "pagerank"]]).abs().max().max()
+        for a, b in zip(updated, full)
+    )
+    same_components = all(
+        (a["component"] == b["component"]).all() for a, b in zip(updated, full)
+    )
+    print(
+        f"  {'incremental':<28}{elapsed:>8.3f} s  max error {error:.1e},"
+        f" same components: {same_components}"
+    )
+    print(f"    pagerank iterations: {iterations}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--churn", type=float, default=0.01)
+    args = parser.parse_args()
+
+    books = cf.load_game_of_thrones_data()
+    print("game of thrones, 5 books")
+    start = time.perf_counter()
+    graphs = [
+        nx.from_pandas_edgelist(
+            books[books.book == i], "Source", "Target", edge_attr="weight"
+        )
+        for i in range(1, 6)
+    ]
+    networkx_full(graphs)
+    print(f"  {'networkx per book':<28}{time.perf_counter() - start:>8.3f} s")
+    compare(
+        TemporalGraph.from_pandas_edgelist(
+            books, "Source", "Target", "book", edge_attr="weight"
+        )
+    )
+
+    series = churn_series(churn=args.churn)
+    print(f"synthetic, {args.churn:.0%} churn: {series}")
+    compare(series)
+
+
+if __name__ == "__main__":
+    main()
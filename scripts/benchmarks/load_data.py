@@ -0,0 +1,129 @@
+"""
+Benchmark the bulk edge-list loaders in `nams.load_data`
+against the original row-by-row (`df.iterrows()`) graph construction.
+
+The iterrows timings exclude CSV parsing
+while the loader timings include it,
+so the reported speedups are conservative.
+Loaders run with the on-disk graph cache switched off (`NAMS_CACHE=0`);
+the last column times the same loaders reading their cached snapshot.
+"""
+
+import os
+from timeit import repeat
+
+import networkx as nx
+import pandas as pd
+
+from nams import load_data as cf
+
+datasets = cf.datasets
+
+
+def read_edges(path, columns):
+    df = pd.read_csv(datasets / path, sep=" ", skiprows=2, header=None)
+    df = df[list(range(len(columns)))]
+    df.columns = columns
+    return df
+
+
+def iterrows_digraph(df, u, v, attr=None):
+    G = nx.DiGraph()
+    for row in df.iterrows():
+        if attr is None:
+            G.add_edge(row[1][u], row[1][v])
+        else:
+            G.add_edge(row[1][u], row[1][v], **{attr: row[1][attr]})
+    return G
+
+
+def iterrows_graph(df, u, v):
+    G = nx.Graph()
+    for row in df.iterrows():
+        G.add_edge(row[1][u], row[1][v])
+    return G
+
+
+def iterrows_weighted(df, u, v):
+    G = nx.Graph()
+    for row in df.iterrows():
+        p1 = row[1][u]
+        p2 = row[1][v]
+        if G.has_edge(p1, p2):
+            G.edges[p1, p2]["weight"] += 1
+        else:
+            G.add_edge(p1, p2, weight=1)
+    return G
+
+
+def iterrows_bipartite(df):
+    G = nx.Graph()
+    for r, d in df.iterrows():
+        pid = "p{0}".format(d["personID"])
+        cid = "c{0}".format(d["crimeID"])
+        G.add_node(pid, bipartite="person")
+        G.add_node(cid, bipartite="crime")
+        G.add_edge(pid, cid)
+    return G
+
+
+def uncached(loader):
+    """Run `loader` with the on-disk graph cache switched off."""
+    os.environ["NAMS_CACHE"] = "0"
+    try:
+        return loader()
+    finally:
+        del os.environ["NAMS_CACHE"]
+
+
+def main():
+    seventh = read_edges(
+        "moreno_seventh/out.moreno_seventh_seventh", ["student1", "student2", "count"]
+    )
+    facebook = read_edges("ego-facebook/out.ego-facebook", ["user1", "user2"])
+    sociopatterns = read_edges(
+        "sociopatterns-infectious/out.sociopatterns-infectious",
+        ["person1", "person2"],
+    )
+    physicians = read_edges(
+        "moreno_innovation/out.moreno_innovation_innovation", ["doctor1", "doctor2"]
+    )
+    crime = read_edges("moreno_crime/out.moreno_crime_crime", ["personID", "crimeID"])
+
+    cases = {
+        "seventh_grader": (
+            lambda: iterrows_digraph(seventh, "student1", "student2", "count"),
+            cf.load_seventh_grader_network,
+        ),
+        "facebook": (
+            lambda: iterrows_digraph(facebook, "user1", "user2"),
+            cf.load_facebook_network,
+        ),
+        "sociopatterns": (
+            lambda: iterrows_weighted(sociopatterns, "person1", "person2"),
+            cf.load_sociopatterns_network,
+        ),
+        "physicians": (
+            lambda: iterrows_graph(physicians, "doctor1", "doctor2"),
+            cf.load_physicians_network,
+        ),
+        "crime": (lambda: iterrows_bipartite(crime), cf.load_crime_network),
+    }
+
+    print(
+        f"{'dataset':<16}{'iterrows (s)':>14}{'loader (s)':>12}{'speedup':>10}"
+        f"{'cached (s)':>12}"
+    )
+    for name, (old, new) in cases.items():
+        t_old = min(repeat(old, number=1, repeat=3))
+        t_new = min(repeat(lambda: uncached(new), number=1, repeat=3))
+        new()  # make sure the snapshot exists before timing cache hits
+        t_cached = min(repeat(new, number=1, repeat=3))
+        print(
+            f"{name:<16}{t_old:>14.4f}{t_new:>12.4f}{t_old / t_new:>9.1f}x"
+            f"{t_cached:>12.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
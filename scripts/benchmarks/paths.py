@@ -0,0 +1,102 @@
+"""
+Compare the one-sided `path_exists*` solutions with
+`path_exists_bidirectional` (on a NetworkX graph and on a CSRGraph).
+
+Queries are random node pairs on the sociopatterns network
+and on a synthetic graph with 1M edges split over two components,
+so roughly half of the synthetic queries have no path.
+Each method runs in a forked process with a time budget per graph,
+and is killed once the budget is spent,
+so slow methods answer fewer queries (possibly none).
+
+    python scripts/benchmarks/paths.py --queries 200 --budget 20
+"""
+
+import argparse
+import multiprocessing as mp
+import random
+import time
+import warnings
+
+import networkx as nx
+
+from nams import CSRGraph
+from nams import load_data as cf
+from nams.solutions import paths
+
+warnings.filterwarnings("ignore")
+
+
+def synthetic_graph(n_nodes=200_000, n_edges=1_000_000, seed=42):
+    """Two disjoint random graphs of equal size, 1M edges in total."""
+    half = n_nodes // 2
+    G = nx.gnm_random_graph(half, n_edges // 2, seed=seed)
+    H = nx.gnm_random_graph(half, n_edges // 2, seed=seed + 1)
+    return nx.disjoint_union(G, H)
+
+
+def _answer(func, G, pairs, queue):
+    """Report the elapsed time after every answered query."""
+    start = time.perf_counter()
+    for u, v in pairs:
+        func(u, v, G)
+        queue.put(time.perf_counter() - start)
+
+
+def time_queries(func, G, pairs, budget):
+    """
+    Mean seconds per query and number of queries answered within the budget.
+
+    Runs in a forked child so that the graph is shared rather than copied.
+    """
+    ctx = mp.get_context("fork")
+    queue = ctx.Queue()
+    p = ctx.Process(target=_answer, args=(func, G, pairs, queue))
+    p.start()
+    p.join(budget)
+    if p.is_alive():
+        p.terminate()
+        p.join()
+
+    done, elapsed = 0, None
+    while not queue.empty():
+        elapsed = queue.get()
+        done += 1
+    if done == 0:
+        return None, 0
+    return elapsed / done, done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--budget", type=float, default=20.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for name, G in [
+        ("sociopatterns", cf.load_sociopatterns_network()),
+        ("synthetic 1M edges", synthetic_graph()),
+    ]:
+        C = CSRGraph.from_networkx(G)
+        nodes = list(G)
+        pairs = [tuple(rng.sample(nodes, 2)) for _ in range(args.queries)]
+        print(f"{name}: {len(G)} nodes, {G.number_of_edges()} edges")
+        print(f"  {'method':<32}{'ms/query':>10}{'queries':>9}")
+        methods = [
+            ("path_exists", paths.path_exists, G),
+            ("path_exists_for_loop", paths.path_exists_for_loop, G),
+            ("path_exists_deque", paths.path_exists_deque, G),
+            ("path_exists_bidirectional (nx)", paths.path_exists_bidirectional, G),
+            ("path_exists_bidirectional (csr)", paths.path_exists_bidirectional, C),
+        ]
+        for label, func, graph in methods:
+            per_query, done = time_queries(func, graph, pairs, args.budget)
+            if done == 0:
+                print(f"  {label:<32}{'> budget':>10}{done:>9}")
+            else:
+                print(f"  {label:<32}{per_query * 1e3:>10.3f}{done:>9}")
+
+
+if __name__ == "__main__":
+    main()
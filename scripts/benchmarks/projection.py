@@ -0,0 +1,88 @@
+"""
+Compare wall time and peak RSS of the full customer projection `M @ M.T`
+against the blocked `projection_top_pairs` and `projection_edges`.
+
+M is a synthetic customer-product biadjacency matrix
+with heavy-tailed product popularity, like the Amazon reviews.
+Each method runs in a fresh process so that peak RSS is not
+polluted by the others:
+
+    python scripts/benchmarks/projection.py --customers 100000 --reviews 1000000
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import tempfile
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def biadjacency(n_customers, n_products, n_reviews, seed=42):
+    """
+    A random customer-product matrix
+    where a product's popularity falls off as a power of its rank.
+    """
+    rng = np.random.default_rng(seed)
+    popularity = np.arange(1, n_products + 1) ** -0.6
+    rows = rng.integers(0, n_customers, n_reviews)
+    cols = rng.choice(n_products, n_reviews, p=popularity / popularity.sum())
+    M = sp.csr_array(
+        (np.ones(n_reviews), (rows, cols)), shape=(n_customers, n_products)
+    )
+    M.data[:] = 1
+    return M
+
+
+def run(name, args, queue):
+    from nams.solutions import linalg
+
+    M = biadjacency(args.customers, args.products, args.reviews)
+    start = time.perf_counter()
+    if name == "full M @ M.T":
+        P = M @ M.T
+        P.setdiag(0)
+        P.eliminate_zeros()
+        result = int(P.max())
+    elif name == "blocked top-k":
+        result = linalg.projection_top_pairs(M, k=10, block_size=args.block)[2][0]
+    else:
+        with tempfile.TemporaryDirectory() as spill:
+            edges = linalg.projection_edges(
+                M, args.threshold, block_size=args.block, spill_dir=spill
+            )
+            result = len(edges[0])
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((elapsed, rss, result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--block", type=int, default=1024)
+    parser.add_argument("--threshold", type=float, default=2)
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    print(f"{'method':<28}{'seconds':>9}{'peak MB':>10}  result")
+    for name in ["full M @ M.T", "blocked top-k", "blocked threshold + spill"]:
+        queue = ctx.Queue()
+        p = ctx.Process(target=run, args=(name, args, queue))
+        p.start()
+        p.join()
+        if p.exitcode != 0:
+            # Most likely killed for running out of memory.
+            print(f"{name:<28}  failed with exit code {p.exitcode}")
+            continue
+        elapsed, rss, result = queue.get()
+        print(f"{name:<28}{elapsed:>9.2f}{rss:>10.0f}  {result}")
+
+
+if __name__ == "__main__":
+    main()
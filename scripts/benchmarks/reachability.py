@@ -0,0 +1,81 @@
+"""
+Batch path queries with `ReachabilityIndex`
+against one `path_exists_bidirectional` search per query.
+
+Graphs are the sociopatterns network, the undirected 1M-edge synthetic graph
+from `paths.py`, and a directed random graph with 1M edges.
+The per-query searches only run on a sample of the queries.
+
+    python scripts/benchmarks/reachability.py --queries 1000000 --sample 100
+"""
+
+import argparse
+import time
+import warnings
+
+import networkx as nx
+import numpy as np
+
+from nams import CSRGraph
+from nams import load_data as cf
+from nams.paths import ReachabilityIndex
+from nams.solutions import paths
+
+warnings.filterwarnings("ignore")
+
+
+def synthetic_graph():
+    """Two disjoint random graphs of equal size, as in `paths.py`."""
+    half = 100_000
+    G = nx.gnm_random_graph(half, 500_000, seed=42)
+    H = nx.gnm_random_graph(half, 500_000, seed=43)
+    return nx.disjoint_union(G, H)
+
+
+def directed_graph(n_nodes=500_000, n_edges=1_000_000, seed=42):
+    """A directed random graph, as a CSRGraph."""
+    rng = np.random.default_rng(seed)
+    pairs = np.unique(
+        rng.integers(0, n_nodes, n_edges) * n_nodes + rng.integers(0, n_nodes, n_edges)
+    )
+    return CSRGraph(np.arange(n_nodes), pairs // n_nodes, pairs % n_nodes, True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=1_000_000)
+    parser.add_argument("--sample", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for name, G in [
+        ("sociopatterns", CSRGraph.from_networkx(cf.load_sociopatterns_network())),
+        ("synthetic 1M edges", CSRGraph.from_networkx(synthetic_graph())),
+        ("directed 1M edges", directed_graph()),
+    ]:
+        sources = rng.integers(0, len(G), args.queries)
+        targets = rng.integers(0, len(G), args.queries)
+        print(f"{name}: {len(G)} nodes, {G.number_of_edges()} edges")
+
+        start = time.perf_counter()
+        index = ReachabilityIndex(G)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        found = index.query_indices(sources, targets)
+        batch = time.perf_counter() - start
+        print(f"  index build      {build:>10.3f} s")
+        print(
+            f"  batch query      {batch / args.queries * 1e6:>10.3f} us/query"
+            f" ({args.queries} queries, {found.mean():.1%} reachable)"
+        )
+
+        nodes = G.node_ids
+        start = time.perf_counter()
+        for u, v in zip(sources[: args.sample], targets[: args.sample]):
+            paths.path_exists_bidirectional(nodes[u], nodes[v], G)
+        single = (time.perf_counter() - start) / args.sample
+        print(f"  bidirectional    {single * 1e6:>10.3f} us/query")
+
+
+if __name__ == "__main__":
+    main()
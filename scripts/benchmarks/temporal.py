@@ -0,0 +1,139 @@
+"""
+Snapshot series with `TemporalGraph` against one NetworkX graph per snapshot.
+
+- Game of Thrones: five `nx.from_pandas_edgelist` calls on filtered books
+  and a betweenness evolution over them,
+  against one `TemporalGraph` and `TemporalGraph.centrality`.
+- Airport-like years: the notebook's `year_network` scan of a MultiDiGraph
+  against `TemporalGraph.snapshot` for one year.
+  The real passenger data is large, so a synthetic table of the same shape
+  is used.
+
+    python scripts/benchmarks/temporal.py --jobs 2
+"""
+
+import argparse
+import time
+import warnings
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from nams import TemporalGraph
+from nams import load_data as cf
+
+warnings.filterwarnings("ignore")
+
+
+def year_network(G, year):
+    """The airport notebook's per-year DiGraph."""
+    year_network = nx.DiGraph()
+    for edge in G.edges:
+        source, target, edge_year = edge
+        if edge_year == year:
+            attr = G[source][target][edge_year]
+            year_network.add_edge(
+                source,
+                target,
+                weight=attr["PASSENGERS"],
+                weight_inv=1 / (attr["PASSENGERS"] if attr["PASSENGERS"] != 0.0 else 1),
+                airlines=attr["UNIQUE_CARRIER_NAME"],
+            )
+    return year_network
+
+
+def passengers(n_airports=1000, n_routes=40_000, years=range(1990, 2016), seed=0):
+    """A random route table with one row per route and year."""
+    rng = np.random.default_rng(seed)
+    airports = np.array([f"A{i:04d}" for i in range(n_airports)])
+    frames = []
+    for year in years:
+        frames.append(
+            pd.DataFrame(
+                {
+                    "ORIGIN": airports[rng.integers(0, n_airports, n_routes)],
+                    "DEST": airports[rng.integers(0, n_airports, n_routes)],
+                    "YEAR": year,
+                    "PASSENGERS": rng.integers(0, 100_000, n_routes).astype(float),
+                    "UNIQUE_CARRIER_NAME": "carrier",
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def timed(label, run):
+    start = time.perf_counter()
+    result = run()
+    print(f"  {label:<40}{time.perf_counter() - start:>9.3f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=2)
+    args = parser.parse_args()
+
+    books = cf.load_game_of_thrones_data()
+    books["weight_inv"] = 1 / books["weight"]
+    attrs = ["weight", "weight_inv"]
+    print(f"game of thrones: {len(books)} rows, 5 books")
+    graphs = timed(
+        "from_pandas_edgelist per book",
+        lambda: [
+            nx.from_pandas_edgelist(
+                books[books.book == i], "Source", "Target", edge_attr=attrs
+            )
+            for i in range(1, 6)
+        ],
+    )
+    series = timed(
+        "TemporalGraph.from_pandas_edgelist",
+        lambda: TemporalGraph.from_pandas_edgelist(
+            books, "Source", "Target", "book", edge_attr=attrs
+        ),
+    )
+    timed(
+        "betweenness per graph, networkx",
+        lambda: [nx.betweenness_centrality(G, weight="weight_inv") for G in graphs],
+    )
+    for jobs in [1, args.jobs]:
+        timed(
+            f"TemporalGraph.centrality, {jobs} jobs",
+            lambda: series.centrality(
+                "betweenness", distance="weight_inv", n_jobs=jobs
+            ),
+        )
+
+    data = passengers()
+    print(f"synthetic passengers: {len(data)} rows, {data.YEAR.nunique()} years")
+    G = timed(
+        "MultiDiGraph",
+        lambda: nx.from_pandas_edgelist(
+            data,
+            "ORIGIN",
+            "DEST",
+            edge_key="YEAR",
+            edge_attr=["PASSENGERS", "UNIQUE_CARRIER_NAME"],
+            create_using=nx.MultiDiGraph(),
+        ),
+    )
+    timed("year_network(G, 2015)", lambda: year_network(G, 2015))
+    series = timed(
+        "TemporalGraph.from_pandas_edgelist",
+        lambda: TemporalGraph.from_pandas_edgelist(
+            data,
+            "ORIGIN",
+            "DEST",
+            "YEAR",
+            edge_attr=["PASSENGERS", "UNIQUE_CARRIER_NAME"],
+            directed=True,
+        ),
+    )
+    timed("snapshot(2015)", lambda: series.snapshot(2015))
+    timed("to_networkx(2015)", lambda: series.to_networkx(2015))
+
+
+if __name__ == "__main__":
+    main()
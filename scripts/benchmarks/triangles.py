@@ -0,0 +1,68 @@
+"""
+Bulk triangle queries with `TriangleIndex` against the per-node solutions.
+
+The per-node functions run on a sample of nodes
+and their time is extrapolated to the whole graph.
+
+    python scripts/benchmarks/triangles.py --sample 500
+"""
+
+import argparse
+import time
+import warnings
+
+import networkx as nx
+
+from nams import CSRGraph
+from nams import load_data as cf
+from nams.solutions import structures
+from nams.structures import TriangleIndex
+
+warnings.filterwarnings("ignore")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sample", type=int, default=500)
+    args = parser.parse_args()
+
+    for name, G in [
+        ("physicians", cf.load_physicians_network()),
+        ("sociopatterns", cf.load_sociopatterns_network()),
+        ("barabasi-albert 1.6M edges", nx.barabasi_albert_graph(200_000, 8, seed=0)),
+    ]:
+        print(f"{name}: {len(G)} nodes, {G.number_of_edges()} edges")
+        C = CSRGraph.from_networkx(G)
+        start = time.perf_counter()
+        index = TriangleIndex(C)
+        print(f"  {'TriangleIndex build':<42}{time.perf_counter() - start:>9.3f} s")
+        start = time.perf_counter()
+        nx.triangles(G)
+        print(f"  {'nx.triangles':<42}{time.perf_counter() - start:>9.3f} s")
+
+        nodes = list(G)[: args.sample]
+        scale = len(G) / len(nodes)
+        for label, bulk, single in [
+            (
+                "triangle neighbors",
+                index.all_triangle_neighbors,
+                structures.get_triangle_neighbors,
+            ),
+            (
+                "open triangle neighbors",
+                index.all_open_triangles_neighbors,
+                structures.get_open_triangles_neighbors,
+            ),
+        ]:
+            start = time.perf_counter()
+            bulk()
+            print(f"  {label + ', all nodes':<42}{time.perf_counter() - start:>9.3f} s")
+            start = time.perf_counter()
+            for n in nodes:
+                single(G, n)
+            elapsed = (time.perf_counter() - start) * scale
+            print(f"  {label + ', per node (est.)':<42}{elapsed:>9.3f} s")
+
+
+if __name__ == "__main__":
+    main()
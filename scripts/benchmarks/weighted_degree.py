@@ -0,0 +1,73 @@
+"""
+Weighted degree of every node for several weights:
+the original per-node `G.edges([node], data=True)` loop, once per weight,
+against the one-pass `weighted_degree`, once per weight,
+and one `weighted_degrees` call on a NetworkX graph and on a CSRGraph.
+
+    python scripts/benchmarks/weighted_degree.py
+"""
+
+import time
+import warnings
+
+import networkx as nx
+import numpy as np
+
+from nams import CSRGraph
+from nams import load_data as cf
+from nams.solutions.got import weighted_degree, weighted_degrees
+
+warnings.filterwarnings("ignore")
+
+WEIGHTS = ["weight", "weight_inv"]
+
+
+def per_node(G, weight):
+    """The original weighted_degree, with the weight argument honoured."""
+    result = dict()
+    for node in G.nodes():
+        weight_degree = 0
+        for n in G.edges([node], data=True):
+            weight_degree += n[2][weight]
+        result[node] = weight_degree
+    return result
+
+
+def got_books():
+    """All five Game of Thrones books as one multi-book weighted graph."""
+    books = cf.load_game_of_thrones_data()
+    edges = books.groupby(["Source", "Target"], as_index=False)["weight"].sum()
+    edges["weight_inv"] = 1 / edges["weight"]
+    return nx.from_pandas_edgelist(edges, "Source", "Target", edge_attr=WEIGHTS)
+
+
+def synthetic_graph(n=100_000, m=500_000, seed=0):
+    """A random graph with random weights."""
+    G = nx.gnm_random_graph(n, m, seed=seed)
+    rng = np.random.default_rng(seed)
+    for (_, _, d), w in zip(G.edges(data=True), rng.uniform(1, 10, m)):
+        d["weight"] = w
+        d["weight_inv"] = 1 / w
+    return G
+
+
+def main():
+    for name, G in [("got, all books", got_books()), ("random", synthetic_graph())]:
+        print(f"{name}: {len(G)} nodes, {G.number_of_edges()} edges")
+        C = CSRGraph.from_networkx(G)
+        for label, run in [
+            ("per node, once per weight", lambda: [per_node(G, w) for w in WEIGHTS]),
+            (
+                "weighted_degree, once per weight",
+                lambda: [weighted_degree(G, w) for w in WEIGHTS],
+            ),
+            ("weighted_degrees, networkx", lambda: weighted_degrees(G, WEIGHTS)),
+            ("weighted_degrees, CSRGraph", lambda: weighted_degrees(C, WEIGHTS)),
+        ]:
+            start = time.perf_counter()
+            run()
+            print(f"  {label:<32}{time.perf_counter() - start:>9.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Tests for nams.temporal."""
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from nams import TemporalGraph
+
+
+def test_evolution_removes_float_weighted_edge():
+    """A removed edge with float weight changes leaves no residue in the state."""
+    rows = []
+    for t, weight in enumerate([2.3, 0.2, None]):
+        rows += [(t, "a", "b", 1.0), (t, "b", "c", 1.0), (t, "c", "a", 1.0)]
+        rows += [(t, "a", "d", 1.0), (t, "e", "a", 1.0)]
+        if weight is not None:
+            rows.append((t, "d", "e", weight))
+    df = pd.DataFrame(rows, columns=["t", "u", "v", "weight"])
+    T = TemporalGraph.from_pandas_edgelist(
+        df, "u", "v", "t", edge_attr="weight", directed=True
+    )
+
+    for time, state in T.evolution():
+        G = T.to_networkx(time)
+        frame = state.frame()
+        assert state.adjacency.nnz == G.number_of_edges()
+        expected = pd.Series(nx.pagerank(G))[frame.index]
+        np.testing.assert_allclose(frame["pagerank"], expected, atol=1e-5)
+        strength = pd.Series(dict(G.degree(weight="weight")))[frame.index]
+        np.testing.assert_allclose(frame["strength"], strength, atol=1e-12)